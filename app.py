@@ -1,13 +1,61 @@
 #!/usr/bin/env python3
+import json
 import os
 
 import aws_cdk as cdk
 
 from aws_cdk_serverless_crud_api.aws_cdk_serverless_crud_api_stack import AwsCdkServerlessCrudApiStack
+from aws_cdk_serverless_crud_api.caching import StageCacheProfile
+from aws_cdk_serverless_crud_api.capacity import CapacityProfile
+from aws_cdk_serverless_crud_api.performance import PerformanceProfile
 
 
 app = cdk.App()
+
+
+def context(name, default):
+    """Reads a `-c name=value` / cdk.json context value, keeping falsy values such as 0."""
+    value = app.node.try_get_context(name)
+    return default if value is None else value
+
+
+def json_context(name, default):
+    """Reads an object-valued context value, given as JSON in cdk.json or as a JSON string with `-c`."""
+    value = context(name, default)
+    return json.loads(value) if isinstance(value, str) else value
+
+
 AwsCdkServerlessCrudApiStack(app, "AwsCdkServerlessCrudApiStack",
+    # Number of StatusIndex partitions per status, e.g. `cdk deploy -c statusShardCount=8`
+    status_shard_count=int(context("statusShardCount", 4)),
+    # Seconds a warm GetTask container may serve a cached task, e.g. `-c taskCacheTtlSeconds=0` to disable
+    task_cache_ttl_seconds=float(context("taskCacheTtlSeconds", 5)),
+    # Serve every route from one router Lambda instead of one function per route: `-c singleFunction=true`
+    single_function=str(context("singleFunction", False)).lower() == "true",
+    # DynamoDB access layer of the handlers, "resource" or "client": `-c dataAccess=client`
+    data_access=context("dataAccess", "resource"),
+    # How long POST /tasks responses are replayed for a repeated Idempotency-Key: `-c idempotencyTtlSeconds=3600`
+    idempotency_ttl_seconds=int(context("idempotencyTtlSeconds", 86400)),
+    # TasksTable billing and scaling, an object in cdk.json or `-c capacityProfile='{"billingMode": "PROVISIONED", ...}'`
+    capacity_profile=CapacityProfile.from_dict(json_context("capacityProfile", {})),
+    # Memory, architecture, runtime and concurrency per function, an object in cdk.json or `-c performanceProfile='{...}'`
+    performance_profile=PerformanceProfile.from_dict(json_context("performanceProfile", {})),
+    # Per-function packages with a shared, byte-compiled layer; `-c optimizedBundles=false` ships lambda_functions/ as is
+    optimized_bundles=str(context("optimizedBundles", True)).lower() == "true",
+    # API Gateway stage cache for GET methods, an object in cdk.json or `-c stageCache='{...}'`
+    stage_cache=StageCacheProfile.from_dict(json_context("stageCache", {})),
+    # "rest" (default), "http" for an HTTP API (payload 2.0), or "both" to compare the two
+    api_type=context("apiType", "rest"),
+    # Responses of at least this many bytes are gzipped for clients that accept it, -1 turns compression off
+    compression_threshold=int(context("compressionThreshold", 1024)),
+    # Seconds finished tasks stay in TasksTable before the TTL moves them to the S3 archive. Off (0) unless
+    # set, e.g. `-c completedTaskTtlSeconds=2592000` for 30 days
+    completed_task_ttl_seconds=int(context("completedTaskTtlSeconds", 0)),
+    # Statuses that finish a task, comma separated: `-c terminalStatuses=completed,cancelled,archived`
+    terminal_statuses=tuple(
+        status.strip() for status in str(context("terminalStatuses", "completed,cancelled")).split(",") if status.strip()
+    ),
+
     # If you don't specify 'env', this stack will be environment-agnostic.
     # Account/Region-dependent features and context lookups will not work,
     # but a single synthesized template can be deployed anywhere.
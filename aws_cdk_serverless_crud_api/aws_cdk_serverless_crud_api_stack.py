@@ -1,22 +1,163 @@
+from pathlib import Path
+
 from aws_cdk import (
+    CfnOutput,
+    Fn,
+    Size,
     Stack,
+    Stage,
     aws_lambda as _lambda,
     aws_apigateway as apigateway,
+    aws_apigatewayv2 as apigatewayv2,
+    aws_apigatewayv2_integrations as apigatewayv2_integrations,
     aws_dynamodb as dynamodb,
-    aws_iam as iam, RemovalPolicy
+    aws_iam as iam,
+    aws_lambda_event_sources as lambda_event_sources,
+    aws_s3 as s3,
+    aws_sqs as sqs,
+    aws_secretsmanager as secretsmanager, RemovalPolicy, Duration
 )
 from constructs import Construct
 
+from lambda_functions import task_schema
+
+from .bundling import HandlerBundles
+from .caching import StageCacheProfile
+from .capacity import CapacityProfile
+from .performance import PerformanceProfile, add_live_alias
+
+# Front doors the stack can build: the REST API, an HTTP API (payload 2.0), or both side by side
+API_TYPES = ("rest", "http", "both")
+
+# (method, path, handler module) of every route, for the HTTP API
+HTTP_ROUTES = [
+    ("POST", "/tasks", "create_task"),
+    ("GET", "/tasks", "list_tasks"),
+    ("GET", "/tasks/{taskId}", "get_task"),
+    ("PUT", "/tasks/{taskId}", "update_task"),
+    ("PATCH", "/tasks/{taskId}", "patch_task"),
+    ("DELETE", "/tasks/{taskId}", "delete_task"),
+    ("POST", "/tasks/batch", "batch_create_tasks"),
+    ("POST", "/tasks/batch-get", "batch_get_tasks"),
+    ("POST", "/tasks/batch-delete", "batch_delete_tasks"),
+    ("GET", "/tasks/stats", "get_task_stats")
+]
+
+
+def json_schema(definition, root=True):
+    """Builds an API Gateway JsonSchema from one of the draft 4 dicts in lambda_functions/task_schema.py."""
+    properties = definition.get("properties")
+    items = definition.get("items")
+    additional_properties = definition.get("additionalProperties")
+    return apigateway.JsonSchema(
+        schema=apigateway.JsonSchemaVersion.DRAFT4 if root else None,
+        title=definition.get("title"),
+        type=apigateway.JsonSchemaType[definition["type"].upper()],
+        properties={name: json_schema(value, False) for name, value in properties.items()} if properties else None,
+        items=json_schema(items, False) if items else None,
+        required=definition.get("required"),
+        min_properties=definition.get("minProperties"),
+        max_properties=definition.get("maxProperties"),
+        min_items=definition.get("minItems"),
+        additional_properties=additional_properties
+    )
+
 
 class AwsCdkServerlessCrudApiStack(Stack):
-    def __init__(self, scope: Construct, id: str, **kwargs) -> None:
+    def __init__(self, scope: Construct, id: str,
+                 status_shard_count: int = 4,
+                 task_cache_ttl_seconds: float = 5,
+                 single_function: bool = False,
+                 data_access: str = "resource",
+                 idempotency_ttl_seconds: int = 86400,
+                 capacity_profile: CapacityProfile = None,
+                 performance_profile: PerformanceProfile = None,
+                 optimized_bundles: bool = True,
+                 stage_cache: StageCacheProfile = None,
+                 api_type: str = "rest",
+                 compression_threshold: int = 1024,
+                 completed_task_ttl_seconds: int = 0,
+                 terminal_statuses=("completed", "cancelled"),
+                 **kwargs) -> None:
         super().__init__(scope, id, **kwargs)
 
-        # Create DynamoDB Table
+        if api_type not in API_TYPES:
+            raise ValueError(f"api_type must be one of {', '.join(API_TYPES)}, not {api_type!r}")
+        stage_cache = stage_cache or StageCacheProfile()
+        if stage_cache.enabled and api_type == "http":
+            raise ValueError("the stage cache is a REST API feature, deploy with api_type 'rest' or 'both'")
+
+        # Create DynamoDB Table, billed and scaled as the capacity profile says (on-demand by default)
+        capacity_profile = capacity_profile or CapacityProfile()
         tasks_table = dynamodb.Table(
             self, "TasksTable",
             table_name="TasksTable",
             partition_key={"name": "taskId", "type": dynamodb.AttributeType.STRING},
+            removal_policy=RemovalPolicy.DESTROY,
+            # Every change, with the task before and after it, feeds the per-status counters
+            # and, for tasks removed by the TTL, the archive
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
+            # Finished tasks carry expiresAt, after which DynamoDB deletes them at no write cost
+            time_to_live_attribute="expiresAt",
+            **capacity_profile.table_props()
+        )
+
+        # Index for "all tasks in status X" reads. Its partition key is the status plus
+        # a shard suffix (e.g. "pending#3") so a hot status is spread over several partitions.
+        tasks_table.add_global_secondary_index(
+            index_name="StatusIndex",
+            partition_key={"name": "statusShard", "type": dynamodb.AttributeType.STRING},
+            sort_key={"name": "taskId", "type": dynamodb.AttributeType.STRING},
+            **capacity_profile.index_props("StatusIndex")
+        )
+        index_names = ["StatusIndex"]
+        capacity_profile.apply_scaling(tasks_table, index_names)
+        if capacity_profile.contributor_insights:
+            # The Table construct only enables Contributor Insights on the base table
+            for position in range(len(index_names)):
+                tasks_table.node.default_child.add_property_override(
+                    f"GlobalSecondaryIndexes.{position}.ContributorInsightsSpecification.Enabled", True
+                )
+
+        # Responses of POST /tasks requests that carried an Idempotency-Key, replayed to retries
+        # of the same request until DynamoDB's TTL removes them
+        idempotency_table = dynamodb.Table(
+            self, "IdempotencyTable",
+            partition_key={"name": "idempotencyKey", "type": dynamodb.AttributeType.STRING},
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute="expiresAt",
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
+        # Per-status task counters served by GET /tasks/stats, maintained from the TasksTable stream
+        stats_table = dynamodb.Table(
+            self, "TaskStatsTable",
+            partition_key={"name": "statsKey", "type": dynamodb.AttributeType.STRING},
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY
+        )
+        stats_environment = {
+            "STATS_TABLE_NAME": stats_table.table_name
+        }
+
+        # Writers stamp tasks reaching a terminal status with expiresAt, 0 keeps every task
+        expiry_environment = {
+            "COMPLETED_TASK_TTL_SECONDS": str(completed_task_ttl_seconds),
+            "TERMINAL_STATUSES": ",".join(terminal_statuses)
+        }
+
+        status_index_environment = {
+            "STATUS_INDEX_NAME": "StatusIndex",
+            "STATUS_SHARD_COUNT": str(status_shard_count)
+        }
+
+        # Key used to sign the opaque pagination cursors returned by GET /tasks
+        cursor_signing_secret = secretsmanager.Secret(
+            self, "CursorSigningSecret",
+            generate_secret_string=secretsmanager.SecretStringGenerator(
+                exclude_punctuation=True,
+                password_length=64
+            ),
             removal_policy=RemovalPolicy.DESTROY
         )
 
@@ -30,97 +171,441 @@ class AwsCdkServerlessCrudApiStack(Stack):
             ]
         )
 
-        # Lambda Functions
-        create_task_lambda = _lambda.Function(
-            self, "CreateTaskFunction",
-            runtime=_lambda.Runtime.PYTHON_3_10,
-            handler="create_task.handler",
-            code=_lambda.Code.from_asset("lambda_functions"),
-            environment={
-                "TASKS_TABLE_NAME": tasks_table.table_name
-            },
-            role=lambda_role
-        )
+        # API Gateway REST API, with a stage cache in front of the cached GET methods when the profile enables it
+        stage_name = "prod"
+        api = apigateway.RestApi(self, "TasksApi",
+            rest_api_name="Tasks Service",
+            description="This service serves tasks.",
+            deploy_options=stage_cache.stage_options(stage_name),
+            # gzip (or deflate) responses of at least this size for clients that accept it
+            min_compression_size=Size.bytes(compression_threshold) if compression_threshold >= 0 else None
+        ) if api_type != "http" else None
 
-        get_task_lambda = _lambda.Function(
-            self, "GetTaskFunction",
-            runtime=_lambda.Runtime.PYTHON_3_10,
-            handler="get_task.handler",
-            code=_lambda.Code.from_asset("lambda_functions"),
-            environment={
-                "TASKS_TABLE_NAME": tasks_table.table_name
-            },
-            role=lambda_role
-        )
+        # The stage cache consumer refreshes the cached GET /tasks/{taskId} of a changed task. The
+        # URL is built from the API id, since the stage's own URL depends on the functions.
+        stage_cache_environment = {
+            "TASKS_API_CACHE_URL": Fn.join("", [
+                "https://", api.rest_api_id, ".execute-api.", self.region, ".", self.url_suffix, "/", stage_name
+            ])
+        } if api and stage_cache.caches("GET /tasks/{taskId}") else {}
 
-        update_task_lambda = _lambda.Function(
-            self, "UpdateTaskFunction",
-            runtime=_lambda.Runtime.PYTHON_3_10,
-            handler="update_task.handler",
-            code=_lambda.Code.from_asset("lambda_functions"),
-            environment={
-                "TASKS_TABLE_NAME": tasks_table.table_name
-            },
-            role=lambda_role
-        )
+        # The cached GET /tasks/{taskId} is keyed on the taskId only, so get_task answers it with a
+        # full 200 rather than a 304 that would be cached for readers without If-None-Match
+        cached_environment = {
+            "RESPONSE_CACHED_BY_GATEWAY": "true"
+        } if stage_cache_environment else {}
+
+        table_environment = {
+            "TASKS_TABLE_NAME": tasks_table.table_name,
+            # "resource" (boto3 Table resource) or "client" (low-level client fast path)
+            "TASKS_DATA_ACCESS": data_access
+        }
+
+        # Handlers whose request bodies the REST API checks against task_schema models skip their own checks
+        validated_environment = {
+            "REQUEST_VALIDATED_BY_GATEWAY": "true"
+        } if api else {}
+
+        # Handlers gzip large responses themselves, except those the REST API already compresses
+        compression_environment = {
+            "RESPONSE_COMPRESSION_MIN_BYTES": str(compression_threshold),
+            **({"RESPONSE_COMPRESSED_BY_GATEWAY": "true"} if api and compression_threshold >= 0 else {})
+        }
 
-        delete_task_lambda = _lambda.Function(
-            self, "DeleteTaskFunction",
-            runtime=_lambda.Runtime.PYTHON_3_10,
-            handler="delete_task.handler",
-            code=_lambda.Code.from_asset("lambda_functions"),
-            environment={
-                "TASKS_TABLE_NAME": tasks_table.table_name
+        # Environment and timeout of every handler, keyed by its module in lambda_functions/
+        handler_environments = {
+            "create_task": {
+                **table_environment,
+                **validated_environment,
+                **status_index_environment,
+                **expiry_environment,
+                "IDEMPOTENCY_TABLE_NAME": idempotency_table.table_name,
+                "IDEMPOTENCY_TTL_SECONDS": str(idempotency_ttl_seconds)
+            },
+            "get_task": {
+                **table_environment,
+                # Staleness bound of the warm-container task cache, 0 disables it
+                "TASK_CACHE_TTL_SECONDS": str(task_cache_ttl_seconds),
+                **cached_environment,
+                **compression_environment
+            },
+            "update_task": {
+                **table_environment,
+                **validated_environment,
+                **status_index_environment,
+                **expiry_environment,
+                **compression_environment
+            },
+            "patch_task": {
+                **table_environment,
+                **validated_environment,
+                **status_index_environment,
+                **expiry_environment,
+                **compression_environment
+            },
+            "delete_task": {
+                **table_environment
             },
-            role=lambda_role
+            "batch_create_tasks": {
+                **table_environment,
+                **validated_environment,
+                **status_index_environment,
+                **expiry_environment
+            },
+            "batch_get_tasks": {
+                **table_environment,
+                **validated_environment,
+                **compression_environment
+            },
+            "batch_delete_tasks": {
+                **table_environment,
+                **validated_environment,
+                **status_index_environment
+            },
+            "list_tasks": {
+                **table_environment,
+                **status_index_environment,
+                # Only the ARN: the handler reads the key itself, so it is not in the function configuration
+                "CURSOR_SIGNING_SECRET_ARN": cursor_signing_secret.secret_arn,
+                **compression_environment
+            },
+            "get_task_stats": {
+                **stats_environment
+            }
+        }
+        handler_timeouts = {
+            "batch_create_tasks": Duration.seconds(30),
+            "batch_get_tasks": Duration.seconds(30),
+            "batch_delete_tasks": Duration.seconds(30),
+            "list_tasks": Duration.seconds(10)
+        }
+
+        # Lambda Functions, sized by the performance profile. API Gateway invokes the
+        # "live" alias of functions that keep provisioned concurrency, the function otherwise.
+        performance_profile = performance_profile or PerformanceProfile()
+        if optimized_bundles:
+            # Each function ships its handler module only, the shared modules come from a
+            # layer, and everything is byte-compiled for the function's runtime
+            bundles = HandlerBundles(
+                list(handler_environments) + ["router", "task_stats_consumer", "task_archiver", "stage_cache_consumer"],
+                # Staged in the cloud assembly (cdk.out), restaged on every synth rather than left in /tmp
+                staging_dir=Path(Stage.of(self).outdir, f"handler-bundles.{self.node.addr}")
+            )
+
+            def function_code(module, profile):
+                return {
+                    "code": bundles.code(module, profile.lambda_runtime),
+                    "layers": [bundles.layer(self, profile.lambda_runtime)]
+                }
+        else:
+            def function_code(module, profile):
+                return {"code": _lambda.Code.from_asset("lambda_functions")}
+
+        if single_function:
+            # One router Lambda serves every route, so all routes share the same warm containers
+            router_environment = {}
+            for environment in handler_environments.values():
+                router_environment.update(environment)
+
+            router_profile = performance_profile.for_function("router")
+            router_lambda = _lambda.Function(
+                self, "RouterFunction",
+                handler="router.handler",
+                **function_code("router", router_profile),
+                environment=router_environment,
+                role=lambda_role,
+                timeout=max(handler_timeouts.values(), key=lambda timeout: timeout.to_seconds()),
+                **router_profile.function_props()
+            )
+            router_target = add_live_alias(self, "RouterFunctionLiveAlias", router_lambda, router_profile)
+            functions = dict.fromkeys(handler_environments, router_target)
+        else:
+            functions = {}
+            for name, environment in handler_environments.items():
+                # e.g. "batch_create_tasks" -> "BatchCreateTasksFunction"
+                function_id = "".join(part.title() for part in name.split("_")) + "Function"
+                profile = performance_profile.for_function(name)
+                function = _lambda.Function(
+                    self, function_id,
+                    handler=f"{name}.handler",
+                    **function_code(name, profile),
+                    environment=environment,
+                    role=lambda_role,
+                    timeout=handler_timeouts.get(name),
+                    **profile.function_props()
+                )
+                functions[name] = add_live_alias(self, f"{function_id}LiveAlias", function, profile)
+
+        # Stream batches a consumer still fails on after bisecting and retrying, kept for inspection
+        # instead of blocking the shard until the records age out of the stream
+        stream_failure_queue = sqs.Queue(
+            self, "StreamFailureQueue",
+            retention_period=Duration.days(14),
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True
         )
 
-        # API Gateway
-        api = apigateway.RestApi(self, "TasksApi",
-            rest_api_name="Tasks Service",
-            description="This service serves tasks."
+        # Stream consumer keeping the counters current. A batch of up to 100 changes, gathered for
+        # at most a second, is coalesced into a single write of the net change per status.
+        stats_consumer_profile = performance_profile.for_function("task_stats_consumer")
+        stats_consumer = _lambda.Function(
+            self, "TaskStatsConsumerFunction",
+            handler="task_stats_consumer.handler",
+            **function_code("task_stats_consumer", stats_consumer_profile),
+            environment=stats_environment,
+            role=lambda_role,
+            **stats_consumer_profile.function_props()
         )
+        stats_consumer.add_event_source(lambda_event_sources.DynamoEventSource(
+            tasks_table,
+            starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+            batch_size=100,
+            max_batching_window=Duration.seconds(1),
+            # A failing batch is split in halves until the poison record is isolated, then skipped
+            bisect_batch_on_error=True,
+            retry_attempts=3,
+            on_failure=lambda_event_sources.SqsDlq(stream_failure_queue)
+        ))
 
-        # Define API GATEWAY json schema for POST and PUT requests
-        task_model = apigateway.Model(
-            self, "TaskModel",
-            rest_api=api,
-            content_type="application/json",
-            model_name="TaskModel",
-            schema=apigateway.JsonSchema(
-                schema=apigateway.JsonSchemaVersion.DRAFT4,
-                title="Task Model",
-                type=apigateway.JsonSchemaType.OBJECT,
-                properties={
-                    "title": apigateway.JsonSchema(type=apigateway.JsonSchemaType.STRING),
-                    "description": apigateway.JsonSchema(type=apigateway.JsonSchemaType.STRING),
-                    "status": apigateway.JsonSchema(type=apigateway.JsonSchemaType.STRING)
+        # Stream consumer archiving expired tasks. Only deletions made by the TTL reach it (not
+        # DELETE /tasks/{taskId}), gathered for up to a minute into one S3 object per batch.
+        # Without expiry nothing is ever deleted by the TTL, so neither it nor its bucket exist.
+        if completed_task_ttl_seconds > 0:
+            # Expired tasks, as gzip-compressed NDJSON objects. Kept when the stack is destroyed.
+            archive_bucket = s3.Bucket(
+                self, "TaskArchiveBucket",
+                block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+                encryption=s3.BucketEncryption.S3_MANAGED,
+                enforce_ssl=True,
+                removal_policy=RemovalPolicy.RETAIN
+            )
+            archiver_profile = performance_profile.for_function("task_archiver")
+            archiver = _lambda.Function(
+                self, "TaskArchiverFunction",
+                handler="task_archiver.handler",
+                **function_code("task_archiver", archiver_profile),
+                environment={
+                    "ARCHIVE_BUCKET_NAME": archive_bucket.bucket_name
                 },
-                required=["title", "description", "status"]
+                role=lambda_role,
+                timeout=Duration.seconds(60),
+                **archiver_profile.function_props()
             )
-        )
+            archiver.add_event_source(lambda_event_sources.DynamoEventSource(
+                tasks_table,
+                starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+                batch_size=1000,
+                max_batching_window=Duration.seconds(60),
+                bisect_batch_on_error=True,
+                retry_attempts=3,
+                on_failure=lambda_event_sources.SqsDlq(stream_failure_queue),
+                filters=[_lambda.FilterCriteria.filter({
+                    "eventName": _lambda.FilterRule.is_equal("REMOVE"),
+                    "userIdentity": {
+                        "type": _lambda.FilterRule.is_equal("Service"),
+                        "principalId": _lambda.FilterRule.is_equal("dynamodb.amazonaws.com")
+                    }
+                })]
+            ))
+            archive_bucket.grant_put(archiver)
+
+        # Stream consumer refreshing the stage cache entries of changed tasks, so the writers
+        # return without waiting on API Gateway and a second get_task invocation
+        if stage_cache_environment:
+            stage_cache_consumer_profile = performance_profile.for_function("stage_cache_consumer")
+            stage_cache_consumer = _lambda.Function(
+                self, "StageCacheConsumerFunction",
+                handler="stage_cache_consumer.handler",
+                **function_code("stage_cache_consumer", stage_cache_consumer_profile),
+                environment=stage_cache_environment,
+                role=lambda_role,
+                timeout=Duration.seconds(30),
+                **stage_cache_consumer_profile.function_props()
+            )
+            stage_cache_consumer.add_event_source(lambda_event_sources.DynamoEventSource(
+                tasks_table,
+                # Changes made before the consumer existed have no stage cache entry to refresh
+                starting_position=_lambda.StartingPosition.LATEST,
+                batch_size=100,
+                bisect_batch_on_error=True,
+                retry_attempts=3,
+                on_failure=lambda_event_sources.SqsDlq(stream_failure_queue)
+            ))
 
-        tasks = api.root.add_resource("tasks")
-
-        task = tasks.add_resource("{taskId}")
-
-        tasks.add_method(
-            "POST",
-            apigateway.LambdaIntegration(create_task_lambda),
-            request_models={
-                "application/json": task_model
-            })
-        task.add_method("GET", apigateway.LambdaIntegration(get_task_lambda))
-        task.add_method(
-            "PUT",
-            apigateway.LambdaIntegration(update_task_lambda),
-            request_models={
-                "application/json": task_model
-            })
-        task.add_method("DELETE", apigateway.LambdaIntegration(delete_task_lambda))
+        if api:
+            # API Gateway models, generated from the same schemas the handlers check against
+            task_model, task_patch_model, task_batch_model, task_ids_model, task_bulk_delete_model = (
+                apigateway.Model(
+                    self, model_name,
+                    rest_api=api,
+                    content_type="application/json",
+                    model_name=model_name,
+                    schema=json_schema(schema)
+                )
+                for model_name, schema in [
+                    ("TaskModel", task_schema.TASK_SCHEMA),
+                    ("TaskPatchModel", task_schema.TASK_PATCH_SCHEMA),
+                    ("TaskBatchModel", task_schema.TASK_BATCH_SCHEMA),
+                    ("TaskIdsModel", task_schema.TASK_IDS_SCHEMA),
+                    ("TaskBulkDeleteModel", task_schema.TASK_BULK_DELETE_SCHEMA)
+                ]
+            )
+
+            # Invalid requests are rejected by API Gateway before they invoke (and bill) a Lambda
+            request_validator = apigateway.RequestValidator(
+                self, "TaskRequestValidator",
+                rest_api=api,
+                validate_request_body=True,
+                validate_request_parameters=True
+            )
+            api.add_gateway_response(
+                "BadRequestBodyResponse",
+                type=apigateway.ResponseType.BAD_REQUEST_BODY,
+                templates={
+                    "application/json": '{"error": "$util.escapeJavaScript($context.error.validationErrorString)"}'
+                }
+            )
+            task_id_parameter = {
+                "method.request.path.taskId": True
+            }
+
+            tasks = api.root.add_resource("tasks")
+
+            task = tasks.add_resource("{taskId}")
+
+            tasks_batch = tasks.add_resource("batch")
+
+            tasks_batch_get = tasks.add_resource("batch-get")
+
+            tasks_batch_delete = tasks.add_resource("batch-delete")
+
+            tasks_stats = tasks.add_resource("stats")
+
+            tasks.add_method(
+                "POST",
+                apigateway.LambdaIntegration(functions["create_task"]),
+                request_validator=request_validator,
+                request_parameters={
+                    "method.request.header.Idempotency-Key": False
+                },
+                request_models={
+                    "application/json": task_model
+                })
+            list_parameters = {
+                "method.request.querystring.limit": False,
+                "method.request.querystring.cursor": False,
+                "method.request.querystring.status": False,
+                "method.request.querystring.titleContains": False
+            }
+            tasks.add_method(
+                "GET",
+                apigateway.LambdaIntegration(
+                    functions["list_tasks"],
+                    cache_key_parameters=list(list_parameters)
+                ),
+                request_validator=request_validator,
+                request_parameters=list_parameters)
+            task.add_method(
+                "GET",
+                apigateway.LambdaIntegration(
+                    functions["get_task"],
+                    cache_key_parameters=list(task_id_parameter)
+                ),
+                request_validator=request_validator,
+                request_parameters=task_id_parameter)
+            task.add_method(
+                "PUT",
+                apigateway.LambdaIntegration(functions["update_task"]),
+                request_validator=request_validator,
+                request_parameters=task_id_parameter,
+                request_models={
+                    "application/json": task_model
+                })
+            task.add_method(
+                "PATCH",
+                apigateway.LambdaIntegration(functions["patch_task"]),
+                request_validator=request_validator,
+                request_parameters=task_id_parameter,
+                request_models={
+                    "application/json": task_patch_model
+                })
+            task.add_method(
+                "DELETE",
+                apigateway.LambdaIntegration(functions["delete_task"]),
+                request_validator=request_validator,
+                request_parameters=task_id_parameter)
+            tasks_batch.add_method(
+                "POST",
+                apigateway.LambdaIntegration(functions["batch_create_tasks"]),
+                request_validator=request_validator,
+                request_models={
+                    "application/json": task_batch_model
+                })
+            tasks_batch_get.add_method(
+                "POST",
+                apigateway.LambdaIntegration(functions["batch_get_tasks"]),
+                request_validator=request_validator,
+                request_models={
+                    "application/json": task_ids_model
+                })
+            tasks_batch_delete.add_method(
+                "POST",
+                apigateway.LambdaIntegration(functions["batch_delete_tasks"]),
+                request_validator=request_validator,
+                request_models={
+                    "application/json": task_bulk_delete_model
+                })
+            tasks_stats.add_method(
+                "GET",
+                apigateway.LambdaIntegration(functions["get_task_stats"]),
+                request_validator=request_validator)
+
+        # HTTP API (payload 2.0) with the same routes, cheaper and faster per request. It neither
+        # validates requests nor caches responses; the handlers check what they receive.
+        if api_type != "rest":
+            http_api = apigatewayv2.HttpApi(self, "TasksHttpApi",
+                api_name="Tasks Service HTTP",
+                description="This service serves tasks over an HTTP API."
+            )
+            for method, path, name in HTTP_ROUTES:
+                http_api.add_routes(
+                    path=path,
+                    methods=[apigatewayv2.HttpMethod[method]],
+                    # e.g. "get_task" -> "GetTaskIntegration"
+                    integration=apigatewayv2_integrations.HttpLambdaIntegration(
+                        "".join(part.title() for part in name.split("_")) + "Integration",
+                        functions[name],
+                        payload_format_version=apigatewayv2.PayloadFormatVersion.VERSION_2_0
+                    )
+                )
+            CfnOutput(self, "HttpApiUrl", value=http_api.url)
 
         # Lambda permissions to access DynamoDB
-        tasks_table.grant_read_write_data(create_task_lambda)
-        tasks_table.grant_read_data(get_task_lambda)
-        tasks_table.grant_read_write_data(update_task_lambda)
-        tasks_table.grant_read_write_data(delete_task_lambda)
+        read_only_handlers = {"get_task", "batch_get_tasks", "list_tasks"}
+        for name, function in functions.items():
+            if name == "get_task_stats":
+                stats_table.grant_read_data(function)
+            elif name in read_only_handlers:
+                tasks_table.grant_read_data(function)
+            else:
+                tasks_table.grant_read_write_data(function)
+        idempotency_table.grant_read_write_data(functions["create_task"])
+        cursor_signing_secret.grant_read(functions["list_tasks"])
+        stats_table.grant_write_data(stats_consumer)
+
+        # Permission to refresh stage cache entries with a signed "Cache-Control: max-age=0" request,
+        # and to flush the whole stage cache for batches of more than stage_cache.MAX_INVALIDATE_TASKS
+        if stage_cache_environment:
+            iam.Grant.add_to_principal(
+                grantee=stage_cache_consumer,
+                actions=["execute-api:InvalidateCache"],
+                resource_arns=[api.arn_for_execute_api("GET", "/tasks/*", stage_name)]
+            )
+            iam.Grant.add_to_principal(
+                grantee=stage_cache_consumer,
+                actions=["apigateway:DELETE"],
+                resource_arns=[
+                    f"arn:{self.partition}:apigateway:{self.region}::/restapis/{api.rest_api_id}"
+                    f"/stages/{stage_name}/cache/data"
+                ]
+            )
@@ -0,0 +1,152 @@
+"""Minimal Lambda packages for the handlers in lambda_functions/.
+
+Each function ships only its handler module; the modules the handlers share
+(runtime, metrics, serialization, ...) ship once, in a layer under ``python/``,
+where the handlers' flat ``from runtime import ...`` fallback finds them. Both
+are byte-compiled for the function's runtime so a cold start does not compile
+them again. The .pyc files use unchecked-hash invalidation: Lambda unpacks code
+with fixed timestamps, so timestamp-based .pyc files would be considered stale
+and recompiled (without being cached, /var/task is read-only) on every cold start.
+
+Compilation runs with a local interpreter matching the runtime (e.g.
+``python3.12`` on the PATH) and falls back to the runtime's Docker bundling image.
+"""
+import ast
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import jsii
+from aws_cdk import BundlingOptions, ILocalBundling, aws_lambda as _lambda
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "lambda_functions"
+
+COMPILE_ARGUMENTS = ["-m", "compileall", "-q", "--invalidation-mode", "unchecked-hash"]
+
+
+def local_imports(module, source_dir=SOURCE_DIR):
+    """Returns the modules of ``source_dir`` that ``module`` imports directly."""
+    local_modules = {path.stem for path in source_dir.glob("*.py")}
+    tree = ast.parse((source_dir / f"{module}.py").read_text())
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.level and not node.module:
+                # from . import a, b
+                imported.update(alias.name for alias in node.names)
+            elif node.module:
+                imported.add(node.module.split(".")[0])
+        elif isinstance(node, ast.Import):
+            imported.update(alias.name.split(".")[0] for alias in node.names)
+    return (imported & local_modules) - {module, "__init__"}
+
+
+def dependencies(modules, source_dir=SOURCE_DIR):
+    """Returns ``modules`` and every module of ``source_dir`` they import, transitively."""
+    found = set()
+    pending = list(modules)
+    while pending:
+        module = pending.pop()
+        if module not in found:
+            found.add(module)
+            pending.extend(local_imports(module, source_dir))
+    return found
+
+
+def copy_modules(modules, target, source_dir=SOURCE_DIR):
+    target.mkdir(parents=True, exist_ok=True)
+    for module in sorted(modules):
+        shutil.copy2(source_dir / f"{module}.py", target / f"{module}.py")
+
+
+def interpreter_for(runtime_name):
+    """Returns a local Python matching ``runtime_name`` (e.g. "python3.12"), or None."""
+    if runtime_name == f"python{sys.version_info.major}.{sys.version_info.minor}":
+        return sys.executable
+    executable = shutil.which(runtime_name)
+    if executable and subprocess.run([executable, "-c", "pass"], capture_output=True).returncode == 0:
+        return executable
+    return None
+
+
+def compile_tree(directory, python=sys.executable):
+    """Byte-compiles every module under ``directory`` with ``python``, for use without their sources' timestamps."""
+    subprocess.run([python, *COMPILE_ARGUMENTS, str(directory)], check=True)
+
+
+@jsii.implements(ILocalBundling)
+class LocalCompile:
+    """Copies a staged package and compiles it with a local interpreter of the target runtime."""
+
+    def __init__(self, source, runtime_name):
+        self.source = source
+        self.runtime_name = runtime_name
+
+    def try_bundle(self, output_dir, options):
+        python = interpreter_for(self.runtime_name)
+        if python is None:
+            return False
+        shutil.copytree(self.source, output_dir, dirs_exist_ok=True)
+        compile_tree(output_dir, python)
+        return True
+
+
+def compiled_code(directory, runtime):
+    """Code asset of a staged directory, byte-compiled for ``runtime``."""
+    return _lambda.Code.from_asset(str(directory), bundling=BundlingOptions(
+        image=runtime.bundling_image,
+        command=["bash", "-c", "cp -r /asset-input/. /asset-output/ && python "
+                 + " ".join(COMPILE_ARGUMENTS) + " /asset-output"],
+        local=LocalCompile(directory, runtime.name)
+    ))
+
+
+class HandlerBundles:
+    """Stages one package per function and one shared-code layer per runtime.
+
+    Packages are staged under ``staging_dir``, which is emptied first so modules
+    dropped from a bundle do not linger. Without one they go to a temporary
+    directory that is removed with the bundles (or when the interpreter exits).
+    """
+
+    def __init__(self, handler_modules, source_dir=SOURCE_DIR, staging_dir=None):
+        self.source_dir = source_dir
+        self.handler_modules = set(handler_modules)
+        self.shared_modules = dependencies(self.handler_modules, source_dir) - self.handler_modules
+        if staging_dir is None:
+            self._temporary_dir = tempfile.TemporaryDirectory(prefix="tasks-lambda-")
+            self.staging_dir = Path(self._temporary_dir.name)
+        else:
+            self.staging_dir = Path(staging_dir)
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            self.staging_dir.mkdir(parents=True)
+        self.layers = {}
+
+    def bundle_modules(self, entry_module):
+        """Modules packaged with the function whose handler lives in ``entry_module``.
+
+        A handler ships alone; the router also ships the handlers it dispatches to.
+        """
+        return dependencies([entry_module], self.source_dir) - self.shared_modules
+
+    def code(self, entry_module, runtime):
+        directory = self.staging_dir / runtime.name / entry_module
+        if not directory.exists():
+            copy_modules(self.bundle_modules(entry_module), directory, self.source_dir)
+        return compiled_code(directory, runtime)
+
+    def layer(self, scope, runtime):
+        """The shared-code layer for ``runtime``, created on first use."""
+        if runtime.name not in self.layers:
+            directory = self.staging_dir / runtime.name / "layer"
+            copy_modules(self.shared_modules, directory / "python", self.source_dir)
+            # e.g. "python3.12" -> "SharedCodeLayerPython312"
+            self.layers[runtime.name] = _lambda.LayerVersion(
+                scope, "SharedCodeLayer" + runtime.name.replace(".", "").title(),
+                code=compiled_code(directory, runtime),
+                compatible_runtimes=[runtime],
+                description=f"Modules shared by the task handlers, compiled for {runtime.name}"
+            )
+        return self.layers[runtime.name]
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+from aws_cdk import Duration, aws_apigateway as apigateway
+
+# Cache cluster sizes API Gateway offers, in GB
+CLUSTER_SIZES = ("0.5", "1.6", "6.1", "13.5", "28.4", "58.2", "118", "237")
+
+MAX_TTL_SECONDS = 3600
+
+# Methods the stack gives cache keys; a cached response is only ever reused for the same keys
+CACHEABLE_METHODS = ("GET /tasks", "GET /tasks/{taskId}")
+
+
+@dataclass(frozen=True)
+class StageCacheProfile:
+    """API Gateway stage cache of the tasks API.
+
+    ``methods`` maps a cached method, e.g. "GET /tasks/{taskId}", to its TTL in
+    seconds; methods not listed are never cached. The stack keys each cached
+    method on its request parameters (the ``taskId`` path parameter for a task).
+    """
+    enabled: bool = False
+    cluster_size: str = "0.5"
+    methods: Dict[str, int] = field(default_factory=lambda: {"GET /tasks/{taskId}": 300})
+
+    def __post_init__(self):
+        if self.cluster_size not in CLUSTER_SIZES:
+            raise ValueError(f"cluster_size must be one of {', '.join(CLUSTER_SIZES)}, not {self.cluster_size!r}")
+        for method, ttl in self.methods.items():
+            if method not in CACHEABLE_METHODS:
+                raise ValueError(f"only {' and '.join(CACHEABLE_METHODS)} can be cached, not {method!r}")
+            if not 0 <= ttl <= MAX_TTL_SECONDS:
+                raise ValueError(f"cache TTL of {method} must be between 0 and {MAX_TTL_SECONDS} seconds, not {ttl}")
+
+    def caches(self, method: str) -> bool:
+        return self.enabled and self.methods.get(method, 0) > 0
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "StageCacheProfile":
+        """Reads a profile from cdk.json / `-c stageCache='{...}'` context, e.g.
+
+            {"enabled": true, "clusterSize": "0.5",
+             "methods": {"GET /tasks/{taskId}": {"ttlSeconds": 300}}}
+        """
+        methods = values.get("methods")
+        return cls(
+            enabled=str(values.get("enabled", False)).lower() == "true",
+            cluster_size=str(values.get("clusterSize", cls.cluster_size)),
+            methods={method: int(settings["ttlSeconds"]) for method, settings in methods.items()}
+            if methods else cls().methods
+        )
+
+    def stage_options(self, stage_name: str) -> apigateway.StageOptions:
+        """Deploy options of the API's stage."""
+        if not self.enabled:
+            return apigateway.StageOptions(stage_name=stage_name)
+        return apigateway.StageOptions(
+            stage_name=stage_name,
+            cache_cluster_enabled=True,
+            cache_cluster_size=self.cluster_size,
+            method_options={
+                # "GET /tasks/{taskId}" -> "/tasks/{taskId}/GET"
+                "{1}/{0}".format(*method.split(" ", 1)): apigateway.MethodDeploymentOptions(
+                    caching_enabled=True,
+                    cache_ttl=Duration.seconds(ttl),
+                    cache_data_encrypted=True
+                )
+                for method, ttl in self.methods.items()
+                if ttl > 0
+            }
+        )
@@ -0,0 +1,138 @@
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Optional
+
+from aws_cdk import aws_dynamodb as dynamodb
+
+PAY_PER_REQUEST = "PAY_PER_REQUEST"
+PROVISIONED = "PROVISIONED"
+
+
+@dataclass(frozen=True)
+class ScalingSettings:
+    """Provisioned capacity units of one direction (read or write).
+
+    The table starts at ``min_capacity``; when ``max_capacity`` is higher,
+    Application Auto Scaling keeps consumed capacity near ``target_utilization``
+    percent of what is provisioned.
+    """
+    min_capacity: int = 5
+    max_capacity: int = 5
+    target_utilization: float = 70
+
+    @property
+    def autoscaled(self) -> bool:
+        return self.max_capacity > self.min_capacity
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "ScalingSettings":
+        return cls(
+            min_capacity=int(values.get("min", cls.min_capacity)),
+            max_capacity=int(values.get("max", values.get("min", cls.max_capacity))),
+            target_utilization=float(values.get("targetUtilization", cls.target_utilization))
+        )
+
+
+@dataclass(frozen=True)
+class IndexCapacity:
+    read: Optional[ScalingSettings] = None
+    write: Optional[ScalingSettings] = None
+
+
+@dataclass(frozen=True)
+class CapacityProfile:
+    """How TasksTable and its indexes are billed and scaled.
+
+    ``PAY_PER_REQUEST`` (on-demand) needs no settings. ``PROVISIONED`` uses
+    ``read``/``write`` for the table and, unless overridden in ``indexes``, for
+    every global secondary index. ``contributor_insights`` turns on CloudWatch
+    Contributor Insights for the table and its indexes to find hot keys.
+    """
+    billing_mode: str = PAY_PER_REQUEST
+    read: ScalingSettings = field(default_factory=ScalingSettings)
+    write: ScalingSettings = field(default_factory=ScalingSettings)
+    indexes: Dict[str, IndexCapacity] = field(default_factory=dict)
+    contributor_insights: bool = False
+
+    def __post_init__(self):
+        if self.billing_mode not in (PAY_PER_REQUEST, PROVISIONED):
+            raise ValueError(f"billing_mode must be {PAY_PER_REQUEST} or {PROVISIONED}, not {self.billing_mode!r}")
+
+    @property
+    def provisioned(self) -> bool:
+        return self.billing_mode == PROVISIONED
+
+    def index_read(self, index_name: str) -> ScalingSettings:
+        return (self.indexes.get(index_name) or IndexCapacity()).read or self.read
+
+    def index_write(self, index_name: str) -> ScalingSettings:
+        return (self.indexes.get(index_name) or IndexCapacity()).write or self.write
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "CapacityProfile":
+        """Reads a profile from cdk.json / `-c capacityProfile='{...}'` context, e.g.
+
+            {"billingMode": "PROVISIONED",
+             "read": {"min": 5, "max": 200, "targetUtilization": 70},
+             "write": {"min": 5, "max": 100},
+             "indexes": {"StatusIndex": {"read": {"min": 5, "max": 50}}},
+             "contributorInsights": true}
+        """
+        def settings(values, default):
+            return ScalingSettings.from_dict(values) if values else default
+
+        read = settings(values.get("read"), ScalingSettings())
+        write = settings(values.get("write"), ScalingSettings())
+        return cls(
+            billing_mode=values.get("billingMode", PAY_PER_REQUEST).upper(),
+            read=read,
+            write=write,
+            indexes={
+                name: IndexCapacity(read=settings(index.get("read"), None), write=settings(index.get("write"), None))
+                for name, index in (values.get("indexes") or {}).items()
+            },
+            contributor_insights=str(values.get("contributorInsights", False)).lower() == "true"
+        )
+
+    def table_props(self) -> dict:
+        """Keyword arguments for dynamodb.Table."""
+        if not self.provisioned:
+            return {
+                "billing_mode": dynamodb.BillingMode.PAY_PER_REQUEST,
+                "contributor_insights_enabled": self.contributor_insights
+            }
+        return {
+            "billing_mode": dynamodb.BillingMode.PROVISIONED,
+            "read_capacity": self.read.min_capacity,
+            "write_capacity": self.write.min_capacity,
+            "contributor_insights_enabled": self.contributor_insights
+        }
+
+    def index_props(self, index_name: str) -> dict:
+        """Keyword arguments for Table.add_global_secondary_index."""
+        if not self.provisioned:
+            return {}
+        return {
+            "read_capacity": self.index_read(index_name).min_capacity,
+            "write_capacity": self.index_write(index_name).min_capacity
+        }
+
+    def apply_scaling(self, table: dynamodb.Table, index_names=()) -> None:
+        """Adds target-tracking autoscaling for every autoscaled direction of the table and ``index_names``."""
+        if not self.provisioned:
+            return
+        scalings = [
+            (self.read, table.auto_scale_read_capacity),
+            (self.write, table.auto_scale_write_capacity)
+        ]
+        for index_name in index_names:
+            scalings.append((self.index_read(index_name),
+                             partial(table.auto_scale_global_secondary_index_read_capacity, index_name)))
+            scalings.append((self.index_write(index_name),
+                             partial(table.auto_scale_global_secondary_index_write_capacity, index_name)))
+        for settings, auto_scale in scalings:
+            if settings.autoscaled:
+                auto_scale(
+                    min_capacity=settings.min_capacity,
+                    max_capacity=settings.max_capacity
+                ).scale_on_utilization(target_utilization_percent=settings.target_utilization)
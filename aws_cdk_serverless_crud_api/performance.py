@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional
+
+from aws_cdk import aws_lambda as _lambda
+
+RUNTIMES = {
+    "python3.10": _lambda.Runtime.PYTHON_3_10,
+    "python3.11": _lambda.Runtime.PYTHON_3_11,
+    "python3.12": _lambda.Runtime.PYTHON_3_12
+}
+
+ARCHITECTURES = {
+    "arm64": _lambda.Architecture.ARM_64,
+    "x86_64": _lambda.Architecture.X86_64
+}
+
+
+@dataclass(frozen=True)
+class ProvisionedConcurrency:
+    """Pre-initialized execution environments kept on a function's ``live`` alias.
+
+    The alias starts at ``min_executions``; when ``max_executions`` is higher,
+    Application Auto Scaling keeps provisioned concurrency utilization near
+    ``target_utilization`` (0-1).
+    """
+    min_executions: int = 1
+    max_executions: int = 1
+    target_utilization: float = 0.7
+
+    @property
+    def autoscaled(self) -> bool:
+        return self.max_executions > self.min_executions
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "ProvisionedConcurrency":
+        return cls(
+            min_executions=int(values.get("min", cls.min_executions)),
+            max_executions=int(values.get("max", values.get("min", cls.max_executions))),
+            target_utilization=float(values.get("targetUtilization", cls.target_utilization))
+        )
+
+
+@dataclass(frozen=True)
+class FunctionProfile:
+    """Sizing and concurrency of one Lambda function.
+
+    ``reserved_concurrency`` caps the function's concurrent executions (and so
+    the load it can put on DynamoDB) and reserves them from the account pool.
+    """
+    memory_size: int = 256
+    architecture: str = "arm64"
+    runtime: str = "python3.12"
+    provisioned_concurrency: Optional[ProvisionedConcurrency] = None
+    reserved_concurrency: Optional[int] = None
+
+    def __post_init__(self):
+        if self.runtime not in RUNTIMES:
+            raise ValueError(f"runtime must be one of {', '.join(RUNTIMES)}, not {self.runtime!r}")
+        if self.architecture not in ARCHITECTURES:
+            raise ValueError(f"architecture must be one of {', '.join(ARCHITECTURES)}, not {self.architecture!r}")
+        if (self.provisioned_concurrency and self.reserved_concurrency is not None
+                and self.provisioned_concurrency.max_executions > self.reserved_concurrency):
+            raise ValueError("provisioned concurrency cannot exceed reserved concurrency")
+
+    @property
+    def lambda_runtime(self) -> _lambda.Runtime:
+        return RUNTIMES[self.runtime]
+
+    def function_props(self) -> dict:
+        """Keyword arguments for lambda.Function."""
+        return {
+            "runtime": self.lambda_runtime,
+            "architecture": ARCHITECTURES[self.architecture],
+            "memory_size": self.memory_size,
+            "reserved_concurrent_executions": self.reserved_concurrency
+        }
+
+    def with_values(self, values: dict) -> "FunctionProfile":
+        """Returns this profile overridden by a context dict such as {"memorySize": 512}."""
+        changes = {}
+        if "memorySize" in values:
+            changes["memory_size"] = int(values["memorySize"])
+        if "architecture" in values:
+            changes["architecture"] = values["architecture"]
+        if "runtime" in values:
+            changes["runtime"] = values["runtime"]
+        if "provisionedConcurrency" in values:
+            provisioned = values["provisionedConcurrency"]
+            changes["provisioned_concurrency"] = ProvisionedConcurrency.from_dict(provisioned) if provisioned else None
+        if "reservedConcurrency" in values:
+            reserved = values["reservedConcurrency"]
+            changes["reserved_concurrency"] = int(reserved) if reserved is not None else None
+        return replace(self, **changes)
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """Per-function performance settings, keyed by handler module (or "router")."""
+    default: FunctionProfile = field(default_factory=FunctionProfile)
+    functions: Dict[str, FunctionProfile] = field(default_factory=dict)
+
+    def for_function(self, name: str) -> FunctionProfile:
+        return self.functions.get(name, self.default)
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "PerformanceProfile":
+        """Reads a profile from cdk.json / `-c performanceProfile='{...}'` context, e.g.
+
+            {"default": {"memorySize": 512, "architecture": "arm64", "runtime": "python3.12"},
+             "functions": {
+                 "get_task": {"provisionedConcurrency": {"min": 2, "max": 20}, "reservedConcurrency": 100},
+                 "batch_delete_tasks": {"reservedConcurrency": 2}}}
+
+        Function entries override the default profile field by field.
+        """
+        default = FunctionProfile().with_values(values.get("default") or {})
+        return cls(
+            default=default,
+            functions={name: default.with_values(function) for name, function in (values.get("functions") or {}).items()}
+        )
+
+
+def add_live_alias(scope, id: str, function: _lambda.Function, profile: FunctionProfile) -> _lambda.IFunction:
+    """Returns what API Gateway should invoke: the function itself, or a ``live`` alias
+    with provisioned concurrency (and its autoscaling) when the profile asks for it."""
+    provisioned = profile.provisioned_concurrency
+    if not provisioned:
+        return function
+    alias = _lambda.Alias(
+        scope, id,
+        alias_name="live",
+        version=function.current_version,
+        provisioned_concurrent_executions=provisioned.min_executions
+    )
+    if provisioned.autoscaled:
+        alias.add_auto_scaling(
+            min_capacity=provisioned.min_executions,
+            max_capacity=provisioned.max_executions
+        ).scale_on_utilization(utilization_target=provisioned.target_utilization)
+    return alias
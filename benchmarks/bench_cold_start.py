@@ -0,0 +1,109 @@
+"""Cold-start import time per function: whole source directory vs. optimized bundles.
+
+For every handler module, compares in fresh interpreters:
+
+* source: ``lambda_functions/`` as a flat package without bytecode, which is what
+  ``cdk deploy -c optimizedBundles=false`` ships, so each cold start compiles
+  every module it imports;
+* bundle: the function's package from ``aws_cdk_serverless_crud_api.bundling`` plus
+  the shared-code layer, byte-compiled with unchecked-hash .pyc files.
+
+Each is timed twice: "init", the whole import as a cold start pays it, and
+"own", the same import with boto3/botocore already loaded. Those come with the
+Lambda runtime, are identical in both layouts and dominate "init", so bundling
+only shows in "own": a few milliseconds per cold start, within the noise of
+"init". The larger effect is on deployment size, also reported per function.
+Bundles are compiled with the running interpreter, so run it with the Python
+version the functions use.
+
+    python -m benchmarks.bench_cold_start [--cold-starts 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from aws_cdk_serverless_crud_api.bundling import SOURCE_DIR, HandlerBundles, compile_tree, copy_modules
+
+ENVIRONMENT = {
+    'TASKS_TABLE_NAME': 'TasksTable',
+    'IDEMPOTENCY_TABLE_NAME': 'IdempotencyTable',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'benchmark',
+    'AWS_SECRET_ACCESS_KEY': 'benchmark'
+}
+
+COLD_START_SCRIPT = """
+import importlib, sys, time
+if sys.argv[2] == 'own':
+    import boto3, boto3.dynamodb.conditions, botocore.config, botocore.exceptions, botocore.session
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def handler_modules():
+    return sorted(path.stem for path in SOURCE_DIR.glob('*.py') if 'def handler(' in path.read_text())
+
+
+def package_size(*directories):
+    files = [path for directory in directories for path in directory.rglob('*') if path.is_file()]
+    return len(files), sum(path.stat().st_size for path in files)
+
+
+def cold_start(module, path, runs, write_bytecode, measure='init'):
+    environment = dict(os.environ, **ENVIRONMENT, PYTHONPATH=os.pathsep.join(str(entry) for entry in path))
+    if not write_bytecode:
+        environment['PYTHONDONTWRITEBYTECODE'] = '1'
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-s', '-c', COLD_START_SCRIPT, module, measure],
+                                env=environment, capture_output=True, text=True, check=True).stdout
+        samples.append(float(output))
+    return statistics.median(samples)
+
+
+def report(modules, bundles, cold_starts):
+    # A bytecode-free copy of the source directory, as deployed without bundling
+    source = bundles.staging_dir / 'source'
+    copy_modules([path.stem for path in SOURCE_DIR.glob('*.py')], source)
+    layer = bundles.staging_dir / 'layer' / 'python'
+    copy_modules(bundles.shared_modules, layer)
+    compile_tree(layer)
+
+    print(f'python {sys.version.split()[0]}, shared layer: {len(bundles.shared_modules)} modules')
+    print(f'{"function":<20} {"init ms source/bundle":>22} {"own ms source/bundle":>21} {"own gain":>9}  '
+          f'{"source files/KB":>16} {"bundle files/KB":>16}')
+    for module in modules:
+        package = bundles.staging_dir / 'functions' / module
+        copy_modules(bundles.bundle_modules(module), package)
+        compile_tree(package)
+
+        source_init = cold_start(module, [source], cold_starts, write_bytecode=False)
+        bundle_init = cold_start(module, [package, layer], cold_starts, write_bytecode=False)
+        source_own = cold_start(module, [source], cold_starts, write_bytecode=False, measure='own')
+        bundle_own = cold_start(module, [package, layer], cold_starts, write_bytecode=False, measure='own')
+        source_files, source_bytes = package_size(source)
+        bundle_files, bundle_bytes = package_size(package)
+        print(f'{module:<20} {source_init * 1000:>10.1f}/{bundle_init * 1000:<11.1f} '
+              f'{source_own * 1000:>9.1f}/{bundle_own * 1000:<11.1f} {source_own / bundle_own:>8.1f}x  '
+              f'{source_files:>7}/{source_bytes / 1024:<8.1f} {bundle_files:>7}/{bundle_bytes / 1024:<8.1f}')
+    layer_files, layer_bytes = package_size(layer)
+    print(f'\nshared layer (deployed once): {layer_files} files, {layer_bytes / 1024:.1f} KB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cold-starts', type=int, default=10, help='fresh interpreters per measurement, the median is reported')
+    args = parser.parse_args()
+
+    modules = handler_modules()
+    with tempfile.TemporaryDirectory(prefix='bench-cold-start-') as staging_dir:
+        report(modules, HandlerBundles(modules, staging_dir=staging_dir), args.cold_starts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Bytes on the wire vs. CPU time of gzipping task responses.
+
+For representative response bodies (one task with a growing description, and a
+list page), reports at each gzip level the compressed size, the base64 payload
+the function returns, the CPU time per response, and the time the body takes
+to download on a slow mobile link with and without compression.
+
+    python -m benchmarks.bench_compression [--number 200] [--link-kbps 1000]
+"""
+import argparse
+import base64
+import gzip
+import random
+import string
+import timeit
+
+from benchmarks.bench_serialization import make_task
+from lambda_functions import serialization
+
+# Repeated lorem ipsum compresses far better than real descriptions, so the text
+# is drawn from a fixed random vocabulary instead
+_random = random.Random(0)
+VOCABULARY = [''.join(_random.choices(string.ascii_lowercase, k=_random.randint(2, 10))) for _ in range(2000)]
+
+
+def make_text(size):
+    words = []
+    length = 0
+    while length < size:
+        words.append(_random.choice(VOCABULARY))
+        length += len(words[-1]) + 1
+    return ' '.join(words)[:size]
+
+
+def make_item(description_size):
+    return {**make_task(0), 'description': make_text(description_size)}
+
+
+SCENARIOS = {
+    'item, 200 B description': lambda: make_item(200),
+    'item, 2 KB description': lambda: make_item(2_000),
+    'item, 20 KB description': lambda: make_item(20_000),
+    'item, 200 KB description': lambda: make_item(200_000),
+    'list page, 100 items of 2 KB': lambda: {'items': [make_item(2_000) for _ in range(100)], 'cursor': None},
+}
+
+LEVELS = [1, 6, 9]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=200, help='compressions per measurement')
+    parser.add_argument('--repeat', type=int, default=3, help='measurements per level, the best one is reported')
+    parser.add_argument('--link-kbps', type=float, default=1000, help='client download speed, in kbit/s')
+    args = parser.parse_args()
+
+    def transfer_ms(size):
+        return size * 8 / args.link_kbps
+
+    for scenario, factory in SCENARIOS.items():
+        body = serialization.dumps(factory()).encode('utf-8')
+        print(f'\n{scenario}: {len(body)} bytes, {transfer_ms(len(body)):.1f} ms to download uncompressed')
+        for level in LEVELS:
+            compressed = gzip.compress(body, compresslevel=level, mtime=0)
+            payload = base64.b64encode(compressed)
+            best = min(timeit.repeat(lambda: base64.b64encode(gzip.compress(body, compresslevel=level, mtime=0)),
+                                     number=args.number, repeat=args.repeat))
+            cpu_us = best / args.number * 1e6
+            saved_ms = transfer_ms(len(body)) - transfer_ms(len(compressed))
+            print(f'  gzip level {level}: {len(compressed):>8} bytes on the wire ({len(compressed) / len(body):6.1%}), '
+                  f'{len(payload):>8} bytes returned, {cpu_us:9.1f} us CPU, {saved_ms:8.1f} ms less download')
+
+
+if __name__ == '__main__':
+    main()
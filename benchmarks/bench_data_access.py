@@ -0,0 +1,127 @@
+"""Compares the boto3 resource layer with the low-level client fast path.
+
+Reports, for TASKS_DATA_ACCESS=resource and TASKS_DATA_ACCESS=client:
+
+* cold start: time to import a handler and build its table, in a fresh interpreter;
+* per call: CPU time of get_item/update_item through each path. DynamoDB is replaced
+  by canned HTTP responses, so only request building, marshalling and response
+  parsing are measured.
+
+    python -m benchmarks.bench_data_access [--cold-starts 10] [--number 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+
+from botocore.awsrequest import AWSResponse
+
+MODES = ['resource', 'client']
+
+ENVIRONMENT = {
+    'TASKS_TABLE_NAME': 'TasksTable',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'benchmark',
+    'AWS_SECRET_ACCESS_KEY': 'benchmark'
+}
+
+COLD_START_SCRIPT = """
+import time
+start = time.perf_counter()
+import lambda_functions.get_task
+from lambda_functions import runtime
+runtime.get_table()
+print(time.perf_counter() - start)
+"""
+
+ITEM = {
+    'taskId': {'S': '0f8fad5b-d9cb-469f-a165-70867728950e'},
+    'title': {'S': 'Prepare the quarterly report'},
+    'description': {'S': 'Collect the numbers from every team and write the summary.'},
+    'status': {'S': 'pending'},
+    'statusShard': {'S': 'pending#2'},
+    'version': {'N': '7'}
+}
+
+CANNED_RESPONSES = {
+    'GetItem': {'Item': ITEM},
+    'UpdateItem': {'Attributes': {name: ITEM[name] for name in ('title', 'status', 'version')}}
+}
+
+
+class _Body:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def stream(self, **kwargs):
+        yield self.payload
+
+
+def _canned_response(request, **kwargs):
+    operation = request.headers['X-Amz-Target'].decode().split('.')[-1]
+    payload = json.dumps(CANNED_RESPONSES[operation]).encode()
+    return AWSResponse(request.url, 200, {'Content-Type': 'application/x-amz-json-1.0'}, _Body(payload))
+
+
+def cold_start(mode, runs):
+    environment = dict(os.environ, **ENVIRONMENT, TASKS_DATA_ACCESS=mode)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], env=environment,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output))
+    return statistics.median(samples)
+
+
+def per_call(mode, number, repeat):
+    from lambda_functions import runtime
+
+    os.environ['TASKS_DATA_ACCESS'] = mode
+    runtime.reset()
+    table = runtime.get_table()
+    client = table.client if mode == 'client' else table.meta.client
+    client.meta.events.register('before-send.dynamodb', _canned_response)
+
+    calls = {
+        'get_item': lambda: table.get_item(Key={'taskId': '0f8fad5b-d9cb-469f-a165-70867728950e'}),
+        'update_item': lambda: table.update_item(
+            Key={'taskId': '0f8fad5b-d9cb-469f-a165-70867728950e'},
+            UpdateExpression='SET title=:t, #s=:s ADD #v :one',
+            ExpressionAttributeNames={'#s': 'status', '#v': 'version'},
+            ExpressionAttributeValues={':t': 'Prepare the quarterly report', ':s': 'pending', ':one': 1},
+            ReturnValues='UPDATED_NEW'
+        )
+    }
+    return {
+        name: min(timeit.repeat(call, number=number, repeat=repeat)) / number
+        for name, call in calls.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cold-starts', type=int, default=10, help='fresh interpreters per mode')
+    parser.add_argument('--number', type=int, default=2000, help='calls per measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='measurements per call, the best one is reported')
+    args = parser.parse_args()
+
+    os.environ.update(ENVIRONMENT)
+
+    print('cold start (import handler + build table, median)')
+    for mode in MODES:
+        print(f'  {mode:<10} {cold_start(mode, args.cold_starts) * 1000:8.1f} ms')
+
+    print('\nper call (canned responses, best of repeats)')
+    results = {mode: per_call(mode, args.number, args.repeat) for mode in MODES}
+    for call in results['resource']:
+        baseline = results['resource'][call]
+        for mode in MODES:
+            seconds = results[mode][call]
+            print(f'  {call:<12} {mode:<10} {seconds * 1e6:8.1f} us  {baseline / seconds:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Latency and throughput benchmark of the task handlers against moto.
+
+Drives create_task, get_task, update_task and delete_task with configurable item
+sizes and concurrency, reports p50/p95/p99 latency and ops/sec per handler, and can
+write the results as JSON and compare them with a stored baseline:
+
+    python -m benchmarks.bench_handlers --operations 500 --concurrency 8 --output results.json
+    python -m benchmarks.bench_handlers --baseline baseline.json --tolerance 0.25
+
+The run exits with status 1 when a handler is slower than the baseline by more
+than the tolerance (p95 latency up, or throughput down), so it can gate CI. Absolute
+numbers include moto's own overhead; compare runs made on the same machine.
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+HANDLERS = ['create_task', 'get_task', 'update_task', 'delete_task']
+
+ENVIRONMENT = {
+    'TASKS_TABLE_NAME': 'TasksTable',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'benchmark',
+    'AWS_SECRET_ACCESS_KEY': 'benchmark'
+}
+
+
+def create_table():
+    import boto3
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.create_table(
+        TableName='TasksTable',
+        KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'taskId', 'AttributeType': 'S'},
+            {'AttributeName': 'statusShard', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'StatusIndex',
+            'KeySchema': [
+                {'AttributeName': 'statusShard', 'KeyType': 'HASH'},
+                {'AttributeName': 'taskId', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+    return table
+
+
+def task_body(item_size):
+    return {
+        'title': 'Benchmark task',
+        'description': 'x' * item_size,
+        'status': 'pending'
+    }
+
+
+def seed(table, count, item_size):
+    from lambda_functions.status_shards import shard_for
+
+    task_ids = [str(uuid.uuid4()) for _ in range(count)]
+    with table.batch_writer() as writer:
+        for task_id in task_ids:
+            writer.put_item(Item=dict(
+                task_body(item_size), taskId=task_id, version=1, statusShard=shard_for(task_id, 'pending')
+            ))
+    return task_ids
+
+
+def events_for(name, task_ids, item_size):
+    body = json.dumps(task_body(item_size))
+    if name == 'create_task':
+        return [{'body': body} for _ in task_ids]
+    if name == 'update_task':
+        return [{'pathParameters': {'taskId': task_id}, 'body': body} for task_id in task_ids]
+    return [{'pathParameters': {'taskId': task_id}} for task_id in task_ids]
+
+
+def run_handler(handler, events, concurrency, warmup):
+    """Invokes ``handler`` once per event from ``concurrency`` threads, returning latencies and errors.
+
+    The first ``warmup`` events are sent sequentially and not measured, so lazy
+    client creation does not show up as a latency outlier.
+    """
+    for event in events[:warmup]:
+        handler(event, {})
+    events = events[warmup:]
+
+    def invoke(event):
+        start = time.perf_counter()
+        response = handler(event, {})
+        return time.perf_counter() - start, response['statusCode'] >= 400
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(invoke, events))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in outcomes]
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'count': len(latencies),
+        'errors': sum(failed for _, failed in outcomes),
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p95_ms': round(cuts[94] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+        'ops_per_sec': round(len(latencies) / elapsed, 1)
+    }
+
+
+def run(operations, concurrency, item_size, data_access, warmup=5):
+    from moto import mock_aws
+
+    os.environ.update(ENVIRONMENT)
+    os.environ['TASKS_DATA_ACCESS'] = data_access
+
+    from lambda_functions import metrics, runtime
+    from lambda_functions.task_cache import task_cache
+
+    # Records are still built, just not printed over the report
+    metrics.set_sink(lambda record: None)
+
+    # Every read should reach DynamoDB, not the warm-container cache
+    task_cache.ttl_seconds = 0
+
+    results = {}
+    with mock_aws():
+        runtime.reset()
+        table = create_table()
+        for name in HANDLERS:
+            handler = importlib.import_module(f'lambda_functions.{name}').handler
+            count = operations + warmup
+            task_ids = seed(table, count, item_size) if name != 'create_task' else [None] * count
+            results[name] = run_handler(handler, events_for(name, task_ids, item_size), concurrency, warmup)
+        runtime.reset()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Returns one message per handler that regressed beyond ``tolerance`` against ``baseline``."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{name}: p95 {current["p95_ms"]} ms vs baseline {previous["p95_ms"]} ms')
+        if current['ops_per_sec'] < previous['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f'{name}: {current["ops_per_sec"]} ops/s vs baseline {previous["ops_per_sec"]} ops/s')
+        if current['errors'] > previous['errors']:
+            regressions.append(f'{name}: {current["errors"]} errors vs baseline {previous["errors"]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', type=int, default=300, help='calls per handler')
+    parser.add_argument('--concurrency', type=int, default=4, help='concurrent callers')
+    parser.add_argument('--warmup', type=int, default=5, help='unmeasured calls per handler before timing')
+    parser.add_argument('--item-size', type=int, default=256, help='bytes of description per task')
+    parser.add_argument('--data-access', choices=['resource', 'client'], default='resource',
+                        help='TASKS_DATA_ACCESS used by the handlers')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression')
+    args = parser.parse_args()
+
+    results = run(args.operations, args.concurrency, args.item_size, args.data_access, args.warmup)
+
+    print(f'{"handler":<14} {"count":>6} {"errors":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"ops/s":>8}')
+    for name, result in results.items():
+        print(f'{name:<14} {result["count"]:>6} {result["errors"]:>6} {result["p50_ms"]:>8.2f} '
+              f'{result["p95_ms"]:>8.2f} {result["p99_ms"]:>8.2f} {result["ops_per_sec"]:>8.1f}')
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({
+                'config': {
+                    'operations': args.operations,
+                    'concurrency': args.concurrency,
+                    'item_size': args.item_size,
+                    'warmup': args.warmup,
+                    'data_access': args.data_access
+                },
+                'results': results
+            }, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
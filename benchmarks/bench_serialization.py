@@ -0,0 +1,70 @@
+"""Microbenchmark of response serialization on representative task items.
+
+Compares the stdlib encoder the handlers used to call (``json.dumps``, which
+cannot encode Decimal at all, so it gets the same ``default`` hook) with
+``lambda_functions.serialization.dumps`` and, when installed, orjson.
+
+    python -m benchmarks.bench_serialization [--number 2000]
+"""
+import argparse
+import json
+import timeit
+import uuid
+from decimal import Decimal
+
+from lambda_functions import serialization
+
+
+def make_task(description_size):
+    return {
+        'taskId': str(uuid.uuid4()),
+        'title': 'Prepare the quarterly report',
+        'description': ('Lorem ipsum dolor sit amet. ' * (description_size // 28 + 1))[:description_size],
+        'status': 'pending',
+        'version': Decimal('7'),
+        'estimate': Decimal('3.5'),
+        'tags': {'finance', 'q3', 'reporting'}
+    }
+
+
+SCENARIOS = {
+    'small item (200 B description)': lambda: make_task(200),
+    'large item (20 KB description)': lambda: make_task(20_000),
+    'list page (100 small items)': lambda: {'items': [make_task(200) for _ in range(100)], 'cursor': None},
+}
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, default=serialization._default)
+
+
+def encoders():
+    result = {'json.dumps (stdlib)': stdlib_dumps}
+    if serialization.orjson:
+        result['serialization.dumps (orjson)'] = serialization.dumps
+    else:
+        result['serialization.dumps (stdlib, compact)'] = serialization.dumps
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000, help='encodes per measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='measurements per encoder, the best one is reported')
+    args = parser.parse_args()
+
+    print(f'serialization backend: {serialization.BACKEND}')
+    for scenario, factory in SCENARIOS.items():
+        payload = factory()
+        print(f'\n{scenario}')
+        baseline = None
+        for name, encode in encoders().items():
+            best = min(timeit.repeat(lambda: encode(payload), number=args.number, repeat=args.repeat))
+            per_call_us = best / args.number * 1e6
+            baseline = baseline or per_call_us
+            print(f'  {name:<40} {per_call_us:9.2f} us/encode  {baseline / per_call_us:5.2f}x  '
+                  f'{len(encode(payload)):>8} bytes')
+
+
+if __name__ == '__main__':
+    main()
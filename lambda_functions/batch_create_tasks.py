@@ -0,0 +1,131 @@
+import json
+import uuid
+import os
+from botocore.exceptions import ClientError
+
+try:
+    from .dynamodb_batch import BATCH_WRITE_LIMIT, batch_write, chunked
+    from .events import normalized
+    from .metrics import instrumented, phase
+    from .runtime import get_worker_table
+    from .status_shards import SHARD_ATTRIBUTE, shard_for
+    from .task_expiry import EXPIRES_AT_ATTRIBUTE, expires_at
+    from .task_schema import gateway_validated, task_error
+except ImportError:
+    from dynamodb_batch import BATCH_WRITE_LIMIT, batch_write, chunked
+    from events import normalized
+    from metrics import instrumented, phase
+    from runtime import get_worker_table
+    from status_shards import SHARD_ATTRIBUTE, shard_for
+    from task_expiry import EXPIRES_AT_ATTRIBUTE, expires_at
+    from task_schema import gateway_validated, task_error
+
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '1000'))
+
+
+@normalized
+@instrumented
+def handler(event, context):
+    try:
+        # Checking if body exist
+        if 'body' not in event:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Body is required'})
+            }
+
+        # Trying load JSON from body
+        try:
+            with phase('Parse'):
+                tasks = json.loads(event['body'])
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Invalid JSON in request body'})
+            }
+
+        if not isinstance(tasks, list) or not tasks:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Body must be a non-empty array of tasks'})
+            }
+
+        if len(tasks) > MAX_BATCH_SIZE:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': f'At most {MAX_BATCH_SIZE} tasks are allowed per request'})
+            }
+
+        # Verifying every task before writing any of them, unless API Gateway already did
+        errors = []
+        if not gateway_validated(event):
+            with phase('Validate'):
+                for index, task in enumerate(tasks):
+                    error = task_error(task)
+                    if error:
+                        errors.append({'index': index, 'error': error})
+
+        if errors:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Invalid tasks in batch', 'details': errors})
+            }
+
+        items = []
+        for task in tasks:
+            task_id = str(uuid.uuid4())
+            item = {
+                'taskId': task_id,
+                'title': task['title'],
+                'description': task['description'],
+                'status': task['status'],
+                'version': 1,
+                SHARD_ATTRIBUTE: shard_for(task_id, task['status'])
+            }
+            # Tasks created in a terminal status expire like ones updated to it
+            expiry = expires_at(task['status'])
+            if expiry:
+                item[EXPIRES_AT_ATTRIBUTE] = expiry
+            items.append(item)
+        results = [
+            {'index': index, 'taskId': item['taskId'], 'result': 'created'}
+            for index, item in enumerate(items)
+        ]
+
+        # Writing in chunks of 25, retrying whatever DynamoDB leaves unprocessed
+        # On the data access layer TASKS_DATA_ACCESS selects
+        dynamodb = get_worker_table()
+        table_name = os.environ['TASKS_TABLE_NAME']
+        failed = {}
+        for chunk in chunked(items, BATCH_WRITE_LIMIT):
+            requests = [{'PutRequest': {'Item': item}} for item in chunk]
+            try:
+                unprocessed = batch_write(dynamodb, table_name, requests)
+                error = 'Task was not processed after retries'
+            except ClientError as e:
+                unprocessed = requests
+                error = f'Error saving task: {e.response["Error"]["Message"]}'
+            for request in unprocessed:
+                failed[request['PutRequest']['Item']['taskId']] = error
+
+        for result in results:
+            if result['taskId'] in failed:
+                result['result'] = 'failed'
+                result['error'] = failed[result['taskId']]
+
+        # 207 tells the client that only part of the batch was stored
+        return {
+            'statusCode': 207 if failed else 201,
+            'body': json.dumps({
+                'created': len(results) - len(failed),
+                'failed': len(failed),
+                'results': results
+            })
+        }
+
+    except Exception as e:
+        # Any other error
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+        }
@@ -0,0 +1,159 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+try:
+    from .dynamodb_batch import BATCH_WRITE_LIMIT, batch_write, chunked
+    from .events import normalized
+    from .metrics import bind, instrumented, phase
+    from .runtime import get_worker_table
+    from .status_shards import SHARD_ATTRIBUTE, STATUS_INDEX_NAME, all_shards
+    from .task_cache import task_cache
+    from .task_schema import gateway_validated
+except ImportError:
+    from dynamodb_batch import BATCH_WRITE_LIMIT, batch_write, chunked
+    from events import normalized
+    from metrics import bind, instrumented, phase
+    from runtime import get_worker_table
+    from status_shards import SHARD_ATTRIBUTE, STATUS_INDEX_NAME, all_shards
+    from task_cache import task_cache
+    from task_schema import gateway_validated
+
+MAX_BATCH_DELETE_SIZE = int(os.environ.get('MAX_BATCH_DELETE_SIZE', '5000'))
+MAX_WORKERS = int(os.environ.get('BATCH_DELETE_MAX_WORKERS', '8'))
+
+
+def shard_task_ids(shard, limit):
+    """Returns up to ``limit`` taskIds stored in one StatusIndex shard, and whether the shard holds more."""
+    task_ids = []
+    query_kwargs = {
+        'IndexName': STATUS_INDEX_NAME,
+        'KeyConditionExpression': Key(SHARD_ATTRIBUTE).eq(shard),
+        'ProjectionExpression': 'taskId'
+    }
+    while len(task_ids) < limit:
+        response = get_worker_table().query(Limit=limit - len(task_ids), **query_kwargs)
+        task_ids.extend(item['taskId'] for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return task_ids, False
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return task_ids, True
+
+
+def status_task_ids(status, limit):
+    """Collects up to ``limit`` taskIds of one status by reading its StatusIndex shards in parallel."""
+    shards = all_shards(status)
+    per_shard = max(1, limit // len(shards))
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        results = list(executor.map(bind(lambda shard: shard_task_ids(shard, per_shard)), shards))
+    task_ids = [task_id for shard_ids, _ in results for task_id in shard_ids]
+    return task_ids, any(more for _, more in results)
+
+
+def delete_chunk(dynamodb, table_name, task_ids):
+    """Deletes one chunk of at most 25 tasks, returning {taskId: error} for those that failed."""
+    requests = [{'DeleteRequest': {'Key': {'taskId': task_id}}} for task_id in task_ids]
+    try:
+        unprocessed = batch_write(dynamodb, table_name, requests)
+        error = 'Task was not processed after retries'
+    except ClientError as e:
+        unprocessed = requests
+        error = f'Error deleting task: {e.response["Error"]["Message"]}'
+    return {request['DeleteRequest']['Key']['taskId']: error for request in unprocessed}
+
+
+@normalized
+@instrumented
+def handler(event, context):
+    try:
+        # Checking if body exist
+        if 'body' not in event:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Body is required'})
+            }
+
+        # Trying load JSON from body
+        try:
+            with phase('Parse'):
+                body = json.loads(event['body'])
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Invalid JSON in request body'})
+            }
+
+        # Verifying body: either taskIds or status, unless API Gateway already did
+        if not gateway_validated(event):
+            with phase('Validate'):
+                if not isinstance(body, dict) or len(body) != 1 or not ('taskIds' in body or 'status' in body):
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': 'Body must contain either taskIds or status'})
+                    }
+                task_ids = body.get('taskIds', [])
+                if 'taskIds' in body and (not isinstance(task_ids, list) or not task_ids
+                                          or not all(isinstance(task_id, str) for task_id in task_ids)):
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': 'taskIds must be a non-empty array of strings'})
+                    }
+                if 'status' in body and not isinstance(body['status'], str):
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': 'status must be a string'})
+                    }
+
+        # Resolving what to delete; a status delete removes at most MAX_BATCH_DELETE_SIZE tasks per call
+        more = False
+        if 'taskIds' in body:
+            task_ids = list(dict.fromkeys(body['taskIds']))
+            if len(task_ids) > MAX_BATCH_DELETE_SIZE:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': f'At most {MAX_BATCH_DELETE_SIZE} taskIds are allowed per request'})
+                }
+        else:
+            try:
+                task_ids, more = status_task_ids(body['status'], MAX_BATCH_DELETE_SIZE)
+            except ClientError as e:
+                return {
+                    'statusCode': 500,
+                    'body': json.dumps({'error': f'Error listing tasks: {e.response["Error"]["Message"]}'})
+                }
+
+        # Deleting 25-key chunks from a bounded pool, retrying whatever DynamoDB leaves unprocessed
+        failed = {}
+        chunks = list(chunked(task_ids, BATCH_WRITE_LIMIT))
+        if chunks:
+            # Thread-safe, and on the data access layer TASKS_DATA_ACCESS selects
+            dynamodb = get_worker_table()
+            table_name = os.environ['TASKS_TABLE_NAME']
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks))) as executor:
+                for chunk_failures in executor.map(bind(lambda chunk: delete_chunk(dynamodb, table_name, chunk)), chunks):
+                    failed.update(chunk_failures)
+
+        deleted = [task_id for task_id in task_ids if task_id not in failed]
+        for task_id in deleted:
+            task_cache.invalidate(task_id)
+
+        # 207 tells the client that only part of the batch was deleted
+        return {
+            'statusCode': 207 if failed else 200,
+            'body': json.dumps({
+                'deleted': len(task_ids) - len(failed),
+                'failed': len(failed),
+                'failures': [{'taskId': task_id, 'error': error} for task_id, error in failed.items()],
+                # More tasks of this status remain; repeat the request to delete them
+                'more': more
+            })
+        }
+
+    except Exception as e:
+        # Any other error
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+        }
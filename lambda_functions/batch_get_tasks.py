@@ -0,0 +1,110 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+
+try:
+    from .compression import compressed
+    from .dynamodb_batch import BATCH_GET_LIMIT, batch_get, chunked
+    from .events import normalized
+    from .metrics import bind, instrumented, phase
+    from .runtime import get_worker_table
+    from .serialization import dumps
+    from .task_items import public_item
+    from .task_schema import gateway_validated
+except ImportError:
+    from compression import compressed
+    from dynamodb_batch import BATCH_GET_LIMIT, batch_get, chunked
+    from events import normalized
+    from metrics import bind, instrumented, phase
+    from runtime import get_worker_table
+    from serialization import dumps
+    from task_items import public_item
+    from task_schema import gateway_validated
+
+MAX_BATCH_GET_SIZE = int(os.environ.get('MAX_BATCH_GET_SIZE', '500'))
+MAX_WORKERS = int(os.environ.get('BATCH_GET_MAX_WORKERS', '8'))
+
+
+@normalized
+@instrumented
+@compressed
+def handler(event, context):
+    try:
+        # Checking if body exist
+        if 'body' not in event:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Body is required'})
+            }
+
+        # Trying load JSON from body
+        try:
+            with phase('Parse'):
+                body = json.loads(event['body'])
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Invalid JSON in request body'})
+            }
+
+        # Verifying taskIds, unless API Gateway already did
+        if not gateway_validated(event):
+            with phase('Validate'):
+                task_ids = body.get('taskIds') if isinstance(body, dict) else None
+                if (not isinstance(task_ids, list) or not task_ids
+                        or not all(isinstance(task_id, str) for task_id in task_ids)):
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': 'taskIds must be a non-empty array of strings'})
+                    }
+        task_ids = body['taskIds']
+
+        # De-duplicating ids while keeping the requested order
+        task_ids = list(dict.fromkeys(task_ids))
+        if len(task_ids) > MAX_BATCH_GET_SIZE:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': f'At most {MAX_BATCH_GET_SIZE} taskIds are allowed per request'})
+            }
+
+        # Reading 100-key chunks concurrently
+        chunks = [
+            [{'taskId': task_id} for task_id in chunk]
+            for chunk in chunked(task_ids, BATCH_GET_LIMIT)
+        ]
+        # Thread-safe, and on the data access layer TASKS_DATA_ACCESS selects
+        dynamodb = get_worker_table()
+        table_name = os.environ['TASKS_TABLE_NAME']
+        try:
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks))) as executor:
+                responses = list(executor.map(bind(lambda keys: batch_get(dynamodb, table_name, keys)), chunks))
+        except ClientError as e:
+            return {
+                'statusCode': 500,
+                'body': json.dumps({'error': f'Error retrieving tasks: {e.response["Error"]["Message"]}'})
+            }
+
+        found = {}
+        unprocessed = []
+        for items, unprocessed_keys in responses:
+            for item in items:
+                found[item['taskId']] = item
+            unprocessed.extend(key['taskId'] for key in unprocessed_keys)
+
+        skipped = set(unprocessed)
+        return {
+            'statusCode': 200,
+            'body': dumps({
+                'items': [public_item(found[task_id]) for task_id in task_ids if task_id in found],
+                'missing': [task_id for task_id in task_ids if task_id not in found and task_id not in skipped],
+                'unprocessed': unprocessed
+            })
+        }
+
+    except Exception as e:
+        # Any other error
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+        }
@@ -0,0 +1,218 @@
+"""Task table access on the low-level DynamoDB client.
+
+``ClientTable`` accepts the same keyword arguments and returns the same plain
+Python values as the boto3 ``Table`` resource for the calls the handlers make,
+but skips the resource layer: values are (un)marshalled by the small hand-written
+functions below, which know the fixed task schema, and boto3 itself is never
+imported unless an unusual value needs the generic serializer.
+"""
+from decimal import Decimal
+
+# Attribute types of the task schema, used to skip type inspection on the hot path
+TASK_SCHEMA = {
+    'taskId': 'S',
+    'title': 'S',
+    'description': 'S',
+    'status': 'S',
+    'statusShard': 'S',
+    'version': 'N',
+    'expiresAt': 'N'
+}
+
+
+def marshall_value(value):
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, (int, Decimal)):
+        return {'N': str(value)}
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, dict):
+        return {'M': marshall_item(value)}
+    if isinstance(value, list):
+        return {'L': [marshall_value(element) for element in value]}
+    # Sets, binary and floats are rare for tasks; defer to boto3's generic serializer
+    from boto3.dynamodb.types import TypeSerializer
+    return TypeSerializer().serialize(value)
+
+
+def marshall_item(item):
+    marshalled = {}
+    for name, value in item.items():
+        if TASK_SCHEMA.get(name) == 'S' and isinstance(value, str):
+            marshalled[name] = {'S': value}
+        else:
+            marshalled[name] = marshall_value(value)
+    return marshalled
+
+
+def unmarshall_value(attribute_value):
+    (type_name, value), = attribute_value.items()
+    if type_name == 'S':
+        return value
+    if type_name == 'N':
+        return Decimal(value)
+    if type_name == 'BOOL':
+        return value
+    if type_name == 'NULL':
+        return None
+    if type_name == 'M':
+        return unmarshall_item(value)
+    if type_name == 'L':
+        return [unmarshall_value(element) for element in value]
+    if type_name == 'SS':
+        return set(value)
+    if type_name == 'NS':
+        return {Decimal(element) for element in value}
+    if type_name == 'B':
+        return value
+    if type_name == 'BS':
+        return set(value)
+    raise TypeError(f'Unknown DynamoDB type {type_name}')
+
+
+def unmarshall_item(item):
+    unmarshalled = {}
+    for name, attribute_value in item.items():
+        schema_type = TASK_SCHEMA.get(name)
+        if schema_type == 'S' and 'S' in attribute_value:
+            unmarshalled[name] = attribute_value['S']
+        elif schema_type == 'N' and 'N' in attribute_value:
+            unmarshalled[name] = Decimal(attribute_value['N'])
+        else:
+            unmarshalled[name] = unmarshall_value(attribute_value)
+    return unmarshalled
+
+
+def _build_expressions(kwargs):
+    """Renders boto3 condition objects (Key/Attr) into expression strings, as the resource layer does."""
+    from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+
+    builder = ConditionExpressionBuilder()
+    names = dict(kwargs.pop('ExpressionAttributeNames', {}))
+    values = dict(kwargs.pop('ExpressionAttributeValues', {}))
+    for parameter in ('KeyConditionExpression', 'FilterExpression', 'ConditionExpression'):
+        condition = kwargs.get(parameter)
+        if isinstance(condition, ConditionBase):
+            expression = builder.build_expression(condition, is_key_condition=parameter == 'KeyConditionExpression')
+            kwargs[parameter] = expression.condition_expression
+            names.update(expression.attribute_name_placeholders)
+            values.update(expression.attribute_value_placeholders)
+    if names:
+        kwargs['ExpressionAttributeNames'] = names
+    if values:
+        kwargs['ExpressionAttributeValues'] = values
+
+
+def _convert_request(request, convert):
+    """Applies ``convert`` to the items or keys of one batch request, e.g. {'PutRequest': {'Item': ...}}."""
+    converted = {}
+    for kind, body in request.items():
+        if kind == 'Keys':
+            converted[kind] = [convert(key) for key in body]
+        elif kind in ('PutRequest', 'DeleteRequest'):
+            converted[kind] = {name: convert(value) for name, value in body.items()}
+        else:
+            converted[kind] = body
+    return converted
+
+
+class ClientTable:
+    """Drop-in replacement for the boto3 Table resource methods used by the handlers.
+
+    Also takes the batch calls the service resource makes (``batch_get_item`` and
+    ``batch_write_item``, with ``RequestItems`` naming the table), so the batch
+    handlers can use the same object.
+    """
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def _request(self, kwargs):
+        if any(not isinstance(kwargs.get(parameter, ''), str)
+               for parameter in ('KeyConditionExpression', 'FilterExpression', 'ConditionExpression')):
+            _build_expressions(kwargs)
+        for parameter in ('Key', 'Item', 'ExclusiveStartKey'):
+            if parameter in kwargs:
+                kwargs[parameter] = marshall_item(kwargs[parameter])
+        if 'ExpressionAttributeValues' in kwargs:
+            kwargs['ExpressionAttributeValues'] = marshall_item(kwargs['ExpressionAttributeValues'])
+        kwargs['TableName'] = self.name
+        return kwargs
+
+    @staticmethod
+    def _response(response):
+        for parameter in ('Item', 'Attributes', 'LastEvaluatedKey'):
+            if parameter in response:
+                response[parameter] = unmarshall_item(response[parameter])
+        if 'Items' in response:
+            response['Items'] = [unmarshall_item(item) for item in response['Items']]
+        return response
+
+    def get_item(self, **kwargs):
+        return self._response(self.client.get_item(**self._request(kwargs)))
+
+    def put_item(self, **kwargs):
+        return self._response(self.client.put_item(**self._request(kwargs)))
+
+    def update_item(self, **kwargs):
+        return self._response(self.client.update_item(**self._request(kwargs)))
+
+    def delete_item(self, **kwargs):
+        return self._response(self.client.delete_item(**self._request(kwargs)))
+
+    def query(self, **kwargs):
+        return self._response(self.client.query(**self._request(kwargs)))
+
+    def scan(self, **kwargs):
+        return self._response(self.client.scan(**self._request(kwargs)))
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        response = self.client.batch_get_item(RequestItems={
+            table_name: _convert_request(request, marshall_item) for table_name, request in RequestItems.items()
+        }, **kwargs)
+        response['Responses'] = {
+            table_name: [unmarshall_item(item) for item in items]
+            for table_name, items in response.get('Responses', {}).items()
+        }
+        response['UnprocessedKeys'] = {
+            table_name: _convert_request(request, unmarshall_item)
+            for table_name, request in response.get('UnprocessedKeys', {}).items()
+        }
+        return response
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        response = self.client.batch_write_item(RequestItems={
+            table_name: [_convert_request(request, marshall_item) for request in requests]
+            for table_name, requests in RequestItems.items()
+        }, **kwargs)
+        response['UnprocessedItems'] = {
+            table_name: [_convert_request(request, unmarshall_item) for request in requests]
+            for table_name, requests in response.get('UnprocessedItems', {}).items()
+        }
+        return response
+
+
+class ResourceClientTable(ClientTable):
+    """ClientTable on the boto3 resource's own client, which (un)marshals values and renders conditions itself.
+
+    Takes and returns the same values as the Table resource but, being only a
+    client, is safe to share between threads, which boto3 resources are not.
+    """
+
+    def _request(self, kwargs):
+        kwargs['TableName'] = self.name
+        return kwargs
+
+    @staticmethod
+    def _response(response):
+        return response
+
+    def batch_get_item(self, **kwargs):
+        return self.client.batch_get_item(**kwargs)
+
+    def batch_write_item(self, **kwargs):
+        return self.client.batch_write_item(**kwargs)
@@ -0,0 +1,84 @@
+"""gzip for large response bodies.
+
+A response is compressed when the client sends ``Accept-Encoding: gzip`` and its
+body is at least RESPONSE_COMPRESSION_MIN_BYTES (a negative value turns it off).
+The compressed body is returned base64 encoded with ``isBase64Encoded``, which
+both API types turn back into binary on the wire.
+
+A REST API compresses responses itself (its ``minimumCompressionSize``), so when
+the stack sets RESPONSE_COMPRESSED_BY_GATEWAY the handlers leave REST responses
+to it and only compress for HTTP APIs (payload 2.0), which cannot.
+"""
+import base64
+import functools
+import gzip
+import os
+
+try:
+    from .events import PAYLOAD_V2
+    from .headers import get_header
+    from .metrics import phase
+except ImportError:
+    from events import PAYLOAD_V2
+    from headers import get_header
+    from metrics import phase
+
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+# 1 (fastest) to 9 (smallest); 6 is gzip's own default and most of level 9's gain for JSON
+RESPONSE_COMPRESSION_LEVEL = int(os.environ.get('RESPONSE_COMPRESSION_LEVEL', '6'))
+
+
+def accepts_gzip(event):
+    """True when the request's Accept-Encoding allows gzip (``gzip``, ``*``, not ``q=0``)."""
+    accept_encoding = get_header(event, 'Accept-Encoding')
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for coding in accept_encoding.lower().split(','):
+        name, _, parameters = coding.strip().partition(';')
+        quality = 1.0
+        parameter, _, value = parameters.strip().partition('=')
+        if parameter.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip()] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+def gateway_compresses(event):
+    """True when API Gateway compresses this response, so the handler should not."""
+    if os.environ.get('RESPONSE_COMPRESSED_BY_GATEWAY', 'false').lower() != 'true':
+        return False
+    return event.get('version') != PAYLOAD_V2
+
+
+def compress(response, level=RESPONSE_COMPRESSION_LEVEL):
+    """Returns ``response`` with its body gzipped and base64 encoded."""
+    with phase('Compress'):
+        body = gzip.compress(response['body'].encode('utf-8'), compresslevel=level, mtime=0)
+        return {
+            **response,
+            'headers': {**(response.get('headers') or {}), 'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'},
+            'body': base64.b64encode(body).decode('ascii'),
+            'isBase64Encoded': True
+        }
+
+
+def compressed(handler):
+    """Decorates a Lambda handler to gzip its large responses for clients that accept it."""
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        response = handler(event, context)
+        body = response.get('body')
+        if (RESPONSE_COMPRESSION_MIN_BYTES < 0 or not isinstance(body, str) or response.get('isBase64Encoded')
+                or len(body) < RESPONSE_COMPRESSION_MIN_BYTES or gateway_compresses(event)):
+            return response
+        if not accepts_gzip(event):
+            # Caches must not hand a compressed copy to this client, or this copy to a gzip client
+            return {**response, 'headers': {**(response.get('headers') or {}), 'Vary': 'Accept-Encoding'}}
+        return compress(response)
+
+    return wrapper
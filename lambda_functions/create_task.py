@@ -1,13 +1,34 @@
 import json
-import boto3
-import uuid
 import os
+import uuid
 from botocore.exceptions import ClientError
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TASKS_TABLE_NAME'])
+try:
+    from .events import normalized
+    from .headers import get_header
+    from .idempotency import MAX_KEY_LENGTH, IdempotencyConflict, put_once, request_hash
+    from .metrics import instrumented, phase
+    from .runtime import get_table
+    from .serialization import dumps
+    from .status_shards import SHARD_ATTRIBUTE, shard_for
+    from .task_expiry import EXPIRES_AT_ATTRIBUTE, expires_at
+    from .task_items import etag_for, public_item
+    from .task_schema import gateway_validated, task_error
+except ImportError:
+    from events import normalized
+    from headers import get_header
+    from idempotency import MAX_KEY_LENGTH, IdempotencyConflict, put_once, request_hash
+    from metrics import instrumented, phase
+    from runtime import get_table
+    from serialization import dumps
+    from status_shards import SHARD_ATTRIBUTE, shard_for
+    from task_expiry import EXPIRES_AT_ATTRIBUTE, expires_at
+    from task_items import etag_for, public_item
+    from task_schema import gateway_validated, task_error
 
 
+@normalized
+@instrumented
 def handler(event, context):
     try:
         # Checking if body exist
@@ -19,51 +40,85 @@ def handler(event, context):
 
         # Trying load JSON from body
         try:
-            body = json.loads(event['body'])
+            with phase('Parse'):
+                body = json.loads(event['body'])
         except json.JSONDecodeError:
             return {
                 'statusCode': 400,
                 'body': json.dumps({'error': 'Invalid JSON in request body'})
             }
 
-        # Verifying body fields
-        required_fields = ['title', 'description', 'status']
-        for field in required_fields:
-            if field not in body:
-                return {
-                    'statusCode': 400,
-                    'body': json.dumps({'error': f'{field} is required in the body'})
-                }
+        # Verifying body fields, unless API Gateway already did
+        if not gateway_validated(event):
+            with phase('Validate'):
+                error = task_error(body)
+                if error:
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': error})
+                    }
+
+        # Retries carrying the same Idempotency-Key replay the first response instead of creating a duplicate.
+        # The key is honored when the stack configures the table that records responses.
+        idempotency_table_name = os.environ.get('IDEMPOTENCY_TABLE_NAME')
+        idempotency_key = get_header(event, 'Idempotency-Key') if idempotency_table_name else None
+        if idempotency_key is not None and not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': f'Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters'})
+            }
 
         # Generate new ID
         task_id = str(uuid.uuid4())
+        item = {
+            'taskId': task_id,
+            'title': body['title'],
+            'description': body['description'],
+            'status': body['status'],
+            'version': 1,
+            SHARD_ATTRIBUTE: shard_for(task_id, body['status'])
+        }
+        # A task created in a terminal status expires like one updated to it
+        expiry = expires_at(body['status'])
+        if expiry:
+            item[EXPIRES_AT_ATTRIBUTE] = expiry
+        # The same view of the task as PUT, PATCH and GET return, also kept for idempotent replays
+        response = {
+            'statusCode': 201,
+            'headers': {'ETag': etag_for(item)},
+            'body': dumps(public_item(item))
+        }
 
         # Trying save item into DynamoDB
         try:
-            table.put_item(
-                Item={
-                    'taskId': task_id,
-                    'title': body['title'],
-                    'description': body['description'],
-                    'status': body['status']
-                }
-            )
+            if idempotency_key:
+                stored = put_once(idempotency_table_name, idempotency_key, request_hash(body), item, response)
+            else:
+                get_table().put_item(Item=item)
+                stored = None
+        except IdempotencyConflict:
+            return {
+                'statusCode': 409,
+                'body': json.dumps({'error': 'A request with this Idempotency-Key is still in progress'})
+            }
         except ClientError as e:
             return {
                 'statusCode': 500,
                 'body': json.dumps({'error': f'Error saving task: {e.response["Error"]["Message"]}'})
             }
 
+        if stored:
+            if stored['requestHash'] != request_hash(body):
+                return {
+                    'statusCode': 422,
+                    'body': json.dumps({'error': 'Idempotency-Key was already used with a different request body'})
+                }
+            replayed = stored['response']
+            replayed['headers'] = dict(replayed.get('headers') or {}, **{'Idempotent-Replayed': 'true'})
+            return replayed
+
         # Success
-        return {
-            'statusCode': 201,
-            'body': json.dumps({
-                'taskId': task_id,
-                'title': body['title'],
-                'description': body['description'],
-                'status': body['status']
-            })
-        }
+        return response
 
     except Exception as e:
         # Any other error
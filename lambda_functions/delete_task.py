@@ -1,12 +1,20 @@
 import json
-import boto3
-import os
 from botocore.exceptions import ClientError
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TASKS_TABLE_NAME'])
+try:
+    from .events import normalized
+    from .metrics import instrumented
+    from .runtime import get_table
+    from .task_cache import task_cache
+except ImportError:
+    from events import normalized
+    from metrics import instrumented
+    from runtime import get_table
+    from task_cache import task_cache
 
 
+@normalized
+@instrumented
 def handler(event, context):
     try:
         # Verifying parameter
@@ -20,7 +28,7 @@ def handler(event, context):
 
         # Trying delete item from DynamoDB
         try:
-            table.delete_item(
+            get_table().delete_item(
                 Key={
                     'taskId': task_id
                 }
@@ -32,6 +40,9 @@ def handler(event, context):
                 'body': json.dumps({'error': f'Error deleting task: {e.response["Error"]["Message"]}'})
             }
 
+        # A deleted task has no newer version, so its cached copy is always dropped
+        task_cache.invalidate(task_id)
+
         # Success
         return {
             'statusCode': 204,
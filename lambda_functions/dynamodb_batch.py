@@ -0,0 +1,55 @@
+import random
+import time
+
+# DynamoDB hard limits per batch request
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 0.05
+BACKOFF_CAP_SECONDS = 2.0
+
+
+def chunked(items, size):
+    """Yields consecutive slices of ``items`` holding at most ``size`` elements."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: a random delay in [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def batch_write(dynamodb, table_name, requests, max_attempts=MAX_ATTEMPTS, sleep=time.sleep):
+    """Sends one BatchWriteItem chunk, retrying UnprocessedItems with jittered backoff.
+
+    Returns the write requests that were still unprocessed after ``max_attempts``.
+    """
+    pending = requests
+    for attempt in range(max_attempts):
+        if attempt:
+            sleep(backoff_delay(attempt))
+        response = dynamodb.batch_write_item(RequestItems={table_name: pending})
+        pending = response.get('UnprocessedItems', {}).get(table_name, [])
+        if not pending:
+            return []
+    return pending
+
+
+def batch_get(dynamodb, table_name, keys, max_attempts=MAX_ATTEMPTS, sleep=time.sleep):
+    """Sends one BatchGetItem chunk, retrying UnprocessedKeys with jittered backoff.
+
+    Returns a tuple of (items found, keys still unprocessed after ``max_attempts``).
+    """
+    items = []
+    request = {'Keys': keys}
+    for attempt in range(max_attempts):
+        if attempt:
+            sleep(backoff_delay(attempt))
+        response = dynamodb.batch_get_item(RequestItems={table_name: request})
+        items.extend(response.get('Responses', {}).get(table_name, []))
+        request = response.get('UnprocessedKeys', {}).get(table_name)
+        if not request or not request.get('Keys'):
+            return items, []
+    return items, request['Keys']
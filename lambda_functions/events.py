@@ -0,0 +1,82 @@
+"""One event shape for the handlers, whichever API Gateway invoked them.
+
+REST APIs send Lambda proxy events in payload format 1.0, HTTP APIs in 2.0.
+``normalize`` turns both into the 1.0 shape the handlers read (``httpMethod``,
+``resource``, ``pathParameters``, ``headers``, ``body``, ...), with a base64
+encoded body decoded to text. 2.0 events keep ``version: '2.0'`` so code that
+depends on the front door (e.g. ``task_schema.gateway_validated``) can tell.
+"""
+import base64
+import binascii
+import functools
+import json
+
+PAYLOAD_V2 = '2.0'
+
+
+class InvalidBody(ValueError):
+    """The request body is not valid base64, or not UTF-8 text once decoded."""
+
+
+def decode_body(event):
+    """Returns the request body as text, decoding it when API Gateway sent it base64 encoded."""
+    body = event.get('body')
+    if body is None or not event.get('isBase64Encoded'):
+        return body
+    try:
+        return base64.b64decode(body, validate=True).decode('utf-8')
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise InvalidBody(str(e)) from e
+
+
+def _from_v2(event):
+    context = event.get('requestContext') or {}
+    http = context.get('http') or {}
+    route_key = event.get('routeKey') or ''
+    # "GET /tasks/{taskId}" -> "/tasks/{taskId}"; the catch-all "$default" route has no template
+    method, _, resource = route_key.partition(' ')
+    headers = dict(event.get('headers') or {})
+    if event.get('cookies'):
+        # 2.0 moves the Cookie header out of headers
+        headers['cookie'] = '; '.join(event['cookies'])
+    normalized = {
+        'version': PAYLOAD_V2,
+        'httpMethod': http.get('method') or method,
+        'resource': resource or event.get('rawPath'),
+        'path': event.get('rawPath'),
+        'headers': headers,
+        'queryStringParameters': event.get('queryStringParameters'),
+        'pathParameters': event.get('pathParameters'),
+        'stageVariables': event.get('stageVariables'),
+        'requestContext': context,
+        'isBase64Encoded': event.get('isBase64Encoded', False)
+    }
+    if 'body' in event:
+        normalized['body'] = event['body']
+    return normalized
+
+
+def normalize(event):
+    """Returns ``event`` in the payload 1.0 shape with a text body; normalized events are returned as they are."""
+    if event.get('version') == PAYLOAD_V2 and 'httpMethod' not in event:
+        event = _from_v2(event)
+    if event.get('isBase64Encoded'):
+        event = {**event, 'body': decode_body(event), 'isBase64Encoded': False}
+    return event
+
+
+def normalized(handler):
+    """Decorates a Lambda handler to receive ``normalize``d events from either API type."""
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        try:
+            event = normalize(event)
+        except InvalidBody:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Invalid base64 or UTF-8 in request body'})
+            }
+        return handler(event, context)
+
+    return wrapper
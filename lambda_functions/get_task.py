@@ -1,12 +1,31 @@
 import json
-import boto3
-import os
 from botocore.exceptions import ClientError
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TASKS_TABLE_NAME'])
+try:
+    from .compression import compressed
+    from .events import normalized
+    from .headers import get_header
+    from .metrics import count, instrumented
+    from .runtime import get_table
+    from .serialization import dumps
+    from .stage_cache import gateway_caches, refresh_requested
+    from .task_cache import task_cache
+    from .task_items import etag_for, etag_matches, public_item
+except ImportError:
+    from compression import compressed
+    from events import normalized
+    from headers import get_header
+    from metrics import count, instrumented
+    from runtime import get_table
+    from serialization import dumps
+    from stage_cache import gateway_caches, refresh_requested
+    from task_cache import task_cache
+    from task_items import etag_for, etag_matches, public_item
 
 
+@normalized
+@instrumented
+@compressed
 def handler(event, context):
     try:
         # Verifying parameter
@@ -18,32 +37,59 @@ def handler(event, context):
 
         task_id = event['pathParameters']['taskId']
 
+        # Hot tasks are served from this container's cache within its TTL. A refresh (the
+        # stage cache invalidation a writer sends) must see the write, so it reads consistently.
+        refresh = refresh_requested(event)
+        item = None if refresh else task_cache.get(task_id)
+        cache_status = 'HIT' if item else 'MISS'
+        if not refresh:
+            # Both are emitted, so the hit ratio is the average of CacheHits
+            count('CacheHits', 1 if item else 0)
+            count('CacheMisses', 0 if item else 1)
+
         # DynamoDB query
-        try:
-            response = table.get_item(
-                Key={
-                    'taskId': task_id
+        if not item:
+            try:
+                response = get_table().get_item(
+                    Key={
+                        'taskId': task_id
+                    },
+                    ConsistentRead=refresh
+                )
+            except ClientError as e:
+                # Handling DynamoDB error
+                return {
+                    'statusCode': 500,
+                    'body': json.dumps({'error': f'Error retrieving task: {e.response["Error"]["Message"]}'})
                 }
-            )
-        except ClientError as e:
-            # Handling DynamoDB error
-            return {
-                'statusCode': 500,
-                'body': json.dumps({'error': f'Error retrieving task: {e.response["Error"]["Message"]}'})
-            }
 
-        # Checking if item exist
-        item = response.get('Item')
-        if not item:
+            # Checking if item exist
+            item = response.get('Item')
+            if not item:
+                return {
+                    'statusCode': 404,
+                    'body': json.dumps({'message': 'Task not found'})
+                }
+
+            item = public_item(item)
+            task_cache.put(task_id, item)
+
+        # Clients that already hold this version get an empty 304, unless the stage cache
+        # would then serve that empty 304 to every other reader of the task
+        etag = etag_for(item)
+        if_none_match = get_header(event, 'If-None-Match')
+        if if_none_match and etag_matches(if_none_match, etag) and not gateway_caches(event):
             return {
-                'statusCode': 404,
-                'body': json.dumps({'message': 'Task not found'})
+                'statusCode': 304,
+                'headers': {'ETag': etag, 'X-Cache': cache_status},
+                'body': ''
             }
 
         # Success
         return {
             'statusCode': 200,
-            'body': json.dumps(item)
+            'headers': {'ETag': etag, 'X-Cache': cache_status},
+            'body': dumps(item)
         }
 
     except Exception as e:
@@ -0,0 +1,53 @@
+import json
+import os
+from botocore.exceptions import ClientError
+
+try:
+    from .events import normalized
+    from .metrics import instrumented
+    from .runtime import get_table
+    from .serialization import dumps
+    from .task_stats import STATS_KEY_ATTRIBUTE, TASK_COUNTS_KEY, task_counts
+except ImportError:
+    from events import normalized
+    from metrics import instrumented
+    from runtime import get_table
+    from serialization import dumps
+    from task_stats import STATS_KEY_ATTRIBUTE, TASK_COUNTS_KEY, task_counts
+
+
+@normalized
+@instrumented
+def handler(event, context):
+    try:
+        # Counters maintained from the table stream, read in a single GetItem instead of a scan
+        try:
+            response = get_table(os.environ['STATS_TABLE_NAME']).get_item(
+                Key={
+                    STATS_KEY_ATTRIBUTE: TASK_COUNTS_KEY
+                }
+            )
+        except ClientError as e:
+            # Handling DynamoDB error
+            return {
+                'statusCode': 500,
+                'body': json.dumps({'error': f'Error retrieving task stats: {e.response["Error"]["Message"]}'})
+            }
+
+        counts = task_counts(response.get('Item'))
+
+        # Success
+        return {
+            'statusCode': 200,
+            'body': dumps({
+                'counts': counts,
+                'total': sum(counts.values())
+            })
+        }
+
+    except Exception as e:
+        # Any other error
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+        }
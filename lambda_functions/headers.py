@@ -0,0 +1,8 @@
+def get_header(event, name):
+    """Returns a request header by case-insensitive name, or None when it was not sent."""
+    headers = event.get('headers') or {}
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
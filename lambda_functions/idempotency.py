@@ -0,0 +1,97 @@
+"""Idempotency-Key support for writes that create items.
+
+The first request with a key writes its item and a record of its response in
+one DynamoDB transaction. The record is put only if the key is unused (or its
+record has expired), so concurrent duplicates are decided by that condition
+instead of a lock: exactly one transaction commits, the others are cancelled
+and get the winner's record back through ReturnValuesOnConditionCheckFailure,
+and replay it without writing anything. Records expire through the table's TTL
+on ``expiresAt``.
+"""
+import hashlib
+import json
+import os
+import time
+
+from botocore.exceptions import ClientError
+
+try:
+    from .client_table import marshall_item, unmarshall_item
+    from .runtime import get_client
+except ImportError:
+    from client_table import marshall_item, unmarshall_item
+    from runtime import get_client
+
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', '86400'))
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    """Another request with the same key is still being written."""
+
+
+def request_hash(body):
+    """Fingerprint of a request body, to detect a key reused for a different request."""
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _stored_record(client, table_name, key, reason):
+    item = reason.get('Item')
+    if item is None:
+        # Not returned on a transaction conflict; the other writer may have committed since
+        item = client.get_item(
+            TableName=table_name,
+            Key={'idempotencyKey': {'S': key}},
+            ConsistentRead=True
+        ).get('Item')
+    return unmarshall_item(item) if item else None
+
+
+def put_once(table_name, key, fingerprint, item, response, now=None):
+    """Puts ``item`` into TASKS_TABLE_NAME and records ``response`` under ``key``, atomically.
+
+    Returns None when this call wrote them, or the stored record of the earlier
+    request with the same key (``requestHash``, ``response``). Raises
+    IdempotencyConflict when that request has not committed yet.
+    """
+    client = get_client()
+    now = int(now if now is not None else time.time())
+    record = {
+        'idempotencyKey': key,
+        'requestHash': fingerprint,
+        'response': json.dumps(response),
+        'expiresAt': now + IDEMPOTENCY_TTL_SECONDS
+    }
+    try:
+        client.transact_write_items(TransactItems=[
+            {
+                'Put': {
+                    'TableName': table_name,
+                    'Item': marshall_item(record),
+                    # TTL deletion is lazy, so an expired record counts as unused
+                    'ConditionExpression': 'attribute_not_exists(idempotencyKey) OR expiresAt < :now',
+                    'ExpressionAttributeValues': {':now': {'N': str(now)}},
+                    'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+                }
+            },
+            {
+                'Put': {
+                    'TableName': os.environ['TASKS_TABLE_NAME'],
+                    'Item': marshall_item(item),
+                    'ConditionExpression': 'attribute_not_exists(taskId)'
+                }
+            }
+        ])
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        reason = (e.response.get('CancellationReasons') or [{}])[0]
+        if reason.get('Code') not in ('ConditionalCheckFailed', 'TransactionConflict'):
+            raise
+        stored = _stored_record(client, table_name, key, reason)
+        if stored is None:
+            raise IdempotencyConflict(key)
+        stored['response'] = json.loads(stored['response'])
+        return stored
+    return None
@@ -0,0 +1,179 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+try:
+    from .compression import compressed
+    from .events import normalized
+    from .metrics import bind, instrumented
+    from .pagination import InvalidCursor, decode_cursor, encode_cursor
+    from .runtime import get_table, get_worker_table
+    from .serialization import dumps
+    from .status_shards import SHARD_ATTRIBUTE, STATUS_INDEX_NAME, all_shards
+    from .task_items import public_item
+except ImportError:
+    from compression import compressed
+    from events import normalized
+    from metrics import bind, instrumented
+    from pagination import InvalidCursor, decode_cursor, encode_cursor
+    from runtime import get_table, get_worker_table
+    from serialization import dumps
+    from status_shards import SHARD_ATTRIBUTE, STATUS_INDEX_NAME, all_shards
+    from task_items import public_item
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 100
+# Upper bound on DynamoDB rounds per request so sparse filters cannot run away with the Lambda time
+MAX_PAGES_PER_REQUEST = 10
+
+FILTER_PARAMETERS = ['status', 'titleContains']
+
+
+def build_filter(filters):
+    conditions = []
+    if 'status' in filters:
+        conditions.append(Attr('status').eq(filters['status']))
+    if 'titleContains' in filters:
+        conditions.append(Attr('title').contains(filters['titleContains']))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def scan_page(limit, filters, start_key):
+    """Reads up to ``limit`` items with Scan, returning them with the key to resume from."""
+    scan_kwargs = {}
+    filter_expression = build_filter(filters)
+    if filter_expression is not None:
+        scan_kwargs['FilterExpression'] = filter_expression
+
+    # Never asking for more than what is still missing
+    items = []
+    for _ in range(MAX_PAGES_PER_REQUEST):
+        if start_key:
+            scan_kwargs['ExclusiveStartKey'] = start_key
+        response = get_table().scan(Limit=limit - len(items), **scan_kwargs)
+        items.extend(response.get('Items', []))
+        start_key = response.get('LastEvaluatedKey')
+        if not start_key or len(items) >= limit:
+            break
+    return items, start_key
+
+
+def query_shard(shard, start_key, limit, filter_expression):
+    query_kwargs = {
+        'IndexName': STATUS_INDEX_NAME,
+        'KeyConditionExpression': Key(SHARD_ATTRIBUTE).eq(shard),
+        'Limit': limit
+    }
+    if start_key:
+        query_kwargs['ExclusiveStartKey'] = start_key
+    if filter_expression is not None:
+        query_kwargs['FilterExpression'] = filter_expression
+    # Runs on the status_page pool, which must not share a boto3 resource
+    response = get_worker_table().query(**query_kwargs)
+    return response.get('Items', []), response.get('LastEvaluatedKey')
+
+
+def status_page(limit, filters, shard_keys):
+    """Reads up to ``limit`` items of one status by querying its StatusIndex shards in parallel.
+
+    ``shard_keys`` maps every shard that may still hold items to the key to resume
+    it from (None when it has not been read yet). Returns the merged items and the
+    shards that are not exhausted yet.
+    """
+    filter_expression = build_filter({name: value for name, value in filters.items() if name != 'status'})
+    shard_keys = dict(shard_keys)
+
+    items = []
+    with ThreadPoolExecutor(max_workers=len(shard_keys) or 1) as executor:
+        for _ in range(MAX_PAGES_PER_REQUEST):
+            # Splitting what is still missing between the shards so the page stays bounded
+            remaining = limit - len(items)
+            targets = list(shard_keys)[:remaining]
+            if not targets:
+                break
+            per_shard = remaining // len(targets)
+            results = executor.map(
+                bind(lambda target: query_shard(*target, per_shard, filter_expression)),
+                [(shard, shard_keys[shard]) for shard in targets]
+            )
+            for shard, (shard_items, next_key) in list(zip(targets, results)):
+                items.extend(shard_items)
+                if next_key:
+                    shard_keys[shard] = next_key
+                else:
+                    del shard_keys[shard]
+
+    items.sort(key=lambda item: item['taskId'])
+    return items, shard_keys
+
+
+@normalized
+@instrumented
+@compressed
+def handler(event, context):
+    try:
+        params = event.get('queryStringParameters') or {}
+
+        # Verifying limit
+        try:
+            limit = int(params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_LIMIT:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': f'limit must be an integer between 1 and {MAX_LIMIT}'})
+            }
+
+        filters = {name: params[name] for name in FILTER_PARAMETERS if params.get(name)}
+
+        # Verifying cursor, which is only valid for the filters it was issued with
+        state = None
+        if params.get('cursor'):
+            try:
+                state = decode_cursor(params['cursor'])
+            except InvalidCursor:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'Invalid cursor'})
+                }
+            if state.get('filters') != filters:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'Cursor does not match the requested filters'})
+                }
+
+        try:
+            if 'status' in filters:
+                # Status listings fan out over the StatusIndex shards instead of scanning the table
+                shard_keys = state['shards'] if state else dict.fromkeys(all_shards(filters['status']))
+                items, shard_keys = status_page(limit, filters, shard_keys)
+                next_state = {'shards': shard_keys, 'filters': filters} if shard_keys else None
+            else:
+                items, start_key = scan_page(limit, filters, state['key'] if state else None)
+                next_state = {'key': start_key, 'filters': filters} if start_key else None
+        except ClientError as e:
+            return {
+                'statusCode': 500,
+                'body': json.dumps({'error': f'Error listing tasks: {e.response["Error"]["Message"]}'})
+            }
+
+        return {
+            'statusCode': 200,
+            'body': dumps({
+                'items': [public_item(item) for item in items],
+                'cursor': encode_cursor(next_state) if next_state else None
+            })
+        }
+
+    except Exception as e:
+        # Any other error
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+        }
@@ -0,0 +1,220 @@
+"""Per-invocation metrics in CloudWatch Embedded Metric Format (EMF).
+
+``instrumented`` wraps a handler and prints one EMF JSON line per invocation to
+stdout, which CloudWatch Logs turns into metrics without any API call from the
+function. The record holds the total duration, the time spent in named phases
+(``with phase('Parse'):`` in the handler, DynamoDB calls timed automatically),
+whether the invocation was a cold start, request/response payload sizes, the
+DynamoDB capacity consumed and any counts the handler adds (``count('CacheHits')``). Capacity comes from hooks on the shared botocore
+clients (see ``register``), which ask for ``ReturnConsumedCapacity`` while an
+instrumented invocation is running.
+
+Tests swap the stdout sink for a list with ``capture()``.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'ServerlessCrudApi')
+
+READ_OPERATIONS = {'GetItem', 'BatchGetItem', 'Query', 'Scan', 'TransactGetItems'}
+WRITE_OPERATIONS = {'PutItem', 'UpdateItem', 'DeleteItem', 'BatchWriteItem', 'TransactWriteItems'}
+
+_current = contextvars.ContextVar('metrics_recorder', default=None)
+_cold_start = True
+_cold_start_lock = threading.Lock()
+
+
+def _print_sink(record):
+    print(json.dumps(record, separators=(',', ':')), flush=True)
+
+
+_sink = _print_sink
+
+
+class Recorder:
+    """Accumulates the metrics of one invocation; safe to update from worker threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = {}
+        self.dynamodb_calls = 0
+        self.read_capacity = 0.0
+        self.write_capacity = 0.0
+        self.counts = {}
+
+    def add_count(self, name, value):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def add_call(self, operation, seconds, consumed):
+        units = sum(entry.get('CapacityUnits', 0.0) for entry in consumed)
+        with self.lock:
+            self.timings['DynamoDB'] = self.timings.get('DynamoDB', 0.0) + seconds
+            self.dynamodb_calls += 1
+            if operation in READ_OPERATIONS:
+                self.read_capacity += units
+            else:
+                self.write_capacity += units
+
+
+@contextmanager
+def phase(name):
+    """Adds the time spent in the block to the ``{name}Time`` metric of the current invocation."""
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_time(name, time.perf_counter() - start)
+
+
+def count(name, value=1):
+    """Adds ``value`` to the ``name`` count metric of the current invocation."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.add_count(name, value)
+
+
+def bind(function):
+    """Returns ``function`` bound to the current invocation, for use in executor threads."""
+    recorder = _current.get()
+
+    @functools.wraps(function)
+    def bound(*args, **kwargs):
+        token = _current.set(recorder)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return bound
+
+
+def _request_capacity(params, model, **kwargs):
+    if _current.get() is not None and model.name in READ_OPERATIONS | WRITE_OPERATIONS:
+        params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+
+def _start_call(context, **kwargs):
+    context['metrics_started'] = time.perf_counter()
+
+
+def _end_call(parsed, model, context, **kwargs):
+    recorder = _current.get()
+    started = context.get('metrics_started')
+    if recorder is None or started is None:
+        return
+    consumed = parsed.get('ConsumedCapacity') or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    recorder.add_call(model.name, time.perf_counter() - started, consumed)
+
+
+def register(client):
+    """Hooks a botocore DynamoDB client so instrumented invocations record its calls."""
+    events = client.meta.events
+    events.register('before-parameter-build.dynamodb', _request_capacity, unique_id='metrics-capacity')
+    events.register('before-call.dynamodb', _start_call, unique_id='metrics-start')
+    events.register('after-call.dynamodb', _end_call, unique_id='metrics-end')
+    return client
+
+
+def _payload_size(body):
+    if not body:
+        return 0
+    return len(body.encode('utf-8')) if isinstance(body, str) else len(body)
+
+
+def build_record(function_name, duration, cold_start, recorder, event, response):
+    metrics = {
+        'Duration': (duration * 1000, 'Milliseconds'),
+        'ColdStart': (1 if cold_start else 0, 'Count'),
+        'RequestBytes': (_payload_size(event.get('body')), 'Bytes'),
+        'ResponseBytes': (_payload_size((response or {}).get('body')), 'Bytes'),
+        'DynamoDBCalls': (recorder.dynamodb_calls, 'Count'),
+        'ConsumedReadCapacity': (recorder.read_capacity, 'Count'),
+        'ConsumedWriteCapacity': (recorder.write_capacity, 'Count')
+    }
+    for name, seconds in recorder.timings.items():
+        metrics[f'{name}Time'] = (seconds * 1000, 'Milliseconds')
+    for name, value in recorder.counts.items():
+        metrics[name] = (value, 'Count')
+
+    record = {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': NAMESPACE,
+                'Dimensions': [['Function']],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, (_, unit) in metrics.items()]
+            }]
+        },
+        'Function': function_name,
+        'StatusCode': (response or {}).get('statusCode'),
+        'HttpMethod': event.get('httpMethod'),
+        'Resource': event.get('resource')
+    }
+    for name, (value, _) in metrics.items():
+        record[name] = round(value, 3) if isinstance(value, float) else value
+    return record
+
+
+def instrumented(handler):
+    """Decorates a Lambda handler to emit one EMF record per invocation, named after its module."""
+    function_name = handler.__module__.rpartition('.')[2]
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        global _cold_start
+        with _cold_start_lock:
+            cold_start, _cold_start = _cold_start, False
+
+        recorder = Recorder()
+        token = _current.set(recorder)
+        response = None
+        start = time.perf_counter()
+        try:
+            response = handler(event, context)
+            return response
+        finally:
+            duration = time.perf_counter() - start
+            _current.reset(token)
+            try:
+                record = build_record(function_name, duration, cold_start, recorder, event, response)
+                record['RequestId'] = getattr(context, 'aws_request_id', None)
+                _sink(record)
+            except Exception:
+                # Metrics must never fail the request
+                pass
+
+    return wrapper
+
+
+def set_sink(sink):
+    """Replaces where records go (default: one JSON line on stdout); returns the previous sink."""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+@contextmanager
+def capture():
+    """Collects the records emitted inside the block into a list instead of printing them."""
+    records = []
+    previous = set_sink(records.append)
+    try:
+        yield records
+    finally:
+        set_sink(previous)
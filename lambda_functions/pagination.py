@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+_lock = threading.Lock()
+_signing_keys = {}
+
+
+def _fetch_secret(secret_id):
+    """Reads a secret string from Secrets Manager with a client built straight from botocore."""
+    import botocore.session
+    client = botocore.session.get_session().create_client('secretsmanager')
+    return client.get_secret_value(SecretId=secret_id)['SecretString']
+
+
+def _signing_key():
+    """Returns the cursor HMAC key, read once per container.
+
+    The stack passes CURSOR_SIGNING_SECRET_ARN and grants read access to the secret,
+    so the key never appears in the function configuration. CURSOR_SIGNING_KEY, the
+    key itself, is only meant for tests and the local gateway.
+    """
+    secret_id = os.environ.get('CURSOR_SIGNING_SECRET_ARN')
+    if not secret_id:
+        return os.environ['CURSOR_SIGNING_KEY'].encode('utf-8')
+    key = _signing_keys.get(secret_id)
+    if key is None:
+        with _lock:
+            key = _signing_keys.get(secret_id)
+            if key is None:
+                key = _signing_keys[secret_id] = _fetch_secret(secret_id).encode('utf-8')
+    return key
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def encode_cursor(state):
+    """Wraps pagination state (e.g. a LastEvaluatedKey) into an opaque, HMAC-signed token."""
+    payload = json.dumps(state, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    signature = hmac.new(_signing_key(), payload, hashlib.sha256).digest()
+    return f'{_b64encode(payload)}.{_b64encode(signature)}'
+
+
+def decode_cursor(cursor):
+    """Returns the state wrapped by ``encode_cursor``, raising InvalidCursor if it was tampered with."""
+    try:
+        payload_part, signature_part = cursor.split('.')
+        payload = _b64decode(payload_part)
+        signature = _b64decode(signature_part)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Malformed cursor')
+
+    expected = hmac.new(_signing_key(), payload, hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise InvalidCursor('Cursor signature does not match')
+
+    return json.loads(payload)
@@ -0,0 +1,171 @@
+import json
+from botocore.exceptions import ClientError
+
+try:
+    from .compression import compressed
+    from .events import normalized
+    from .headers import get_header
+    from .metrics import instrumented, phase
+    from .runtime import get_table
+    from .serialization import dumps
+    from .status_shards import SHARD_ATTRIBUTE, shard_for
+    from .task_cache import task_cache
+    from .task_expiry import expiry_update
+    from .task_items import etag_for, if_match_condition, public_item
+    from .task_schema import PATCHABLE_FIELDS, TASK_FIELDS, gateway_validated, mistyped_field
+except ImportError:
+    from compression import compressed
+    from events import normalized
+    from headers import get_header
+    from metrics import instrumented, phase
+    from runtime import get_table
+    from serialization import dumps
+    from status_shards import SHARD_ATTRIBUTE, shard_for
+    from task_cache import task_cache
+    from task_expiry import expiry_update
+    from task_items import etag_for, if_match_condition, public_item
+    from task_schema import PATCHABLE_FIELDS, TASK_FIELDS, gateway_validated, mistyped_field
+
+
+@normalized
+@instrumented
+@compressed
+def handler(event, context):
+    try:
+        # Verifying parameter
+        if 'pathParameters' not in event or 'taskId' not in event['pathParameters']:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'taskId is required in pathParameters'})
+            }
+
+        task_id = event['pathParameters']['taskId']
+
+        # Checking if body exist
+        if 'body' not in event:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Body is required'})
+            }
+
+        # Trying load JSON from body
+        try:
+            with phase('Parse'):
+                body = json.loads(event['body'])
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Invalid JSON in request body'})
+            }
+
+        # Verifying body fields, any non-empty subset of the task fields is accepted, unless API Gateway already did
+        if not gateway_validated(event):
+            with phase('Validate'):
+                if not isinstance(body, dict) or not body:
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': f'Body must contain at least one of {", ".join(PATCHABLE_FIELDS)}'})
+                    }
+                for field in body:
+                    if field not in PATCHABLE_FIELDS:
+                        return {
+                            'statusCode': 400,
+                            'body': json.dumps({'error': f'{field} cannot be updated'})
+                        }
+                field = mistyped_field(body)
+                if field:
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': f'{field} must be a {TASK_FIELDS[field]}'})
+                    }
+
+        # Building the UpdateExpression from the supplied fields only
+        names = {'#v': 'version'}
+        values = {':one': 1}
+        assignments = []
+        for field in PATCHABLE_FIELDS:
+            if field in body:
+                names[f'#{field}'] = field
+                values[f':{field}'] = body[field]
+                assignments.append(f'#{field}=:{field}')
+        removals = []
+        if 'status' in body:
+            names['#ss'] = SHARD_ATTRIBUTE
+            values[':ss'] = shard_for(task_id, body['status'])
+            assignments.append('#ss=:ss')
+            # Tasks reaching a terminal status expire through the table's TTL, reopened ones are kept again
+            expiry_set, expiry_remove = expiry_update(body['status'], names, values)
+            if expiry_set:
+                assignments.append(expiry_set)
+            if expiry_remove:
+                removals.append(expiry_remove)
+
+        # The condition replaces a prior read: a missing task fails the write instead of being created
+        condition = 'attribute_exists(taskId)'
+        if_match = get_header(event, 'If-Match')
+        if if_match:
+            condition = if_match_condition(if_match, values)
+            if condition is None:
+                return {
+                    'statusCode': 412,
+                    'body': json.dumps({'error': 'Task has been modified'})
+                }
+
+        # Prefer: return=minimal skips sending the updated attributes back
+        prefer = get_header(event, 'Prefer') or ''
+        minimal = 'return=minimal' in prefer.replace(' ', '').split(',')
+
+        try:
+            response = get_table().update_item(
+                Key={
+                    'taskId': task_id
+                },
+                UpdateExpression=f'SET {", ".join(assignments)} ADD #v :one'
+                                 + (f' REMOVE {", ".join(removals)}' if removals else ''),
+                ConditionExpression=condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues='NONE' if minimal else 'UPDATED_NEW',
+                # Tells a missing task (no item) apart from a stale If-Match (item returned)
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                if 'Item' in e.response:
+                    return {
+                        'statusCode': 412,
+                        'body': json.dumps({'error': 'Task has been modified'})
+                    }
+                return {
+                    'statusCode': 404,
+                    'body': json.dumps({'message': 'Task not found'})
+                }
+            # Handling DynamoDB error
+            return {
+                'statusCode': 500,
+                'body': json.dumps({'error': f'Error updating task: {e.response["Error"]["Message"]}'})
+            }
+
+        if minimal:
+            task_cache.invalidate(task_id)
+            return {
+                'statusCode': 204,
+                'headers': {'Preference-Applied': 'return=minimal'},
+                'body': ''
+            }
+
+        attributes = public_item(response['Attributes'])
+        task_cache.invalidate(task_id, attributes['version'])
+
+        return {
+            'statusCode': 200,
+            'headers': {'ETag': etag_for(attributes)},
+            'body': dumps(attributes)
+        }
+
+    except Exception as e:
+        # Any other error
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+        }
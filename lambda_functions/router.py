@@ -0,0 +1,44 @@
+import json
+
+try:
+    from . import (batch_create_tasks, batch_delete_tasks, batch_get_tasks, create_task, delete_task, get_task,
+                   get_task_stats, list_tasks, patch_task, update_task)
+    from .events import normalized
+except ImportError:
+    import batch_create_tasks
+    import batch_delete_tasks
+    import batch_get_tasks
+    import create_task
+    import delete_task
+    import get_task
+    import get_task_stats
+    import list_tasks
+    import patch_task
+    import update_task
+    from events import normalized
+
+# Precomputed (httpMethod, resource) -> handler table, so dispatch is a single dict lookup
+ROUTES = {
+    ('POST', '/tasks'): create_task.handler,
+    ('GET', '/tasks'): list_tasks.handler,
+    ('GET', '/tasks/{taskId}'): get_task.handler,
+    ('PUT', '/tasks/{taskId}'): update_task.handler,
+    ('PATCH', '/tasks/{taskId}'): patch_task.handler,
+    ('DELETE', '/tasks/{taskId}'): delete_task.handler,
+    ('POST', '/tasks/batch'): batch_create_tasks.handler,
+    ('POST', '/tasks/batch-get'): batch_get_tasks.handler,
+    ('POST', '/tasks/batch-delete'): batch_delete_tasks.handler,
+    ('GET', '/tasks/stats'): get_task_stats.handler
+}
+
+
+@normalized
+def handler(event, context):
+    route = ROUTES.get((event.get('httpMethod'), event.get('resource')))
+    if route is None:
+        return {
+            'statusCode': 404,
+            'body': json.dumps({'error': f'No route for {event.get("httpMethod")} {event.get("resource")}'})
+        }
+
+    return route(event, context)
@@ -0,0 +1,113 @@
+import os
+import threading
+
+from botocore.config import Config
+
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+# Tuned for short-lived Lambda calls to DynamoDB: fail fast on a bad connection,
+# keep warm connections alive between invocations and let the client back off
+# on its own when the table throttles.
+BOTO_CONFIG = Config(
+    connect_timeout=float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT', '1')),
+    read_timeout=float(os.environ.get('DYNAMODB_READ_TIMEOUT', '3')),
+    max_pool_connections=int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', '16')),
+    tcp_keepalive=True,
+    retries={
+        'mode': 'adaptive',
+        'max_attempts': int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '5'))
+    }
+)
+
+# "resource" (boto3 Table resource) or "client" (low-level client, see client_table.py)
+DATA_ACCESS_RESOURCE = 'resource'
+DATA_ACCESS_CLIENT = 'client'
+
+_lock = threading.Lock()
+_dynamodb = None
+_client = None
+_tables = {}
+# Cache key of the thread-safe tables handed out by get_worker_table
+_WORKER = 'worker'
+
+
+def get_dynamodb():
+    """Returns the DynamoDB service resource, created on first use and reused for the life of the container."""
+    global _dynamodb
+    if _dynamodb is None:
+        with _lock:
+            if _dynamodb is None:
+                # Imported here so containers only pay for boto3 when they first touch DynamoDB
+                import boto3
+                dynamodb = boto3.session.Session().resource('dynamodb', config=BOTO_CONFIG)
+                metrics.register(dynamodb.meta.client)
+                _dynamodb = dynamodb
+    return _dynamodb
+
+
+def get_client():
+    """Returns a low-level DynamoDB client built straight from botocore, without importing boto3."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import botocore.session
+                _client = metrics.register(
+                    botocore.session.get_session().create_client('dynamodb', config=BOTO_CONFIG)
+                )
+    return _client
+
+
+def get_table(table_name=None):
+    """Returns the table for ``table_name`` (default: TASKS_TABLE_NAME), created once per container.
+
+    TASKS_DATA_ACCESS selects the boto3 Table resource ("resource", the default) or
+    the ClientTable built on the low-level client ("client"); both take and return
+    the same values.
+    """
+    table_name = table_name or os.environ['TASKS_TABLE_NAME']
+    data_access = os.environ.get('TASKS_DATA_ACCESS', DATA_ACCESS_RESOURCE)
+    table = _tables.get((data_access, table_name))
+    if table is None:
+        if data_access == DATA_ACCESS_CLIENT:
+            try:
+                from .client_table import ClientTable
+            except ImportError:
+                from client_table import ClientTable
+            table = ClientTable(get_client(), table_name)
+        else:
+            table = get_dynamodb().Table(table_name)
+        table = _tables.setdefault((data_access, table_name), table)
+    return table
+
+
+def get_worker_table(table_name=None):
+    """Like ``get_table``, but safe to share between the worker threads of a handler.
+
+    The client table already is; for "resource" access this is a table on the
+    resource's client instead of the Table resource itself. Both also take the
+    BatchGetItem/BatchWriteItem calls of dynamodb_batch.py.
+    """
+    if os.environ.get('TASKS_DATA_ACCESS', DATA_ACCESS_RESOURCE) == DATA_ACCESS_CLIENT:
+        return get_table(table_name)
+    table_name = table_name or os.environ['TASKS_TABLE_NAME']
+    table = _tables.get((_WORKER, table_name))
+    if table is None:
+        try:
+            from .client_table import ResourceClientTable
+        except ImportError:
+            from client_table import ResourceClientTable
+        table = _tables.setdefault((_WORKER, table_name), ResourceClientTable(get_dynamodb().meta.client, table_name))
+    return table
+
+
+def reset():
+    """Forgets the cached resource and tables, e.g. after the environment changed."""
+    global _dynamodb, _client
+    with _lock:
+        _dynamodb = None
+        _client = None
+        _tables.clear()
@@ -0,0 +1,44 @@
+import base64
+import json
+from decimal import Decimal
+
+try:
+    from .metrics import phase
+except ImportError:
+    from metrics import phase
+
+# orjson is several times faster than the stdlib encoder; it is used when bundled with the function
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+
+
+def _default(value):
+    """Encodes the types DynamoDB returns that JSON has no native form for."""
+    if isinstance(value, Decimal):
+        # DynamoDB numbers come back as Decimal; keep integers integral
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        # String/number sets, sorted so the output (and any ETag over it) is stable
+        return sorted(value)
+    if hasattr(value, 'value') and isinstance(value.value, (bytes, bytearray)):
+        # boto3 Binary
+        return base64.b64encode(value.value).decode('ascii')
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+if orjson:
+    def dumps(obj):
+        """Serializes a response body to a compact JSON string."""
+        with phase('Serialize'):
+            return orjson.dumps(obj, default=_default).decode('utf-8')
+else:
+    def dumps(obj):
+        """Serializes a response body to a compact JSON string."""
+        with phase('Serialize'):
+            return json.dumps(obj, default=_default, separators=(',', ':'))
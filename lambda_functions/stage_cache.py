@@ -0,0 +1,150 @@
+"""Invalidation of API Gateway stage cache entries after a task changes.
+
+When the stack caches GET /tasks/{taskId} it runs stage_cache_consumer on the
+TasksTable stream with TASKS_API_CACHE_URL, the stage's invoke URL, so the writers
+never wait on API Gateway. A GET with ``Cache-Control: max-age=0`` makes API Gateway
+skip the cached entry, call get_task and cache its response in place of the old
+one. API Gateway only honors the header on SigV4-signed requests from a caller
+allowed to ``execute-api:InvalidateCache``, so clients cannot flush the cache.
+
+Refreshing costs one request (and one get_task invocation) per task, so a batch of
+more than MAX_INVALIDATE_TASKS tasks flushes the whole stage cache with a single
+FlushStageCache call instead, which needs ``apigateway:DELETE`` on the stage's
+``/cache/data``.
+
+A failed invalidation is not retried: the entry then stays stale for at most the
+method's cache TTL.
+
+The stage cache keys GET /tasks/{taskId} on the taskId alone, so whatever get_task
+answers is served to every reader of the task. With RESPONSE_CACHED_BY_GATEWAY set,
+``gateway_caches`` keeps get_task from answering a REST request with a bodiless 304.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import quote, urlparse
+from urllib.request import Request, urlopen
+
+try:
+    from .events import PAYLOAD_V2
+    from .headers import get_header
+except ImportError:
+    from events import PAYLOAD_V2
+    from headers import get_header
+
+CACHE_CONTROL_REFRESH = 'max-age=0'
+INVALIDATE_TIMEOUT_SECONDS = float(os.environ.get('API_CACHE_INVALIDATE_TIMEOUT', '2'))
+MAX_INVALIDATE_WORKERS = int(os.environ.get('API_CACHE_INVALIDATE_MAX_WORKERS', '16'))
+MAX_INVALIDATE_TASKS = int(os.environ.get('API_CACHE_INVALIDATE_MAX_TASKS', '16'))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_credentials = None
+_apigateway = None
+
+
+def _get_credentials():
+    """Returns the function's credentials, resolved once per container."""
+    global _credentials
+    if _credentials is None:
+        with _lock:
+            if _credentials is None:
+                import botocore.session
+                _credentials = botocore.session.get_session().get_credentials()
+    return _credentials
+
+
+def _get_apigateway():
+    """Returns the API Gateway client used to flush the stage cache, created once per container."""
+    global _apigateway
+    if _apigateway is None:
+        with _lock:
+            if _apigateway is None:
+                import botocore.session
+                from botocore.config import Config
+                _apigateway = botocore.session.get_session().create_client('apigateway', config=Config(
+                    connect_timeout=INVALIDATE_TIMEOUT_SECONDS,
+                    read_timeout=INVALIDATE_TIMEOUT_SECONDS,
+                    retries={'max_attempts': 2}
+                ))
+    return _apigateway
+
+
+def gateway_caches(event):
+    """True when API Gateway caches this response for every reader of the task."""
+    if os.environ.get('RESPONSE_CACHED_BY_GATEWAY', 'false').lower() != 'true':
+        return False
+    return event.get('version') != PAYLOAD_V2
+
+
+def refresh_requested(event):
+    """True for a request asking to bypass caches, such as the ones ``invalidate_task`` sends."""
+    return CACHE_CONTROL_REFRESH in (get_header(event, 'Cache-Control') or '').replace(' ', '').lower()
+
+
+def invalidate_task(task_id):
+    """Replaces the stage cache entry of GET /tasks/{task_id}; returns False when that failed.
+
+    Does nothing (and returns True) when the API has no stage cache.
+    """
+    cache_url = os.environ.get('TASKS_API_CACHE_URL')
+    if not cache_url:
+        return True
+
+    from botocore.auth import SigV4Auth
+    from botocore.awsrequest import AWSRequest
+
+    url = f"{cache_url.rstrip('/')}/tasks/{quote(task_id, safe='')}"
+    region = os.environ.get('AWS_REGION') or os.environ.get('AWS_DEFAULT_REGION')
+    request = AWSRequest(method='GET', url=url, headers={'Cache-Control': CACHE_CONTROL_REFRESH})
+    try:
+        SigV4Auth(_get_credentials(), 'execute-api', region).add_auth(request)
+        with urlopen(Request(url, headers=dict(request.headers.items()), method='GET'),
+                     timeout=INVALIDATE_TIMEOUT_SECONDS) as response:
+            response.read()
+    except HTTPError as e:
+        # After a delete get_task answers 404, which is what the entry should hold now
+        if e.code == 404:
+            return True
+        logger.warning('Could not invalidate the cached GET /tasks/%s: %s', task_id, e)
+        return False
+    except Exception as e:
+        logger.warning('Could not invalidate the cached GET /tasks/%s: %s', task_id, e)
+        return False
+    return True
+
+
+def flush_stage_cache():
+    """Drops every entry of the stage cache; returns False when that failed.
+
+    The REST API id and the stage name are read from TASKS_API_CACHE_URL
+    (``https://{restApiId}.execute-api.{region}.amazonaws.com/{stage}``).
+    """
+    cache_url = urlparse(os.environ['TASKS_API_CACHE_URL'])
+    rest_api_id = cache_url.hostname.split('.')[0]
+    stage_name = cache_url.path.strip('/')
+    try:
+        _get_apigateway().flush_stage_cache(restApiId=rest_api_id, stageName=stage_name)
+    except Exception as e:
+        logger.warning('Could not flush the cache of stage %s: %s', stage_name, e)
+        return False
+    return True
+
+
+def invalidate_tasks(task_ids, max_workers=MAX_INVALIDATE_WORKERS, max_tasks=MAX_INVALIDATE_TASKS):
+    """Replaces the stage cache entries of many tasks; returns the ids that failed.
+
+    Up to ``max_tasks`` entries are refreshed from a bounded pool. More than that would
+    cost a get_task invocation per task, so the stage cache is flushed as a whole instead.
+    """
+    task_ids = list(task_ids)
+    if not task_ids or not os.environ.get('TASKS_API_CACHE_URL'):
+        return []
+    if len(task_ids) > max_tasks:
+        return [] if flush_stage_cache() else task_ids
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(task_ids))) as executor:
+        results = list(executor.map(invalidate_task, task_ids))
+    return [task_id for task_id, invalidated in zip(task_ids, results) if not invalidated]
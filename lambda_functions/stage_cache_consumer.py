@@ -0,0 +1,31 @@
+try:
+    from .metrics import instrumented
+    from .stage_cache import invalidate_tasks
+except ImportError:
+    from metrics import instrumented
+    from stage_cache import invalidate_tasks
+
+
+def changed_task_ids(records):
+    """Returns the taskIds a batch of TasksTable stream records touched, each once and in order."""
+    return list(dict.fromkeys(record['dynamodb']['Keys']['taskId']['S'] for record in records))
+
+
+@instrumented
+def handler(event, context):
+    """Refreshes the stage cache entries of the tasks changed in a batch of TasksTable stream records.
+
+    The writers return without waiting on API Gateway; the cached GET /tasks/{taskId}
+    of a changed task is replaced here shortly after the write instead. A refresh that
+    fails is not retried: the entry then stays stale for at most the method's cache TTL.
+    """
+    records = event.get('Records') or []
+
+    task_ids = changed_task_ids(records)
+    failed = invalidate_tasks(task_ids)
+
+    return {
+        'records': len(records),
+        'tasks': len(task_ids),
+        'failed': len(failed)
+    }
@@ -0,0 +1,22 @@
+import os
+import zlib
+
+# Partition key of the StatusIndex GSI, e.g. "pending#3"
+SHARD_ATTRIBUTE = 'statusShard'
+STATUS_INDEX_NAME = os.environ.get('STATUS_INDEX_NAME', 'StatusIndex')
+STATUS_SHARD_COUNT = int(os.environ.get('STATUS_SHARD_COUNT', '4'))
+
+
+def shard_for(task_id, status):
+    """Returns the StatusIndex partition a task belongs to.
+
+    The suffix is derived from the taskId so a hot status is spread evenly over
+    ``STATUS_SHARD_COUNT`` partitions and a task never moves between shards.
+    """
+    suffix = zlib.crc32(task_id.encode('utf-8')) % STATUS_SHARD_COUNT
+    return f'{status}#{suffix}'
+
+
+def all_shards(status):
+    """Returns every StatusIndex partition holding tasks with ``status``."""
+    return [f'{status}#{suffix}' for suffix in range(STATUS_SHARD_COUNT)]
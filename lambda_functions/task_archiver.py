@@ -0,0 +1,86 @@
+"""Archives tasks deleted by the TasksTable TTL to S3.
+
+Each stream batch of expired tasks becomes one gzip-compressed NDJSON object
+(one task per line) under ``ARCHIVE_PREFIX/YYYY/MM/DD/``. The object key is
+derived from the batch's first sequence number, so a retried batch overwrites
+its own object instead of archiving the tasks twice.
+"""
+import gzip
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    from .client_table import unmarshall_item
+    from .metrics import instrumented
+    from .serialization import dumps
+    from .task_items import public_item
+except ImportError:
+    from client_table import unmarshall_item
+    from metrics import instrumented
+    from serialization import dumps
+    from task_items import public_item
+
+ARCHIVE_PREFIX = os.environ.get('ARCHIVE_PREFIX', 'expired-tasks')
+
+_lock = threading.Lock()
+_s3 = None
+
+
+def get_s3():
+    """Returns an S3 client built straight from botocore, created once per container."""
+    global _s3
+    if _s3 is None:
+        with _lock:
+            if _s3 is None:
+                import botocore.session
+                _s3 = botocore.session.get_session().create_client('s3')
+    return _s3
+
+
+def is_ttl_expiry(record):
+    """True for the REMOVE records DynamoDB writes when TTL deletes an item (not for deletes by the API)."""
+    identity = record.get('userIdentity') or {}
+    return (record.get('eventName') == 'REMOVE'
+            and identity.get('type') == 'Service'
+            and identity.get('principalId') == 'dynamodb.amazonaws.com')
+
+
+def archive_key(records):
+    first = records[0]['dynamodb']
+    deleted = datetime.fromtimestamp(first.get('ApproximateCreationDateTime') or time.time(), tz=timezone.utc)
+    return f'{ARCHIVE_PREFIX}/{deleted:%Y/%m/%d}/{first["SequenceNumber"]}-{len(records)}.ndjson.gz'
+
+
+def to_ndjson(records):
+    """gzip-compressed NDJSON of the tasks in ``records``' old images."""
+    lines = [dumps(public_item(unmarshall_item(record['dynamodb']['OldImage']))) for record in records]
+    return gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+
+
+@instrumented
+def handler(event, context):
+    # The event source mapping already filters on TTL deletions; this keeps direct invocations honest
+    expired = [
+        record for record in event.get('Records') or []
+        if is_ttl_expiry(record) and 'OldImage' in (record.get('dynamodb') or {})
+    ]
+    if not expired:
+        return {
+            'archived': 0
+        }
+
+    key = archive_key(expired)
+    get_s3().put_object(
+        Bucket=os.environ['ARCHIVE_BUCKET_NAME'],
+        Key=key,
+        Body=to_ndjson(expired),
+        ContentType='application/x-ndjson',
+        ContentEncoding='gzip'
+    )
+
+    return {
+        'archived': len(expired),
+        'key': key
+    }
@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+TASK_CACHE_TTL_SECONDS = float(os.environ.get('TASK_CACHE_TTL_SECONDS', '5'))
+TASK_CACHE_MAX_ENTRIES = int(os.environ.get('TASK_CACHE_MAX_ENTRIES', '1024'))
+
+
+class TaskCache:
+    """Bounded, TTL-limited LRU cache of task items, kept for the life of a warm container.
+
+    Entries remember the item ``version`` they were read at, so writers running in
+    the same container can invalidate them. Entries cached by other containers stay
+    valid until their TTL expires, which is the staleness bound of the cache.
+    """
+
+    def __init__(self, max_entries=TASK_CACHE_MAX_ENTRIES, ttl_seconds=TASK_CACHE_TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, task_id):
+        """Returns the cached item, or None (counted as a miss) when absent or expired."""
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is not None and entry[2] <= self._clock():
+                del self._entries[task_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(task_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, task_id, item):
+        if not self.enabled:
+            return
+        version = item.get('version', 0)
+        with self._lock:
+            # Never replace a newer version with an older read
+            current = self._entries.get(task_id)
+            if current is not None and current[1] > version:
+                return
+            self._entries[task_id] = (item, version, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(task_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, task_id, version=None):
+        """Drops the cached entry unless it already holds ``version`` or newer (None always drops)."""
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is not None and (version is None or entry[1] < version):
+                del self._entries[task_id]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+# One cache per container, shared by every handler imported into it
+task_cache = TaskCache()
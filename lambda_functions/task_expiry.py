@@ -0,0 +1,43 @@
+"""Expiry of finished tasks through the TasksTable TTL.
+
+A task written with a status in TERMINAL_STATUSES gets ``expiresAt`` (epoch
+seconds) COMPLETED_TASK_TTL_SECONDS later, and DynamoDB deletes it some time
+after that moment; the TTL deletions reach the archiver on the table stream. A
+task moved back to another status loses ``expiresAt`` and is kept again.
+A TTL of 0 (the default outside the stack) leaves ``expiresAt`` alone.
+"""
+import os
+import time
+
+EXPIRES_AT_ATTRIBUTE = 'expiresAt'
+TERMINAL_STATUSES = frozenset(
+    status.strip() for status in os.environ.get('TERMINAL_STATUSES', 'completed,cancelled').split(',') if status.strip()
+)
+COMPLETED_TASK_TTL_SECONDS = int(os.environ.get('COMPLETED_TASK_TTL_SECONDS', '0'))
+
+
+def expiry_enabled():
+    return COMPLETED_TASK_TTL_SECONDS > 0
+
+
+def expires_at(status, now=None):
+    """Epoch second a task written with ``status`` expires at, or None when it is kept."""
+    if not expiry_enabled() or status not in TERMINAL_STATUSES:
+        return None
+    return int(now if now is not None else time.time()) + COMPLETED_TASK_TTL_SECONDS
+
+
+def expiry_update(status, names, values):
+    """Returns the (SET, REMOVE) clauses, one of them None, that keep ``expiresAt`` in step with ``status``.
+
+    Adds the placeholders they use to ``names`` and ``values``; returns (None, None)
+    when expiry is off.
+    """
+    if not expiry_enabled():
+        return None, None
+    names['#exp'] = EXPIRES_AT_ATTRIBUTE
+    expiry = expires_at(status)
+    if expiry is None:
+        return None, '#exp'
+    values[':exp'] = expiry
+    return '#exp=:exp', None
@@ -0,0 +1,67 @@
+import re
+from decimal import Decimal
+
+try:
+    from .status_shards import SHARD_ATTRIBUTE
+except ImportError:
+    from status_shards import SHARD_ATTRIBUTE
+
+# Attributes the service maintains for itself and never returns to clients
+INTERNAL_ATTRIBUTES = {SHARD_ATTRIBUTE}
+
+VERSION_ATTRIBUTE = 'version'
+
+_ETAG_PATTERN = re.compile(r'(?:W/)?"v(\d+)"')
+
+
+def public_item(item):
+    """Returns the client-facing view of a stored task."""
+    result = {key: value for key, value in item.items() if key not in INTERNAL_ATTRIBUTES}
+    if isinstance(result.get(VERSION_ATTRIBUTE), Decimal):
+        result[VERSION_ATTRIBUTE] = int(result[VERSION_ATTRIBUTE])
+    return result
+
+
+def etag_for(item):
+    """Returns the strong ETag of a task, derived from its version (tasks written before versioning are v0)."""
+    return f'"v{int(item.get(VERSION_ATTRIBUTE, 0))}"'
+
+
+def version_from_etag(etag):
+    """Returns the version an ETag was issued for, or None when it is not one of ours."""
+    match = _ETAG_PATTERN.fullmatch(etag.strip())
+    return int(match.group(1)) if match else None
+
+
+def etag_matches(header_value, etag):
+    """Evaluates an If-None-Match style list of ETags (or "*") against ``etag``, using weak comparison."""
+    if header_value.strip() == '*':
+        return True
+    version = version_from_etag(etag)
+    return any(version_from_etag(candidate) == version for candidate in header_value.split(','))
+
+
+def if_match_condition(if_match, values):
+    """Turns an If-Match header into a ConditionExpression on the stored version.
+
+    The expression refers to the version attribute as ``#v``. Adds the expected
+    versions to ``values``. ETags this service never issued can never match and
+    are skipped; returns None when no ETag in the header is one of ours.
+    """
+    if if_match.strip() == '*':
+        return 'attribute_exists(taskId)'
+
+    clauses = []
+    for index, candidate in enumerate(if_match.split(',')):
+        version = version_from_etag(candidate)
+        if version is None:
+            continue
+        if version == 0:
+            # Tasks written before versioning have no version attribute yet
+            clauses.append('attribute_not_exists(#v)')
+        else:
+            clauses.append(f'#v = :expected{index}')
+            values[f':expected{index}'] = version
+    if not clauses:
+        return None
+    return f'attribute_exists(taskId) AND ({" OR ".join(clauses)})'
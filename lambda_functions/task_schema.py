@@ -0,0 +1,144 @@
+"""Single definition of the task request bodies.
+
+The CDK stack turns these JSON schemas (draft 4) into API Gateway models, and the
+handlers derive their own checks from the same fields, so the gateway and the
+Lambda code cannot drift apart. When the stack has the gateway validate a route
+it sets REQUEST_VALIDATED_BY_GATEWAY, and ``gateway_validated`` lets the handler
+skip checks the gateway already made.
+"""
+import os
+
+try:
+    from .events import PAYLOAD_V2
+    from .headers import get_header
+except ImportError:
+    from events import PAYLOAD_V2
+    from headers import get_header
+
+# Field name -> JSON schema type of every client-writable task attribute
+TASK_FIELDS = {
+    'title': 'string',
+    'description': 'string',
+    'status': 'string'
+}
+
+# JSON schema type -> Python types json.loads gives values of that type
+JSON_TYPES = {
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float),
+    'boolean': (bool,),
+    'object': (dict,),
+    'array': (list,)
+}
+
+REQUIRED_FIELDS = list(TASK_FIELDS)
+
+PATCHABLE_FIELDS = list(TASK_FIELDS)
+
+TASK_PROPERTIES = {name: {'type': field_type} for name, field_type in TASK_FIELDS.items()}
+
+# POST /tasks and PUT /tasks/{taskId}
+TASK_SCHEMA = {
+    'title': 'Task Model',
+    'type': 'object',
+    'properties': TASK_PROPERTIES,
+    'required': REQUIRED_FIELDS
+}
+
+# PATCH /tasks/{taskId}: any non-empty subset of the task fields
+TASK_PATCH_SCHEMA = {
+    'title': 'Task Patch Model',
+    'type': 'object',
+    'properties': TASK_PROPERTIES,
+    'minProperties': 1,
+    'additionalProperties': False
+}
+
+# POST /tasks/batch
+TASK_BATCH_SCHEMA = {
+    'title': 'Task Batch Model',
+    'type': 'array',
+    'minItems': 1,
+    'items': {
+        'type': 'object',
+        'properties': TASK_PROPERTIES,
+        'required': REQUIRED_FIELDS
+    }
+}
+
+# POST /tasks/batch-get
+TASK_IDS_SCHEMA = {
+    'title': 'Task Ids Model',
+    'type': 'object',
+    'properties': {
+        'taskIds': {'type': 'array', 'minItems': 1, 'items': {'type': 'string'}}
+    },
+    'required': ['taskIds']
+}
+
+# POST /tasks/batch-delete: either taskIds or status
+TASK_BULK_DELETE_SCHEMA = {
+    'title': 'Task Bulk Delete Model',
+    'type': 'object',
+    'properties': {
+        'taskIds': TASK_IDS_SCHEMA['properties']['taskIds'],
+        'status': TASK_PROPERTIES['status']
+    },
+    'minProperties': 1,
+    'maxProperties': 1,
+    'additionalProperties': False
+}
+
+
+def missing_field(body):
+    """Returns the first required task field absent from ``body``, or None."""
+    for field in REQUIRED_FIELDS:
+        if field not in body:
+            return field
+    return None
+
+
+def has_type(value, json_type):
+    """True when the decoded JSON ``value`` is of the JSON schema type ``json_type``."""
+    if isinstance(value, bool) and json_type in ('integer', 'number'):
+        # bool is an int to Python, not to JSON schema
+        return False
+    return isinstance(value, JSON_TYPES[json_type])
+
+
+def mistyped_field(body):
+    """Returns the first task field in ``body`` whose value is not of its TASK_FIELDS type, or None."""
+    for field, value in body.items():
+        json_type = TASK_FIELDS.get(field)
+        if json_type and not has_type(value, json_type):
+            return field
+    return None
+
+
+def task_error(body):
+    """Returns why ``body`` does not match TASK_SCHEMA, as the handlers' 400 message, or None."""
+    if not isinstance(body, dict):
+        return 'Task must be an object'
+    field = missing_field(body)
+    if field:
+        return f'{field} is required in the body'
+    field = mistyped_field(body)
+    if field:
+        return f'{field} must be a {TASK_FIELDS[field]}'
+    return None
+
+
+def gateway_validated(event):
+    """True when API Gateway has already checked this request's body against its model.
+
+    The gateway only applies a model to the content type it is registered for, so
+    anything not sent as application/json is still checked by the handler. HTTP APIs
+    (payload 2.0) have no request validation at all.
+    """
+    if os.environ.get('REQUEST_VALIDATED_BY_GATEWAY', 'false').lower() != 'true':
+        return False
+    if event.get('version') == PAYLOAD_V2:
+        return False
+    content_type = get_header(event, 'Content-Type') or ''
+    return content_type.strip().lower() == 'application/json'
@@ -0,0 +1,94 @@
+"""Per-status task counters, kept up to date from the TasksTable stream.
+
+All counters live in one item of STATS_TABLE_NAME, one ``status#<status>``
+attribute per status, so GET /tasks/stats reads them with a single GetItem and a
+stream batch updates them with a single UpdateItem of coalesced ``ADD`` deltas.
+
+The stream only carries changes, so counters of a table that already held tasks
+start from a backfill (``count_statuses`` then ``seed_counts``, see
+tools/backfill_task_stats.py).
+"""
+from collections import Counter
+
+STATS_KEY_ATTRIBUTE = 'statsKey'
+# Key of the item holding the counters
+TASK_COUNTS_KEY = 'taskCounts'
+COUNT_PREFIX = 'status#'
+
+
+def _status(image):
+    """Status of a task in a stream image (DynamoDB JSON), or None."""
+    return ((image or {}).get('status') or {}).get('S')
+
+
+def status_deltas(records):
+    """Net change of each status's count over DynamoDB stream ``records``, without zero entries."""
+    deltas = Counter()
+    for record in records:
+        change = record.get('dynamodb') or {}
+        old_status = _status(change.get('OldImage'))
+        new_status = _status(change.get('NewImage'))
+        # INSERT has only a new image, REMOVE only an old one; a MODIFY that kept the status nets to zero
+        if old_status is not None:
+            deltas[old_status] -= 1
+        if new_status is not None:
+            deltas[new_status] += 1
+    return {status: delta for status, delta in deltas.items() if delta}
+
+
+def apply_deltas(client, table_name, deltas):
+    """Adds ``deltas`` to the counters in one atomic UpdateItem."""
+    names = {}
+    values = {}
+    actions = []
+    for position, (status, delta) in enumerate(sorted(deltas.items())):
+        names[f'#c{position}'] = COUNT_PREFIX + status
+        values[f':d{position}'] = {'N': str(delta)}
+        actions.append(f'#c{position} :d{position}')
+    client.update_item(
+        TableName=table_name,
+        Key={STATS_KEY_ATTRIBUTE: {'S': TASK_COUNTS_KEY}},
+        UpdateExpression='ADD ' + ', '.join(actions),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+
+def count_statuses(client, table_name):
+    """Status -> number of tasks, counted with a scan of ``table_name`` that reads only the status."""
+    counts = Counter()
+    scan_kwargs = {
+        'TableName': table_name,
+        'ProjectionExpression': '#s',
+        'ExpressionAttributeNames': {'#s': 'status'}
+    }
+    while True:
+        response = client.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            status = _status(item)
+            if status is not None:
+                counts[status] += 1
+        if 'LastEvaluatedKey' not in response:
+            return dict(counts)
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def seed_counts(client, table_name, counts):
+    """Replaces the counters item with ``counts``, dropping counters of statuses not in it."""
+    item = {STATS_KEY_ATTRIBUTE: {'S': TASK_COUNTS_KEY}}
+    for status, count in counts.items():
+        item[COUNT_PREFIX + status] = {'N': str(count)}
+    client.put_item(TableName=table_name, Item=item)
+
+
+def task_counts(item):
+    """Status -> number of tasks, from the counters item.
+
+    Statuses no task has any more are left out, and so are negative counters: those
+    come from changes to tasks that existed before the counters did, until a backfill.
+    """
+    counts = {}
+    for name, value in (item or {}).items():
+        if name.startswith(COUNT_PREFIX) and int(value) > 0:
+            counts[name[len(COUNT_PREFIX):]] = int(value)
+    return counts
@@ -0,0 +1,30 @@
+import os
+
+try:
+    from .metrics import instrumented
+    from .runtime import get_client
+    from .task_stats import apply_deltas, status_deltas
+except ImportError:
+    from metrics import instrumented
+    from runtime import get_client
+    from task_stats import apply_deltas, status_deltas
+
+
+@instrumented
+def handler(event, context):
+    """Consumes a batch of TasksTable stream records into the per-status counters.
+
+    The whole batch becomes one write; if it fails the error propagates and Lambda
+    retries the batch, so counters are never partially updated.
+    """
+    records = event.get('Records') or []
+
+    # Coalescing the batch: one delta per status instead of one write per record
+    deltas = status_deltas(records)
+    if deltas:
+        apply_deltas(get_client(), os.environ['STATS_TABLE_NAME'], deltas)
+
+    return {
+        'records': len(records),
+        'statuses': len(deltas)
+    }
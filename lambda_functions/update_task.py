@@ -1,12 +1,35 @@
 import json
-import boto3
-import os
 from botocore.exceptions import ClientError
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TASKS_TABLE_NAME'])
+try:
+    from .compression import compressed
+    from .events import normalized
+    from .headers import get_header
+    from .metrics import instrumented, phase
+    from .runtime import get_table
+    from .serialization import dumps
+    from .status_shards import SHARD_ATTRIBUTE, shard_for
+    from .task_cache import task_cache
+    from .task_expiry import expiry_update
+    from .task_items import etag_for, if_match_condition, public_item
+    from .task_schema import gateway_validated, task_error
+except ImportError:
+    from compression import compressed
+    from events import normalized
+    from headers import get_header
+    from metrics import instrumented, phase
+    from runtime import get_table
+    from serialization import dumps
+    from status_shards import SHARD_ATTRIBUTE, shard_for
+    from task_cache import task_cache
+    from task_expiry import expiry_update
+    from task_items import etag_for, if_match_condition, public_item
+    from task_schema import gateway_validated, task_error
 
 
+@normalized
+@instrumented
+@compressed
 def handler(event, context):
     try:
         # Verifying parameter
@@ -27,49 +50,90 @@ def handler(event, context):
 
         # Trying load JSON from body
         try:
-            body = json.loads(event['body'])
+            with phase('Parse'):
+                body = json.loads(event['body'])
         except json.JSONDecodeError:
             return {
                 'statusCode': 400,
                 'body': json.dumps({'error': 'Invalid JSON in request body'})
             }
 
-        # Verifying body fields
-        required_fields = ['title', 'description', 'status']
-        for field in required_fields:
-            if field not in body:
+        # Verifying body fields, unless API Gateway already did
+        if not gateway_validated(event):
+            with phase('Validate'):
+                error = task_error(body)
+                if error:
+                    return {
+                        'statusCode': 400,
+                        'body': json.dumps({'error': error})
+                    }
+
+        update_kwargs = {}
+        values = {
+            ':t': body['title'],
+            ':d': body['description'],
+            ':s': body['status'],
+            ':ss': shard_for(task_id, body['status']),
+            ':one': 1
+        }
+        names = {
+            '#s': 'status',
+            '#ss': SHARD_ATTRIBUTE,
+            '#v': 'version'
+        }
+
+        # Tasks reaching a terminal status expire through the table's TTL, reopened ones are kept again
+        update_expression = "set title=:t, description=:d, #s=:s, #ss=:ss"
+        expiry_set, expiry_remove = expiry_update(body['status'], names, values)
+        if expiry_set:
+            update_expression += f", {expiry_set}"
+        update_expression += " ADD #v :one"
+        if expiry_remove:
+            update_expression += f" REMOVE {expiry_remove}"
+
+        # If-Match is enforced by DynamoDB itself, so conflicting writes fail without a prior read
+        if_match = get_header(event, 'If-Match')
+        if if_match:
+            condition = if_match_condition(if_match, values)
+            if condition is None:
                 return {
-                    'statusCode': 400,
-                    'body': json.dumps({'error': f'{field} is required in the body'})
+                    'statusCode': 412,
+                    'body': json.dumps({'error': 'Task has been modified'})
                 }
+            update_kwargs['ConditionExpression'] = condition
 
         try:
             # Trying update DynamoDB
-            response = table.update_item(
+            response = get_table().update_item(
                 Key={
                     'taskId': task_id
                 },
-                UpdateExpression="set title=:t, description=:d, #s=:s",
-                ExpressionAttributeNames={
-                    '#s': 'status'
-                },
-                ExpressionAttributeValues={
-                    ':t': body['title'],
-                    ':d': body['description'],
-                    ':s': body['status']
-                },
-                ReturnValues="UPDATED_NEW"
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues="UPDATED_NEW",
+                **update_kwargs
             )
         except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return {
+                    'statusCode': 412,
+                    'body': json.dumps({'error': 'Task has been modified'})
+                }
             # Handling DynamoDB error
             return {
                 'statusCode': 500,
                 'body': json.dumps({'error': f'Error updating task: {e.response["Error"]["Message"]}'})
             }
 
+        # Every write bumps the version, which evicts older copies cached in this container
+        attributes = public_item(response['Attributes'])
+        task_cache.invalidate(task_id, attributes['version'])
+
         return {
             'statusCode': 200,
-            'body': json.dumps(response['Attributes'])
+            'headers': {'ETag': etag_for(attributes)},
+            'body': dumps(attributes)
         }
 
     except Exception as e:
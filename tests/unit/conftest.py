@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_task_cache():
+    """Keeps the warm-container task cache from leaking tasks between tests."""
+    from lambda_functions.task_cache import task_cache
+
+    task_cache.clear()
+    yield
+    task_cache.clear()
@@ -0,0 +1,392 @@
+import aws_cdk as cdk
+import pytest
+from aws_cdk.assertions import Match, Template
+
+from aws_cdk_serverless_crud_api.aws_cdk_serverless_crud_api_stack import AwsCdkServerlessCrudApiStack
+from aws_cdk_serverless_crud_api.caching import StageCacheProfile
+from aws_cdk_serverless_crud_api.capacity import CapacityProfile, IndexCapacity, ScalingSettings
+from aws_cdk_serverless_crud_api.performance import PerformanceProfile
+
+
+def synth(**kwargs):
+    # No bundling (Docker / a matching interpreter) for the assertions; see test_bundling.py
+    app = cdk.App(context={"aws:cdk:bundling-stacks": []})
+    stack = AwsCdkServerlessCrudApiStack(app, "TestStack", **kwargs)
+    return Template.from_stack(stack)
+
+
+@pytest.fixture(scope='module')
+def on_demand_template():
+    return synth()
+
+
+@pytest.fixture(scope='module')
+def provisioned_template():
+    return synth(capacity_profile=CapacityProfile(
+        billing_mode="PROVISIONED",
+        read=ScalingSettings(min_capacity=10, max_capacity=200, target_utilization=60),
+        write=ScalingSettings(min_capacity=5, max_capacity=5),
+        indexes={"StatusIndex": IndexCapacity(read=ScalingSettings(min_capacity=2, max_capacity=20))},
+        contributor_insights=True
+    ))
+
+
+def test_tasks_table_is_on_demand_by_default(on_demand_template):
+    on_demand_template.has_resource_properties("AWS::DynamoDB::Table", {
+        "TableName": "TasksTable",
+        "BillingMode": "PAY_PER_REQUEST",
+        "ProvisionedThroughput": Match.absent(),
+        "GlobalSecondaryIndexes": [Match.object_like({
+            "IndexName": "StatusIndex",
+            "ProvisionedThroughput": Match.absent()
+        })]
+    })
+    on_demand_template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 0)
+
+
+def test_provisioned_profile_sets_table_and_index_capacity(provisioned_template):
+    provisioned_template.has_resource_properties("AWS::DynamoDB::Table", {
+        "TableName": "TasksTable",
+        "ProvisionedThroughput": {"ReadCapacityUnits": 10, "WriteCapacityUnits": 5},
+        "ContributorInsightsSpecification": {"Enabled": True},
+        "GlobalSecondaryIndexes": [Match.object_like({
+            "IndexName": "StatusIndex",
+            "ProvisionedThroughput": {"ReadCapacityUnits": 2, "WriteCapacityUnits": 5},
+            "ContributorInsightsSpecification": {"Enabled": True}
+        })]
+    })
+
+
+def test_provisioned_profile_autoscales_only_scaled_directions(provisioned_template):
+    # Table reads and index reads scale; writes are fixed (min == max)
+    provisioned_template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 2)
+    provisioned_template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "ScalableDimension": "dynamodb:table:ReadCapacityUnits",
+        "MinCapacity": 10,
+        "MaxCapacity": 200
+    })
+    provisioned_template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "ScalableDimension": "dynamodb:index:ReadCapacityUnits",
+        "MinCapacity": 2,
+        "MaxCapacity": 20
+    })
+    provisioned_template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "PolicyType": "TargetTrackingScaling",
+        "TargetTrackingScalingPolicyConfiguration": Match.object_like({"TargetValue": 60})
+    })
+
+
+def test_capacity_profile_from_context():
+    profile = CapacityProfile.from_dict({
+        "billingMode": "provisioned",
+        "read": {"min": 5, "max": 100},
+        "indexes": {"StatusIndex": {"write": {"min": 3}}},
+        "contributorInsights": "true"
+    })
+
+    assert profile.provisioned
+    assert profile.read == ScalingSettings(min_capacity=5, max_capacity=100)
+    assert profile.index_read("StatusIndex") == profile.read
+    assert profile.index_write("StatusIndex") == ScalingSettings(min_capacity=3, max_capacity=3)
+    assert profile.contributor_insights
+    with pytest.raises(ValueError):
+        CapacityProfile.from_dict({"billingMode": "serverless"})
+
+
+@pytest.fixture(scope='module')
+def performance_template():
+    return synth(performance_profile=PerformanceProfile.from_dict({
+        "default": {"memorySize": 512},
+        "functions": {
+            "get_task": {"provisionedConcurrency": {"min": 2, "max": 10}, "reservedConcurrency": 50},
+            "batch_delete_tasks": {"reservedConcurrency": 2, "architecture": "x86_64"}
+        }
+    }))
+
+
+def test_functions_default_to_arm64_and_newer_runtime(on_demand_template):
+    on_demand_template.all_resources_properties("AWS::Lambda::Function", {
+        "Runtime": "python3.12",
+        "Architectures": ["arm64"],
+        "MemorySize": 256
+    })
+    on_demand_template.resource_count_is("AWS::Lambda::Alias", 0)
+
+
+def test_performance_profile_per_function(performance_template):
+    performance_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "get_task.handler",
+        "MemorySize": 512,
+        "ReservedConcurrentExecutions": 50
+    })
+    performance_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "batch_delete_tasks.handler",
+        "Architectures": ["x86_64"],
+        "ReservedConcurrentExecutions": 2
+    })
+    performance_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "list_tasks.handler",
+        "MemorySize": 512,
+        "ReservedConcurrentExecutions": Match.absent()
+    })
+
+
+def test_provisioned_concurrency_alias_autoscales_and_serves_the_route(performance_template):
+    performance_template.resource_count_is("AWS::Lambda::Alias", 1)
+    performance_template.has_resource_properties("AWS::Lambda::Alias", {
+        "Name": "live",
+        "ProvisionedConcurrencyConfig": {"ProvisionedConcurrentExecutions": 2}
+    })
+    performance_template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "ScalableDimension": "lambda:function:ProvisionedConcurrency",
+        "MinCapacity": 2,
+        "MaxCapacity": 10
+    })
+    performance_template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "TargetTrackingScalingPolicyConfiguration": Match.object_like({
+            "PredefinedMetricSpecification": {"PredefinedMetricType": "LambdaProvisionedConcurrencyUtilization"}
+        })
+    })
+    # GET /tasks/{taskId} invokes the alias
+    alias_id, = performance_template.find_resources("AWS::Lambda::Alias")
+    methods = performance_template.find_resources("AWS::ApiGateway::Method", {
+        "Properties": {"HttpMethod": "GET", "ResourceId": {"Ref": Match.string_like_regexp("taskId")}}
+    })
+    method, = methods.values()
+    assert {"Ref": alias_id} in method["Properties"]["Integration"]["Uri"]["Fn::Join"][1]
+
+
+def test_performance_profile_rejects_provisioned_above_reserved():
+    with pytest.raises(ValueError):
+        PerformanceProfile.from_dict({
+            "functions": {"get_task": {"provisionedConcurrency": {"min": 5}, "reservedConcurrency": 2}}
+        })
+
+
+def test_functions_share_one_code_layer_per_runtime(on_demand_template):
+    on_demand_template.resource_count_is("AWS::Lambda::LayerVersion", 1)
+    on_demand_template.has_resource_properties("AWS::Lambda::LayerVersion", {
+        "CompatibleRuntimes": ["python3.12"]
+    })
+    layer_id, = on_demand_template.find_resources("AWS::Lambda::LayerVersion")
+    functions = on_demand_template.find_resources("AWS::Lambda::Function", {
+        "Properties": {"Handler": Match.string_like_regexp(r"\.handler$")}
+    })
+    assert functions
+    for function in functions.values():
+        assert function["Properties"]["Layers"] == [{"Ref": layer_id}]
+
+
+def test_unoptimized_bundles_ship_the_source_directory_without_a_layer():
+    template = synth(optimized_bundles=False)
+    template.resource_count_is("AWS::Lambda::LayerVersion", 0)
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "get_task.handler",
+        "Layers": Match.absent()
+    })
+
+
+@pytest.fixture(scope='module')
+def stage_cache_template():
+    return synth(stage_cache=StageCacheProfile.from_dict({
+        "enabled": True,
+        "clusterSize": "1.6",
+        "methods": {"GET /tasks/{taskId}": {"ttlSeconds": 120}}
+    }))
+
+
+def test_stage_cache_is_off_by_default(on_demand_template):
+    on_demand_template.has_resource_properties("AWS::ApiGateway::Stage", {
+        "CacheClusterEnabled": Match.absent()
+    })
+    on_demand_template.resource_properties_count_is("AWS::Lambda::Function", {
+        "Handler": "stage_cache_consumer.handler"
+    }, 0)
+    on_demand_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "get_task.handler",
+        "Environment": {"Variables": Match.object_like({"RESPONSE_CACHED_BY_GATEWAY": Match.absent()})}
+    })
+
+
+def test_stage_cache_caches_get_task_by_task_id(stage_cache_template):
+    stage_cache_template.has_resource_properties("AWS::ApiGateway::Stage", {
+        "CacheClusterEnabled": True,
+        "CacheClusterSize": "1.6",
+        "MethodSettings": [Match.object_like({
+            "HttpMethod": "GET",
+            "ResourcePath": "/~1tasks~1{taskId}",
+            "CachingEnabled": True,
+            "CacheTtlInSeconds": 120
+        })]
+    })
+    stage_cache_template.has_resource_properties("AWS::ApiGateway::Method", {
+        "HttpMethod": "GET",
+        "Integration": Match.object_like({"CacheKeyParameters": ["method.request.path.taskId"]})
+    })
+    # Keyed on the taskId only, so get_task must not answer with a cacheable 304
+    stage_cache_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "get_task.handler",
+        "Environment": {"Variables": Match.object_like({"RESPONSE_CACHED_BY_GATEWAY": "true"})}
+    })
+
+
+def test_stage_cache_refreshed_from_the_stream(stage_cache_template):
+    # The writers do not wait on API Gateway, a stream consumer refreshes the entries
+    for handler in ("update_task", "patch_task", "delete_task", "batch_delete_tasks"):
+        stage_cache_template.has_resource_properties("AWS::Lambda::Function", {
+            "Handler": f"{handler}.handler",
+            "Environment": {"Variables": Match.object_like({"TASKS_API_CACHE_URL": Match.absent()})}
+        })
+    stage_cache_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "stage_cache_consumer.handler",
+        "Environment": {"Variables": {"TASKS_API_CACHE_URL": Match.any_value()}}
+    })
+    stage_cache_template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+        "FunctionName": {"Ref": Match.string_like_regexp("^StageCacheConsumerFunction")},
+        "StartingPosition": "LATEST",
+        "BisectBatchOnFunctionError": True,
+        "MaximumRetryAttempts": 3
+    })
+    stage_cache_template.has_resource_properties("AWS::IAM::Policy", {
+        "PolicyDocument": {"Statement": Match.array_with([Match.object_like({
+            "Action": "execute-api:InvalidateCache",
+            "Effect": "Allow"
+        })])}
+    })
+    # Large batches flush the stage cache instead
+    stage_cache_template.has_resource_properties("AWS::IAM::Policy", {
+        "PolicyDocument": {"Statement": Match.array_with([Match.object_like({
+            "Action": "apigateway:DELETE",
+            "Effect": "Allow",
+            "Resource": {"Fn::Join": ["", Match.array_with([Match.string_like_regexp("/stages/prod/cache/data$")])]}
+        })])}
+    })
+
+
+def test_stage_cache_rejects_uncacheable_methods():
+    with pytest.raises(ValueError):
+        StageCacheProfile.from_dict({"enabled": True, "methods": {"POST /tasks": {"ttlSeconds": 60}}})
+
+
+def test_http_api_serves_every_route():
+    template = synth(api_type="http")
+
+    template.resource_count_is("AWS::ApiGateway::RestApi", 0)
+    template.resource_count_is("AWS::ApiGatewayV2::Api", 1)
+    template.resource_count_is("AWS::ApiGatewayV2::Route", 10)
+    template.has_resource_properties("AWS::ApiGatewayV2::Route", {"RouteKey": "GET /tasks/{taskId}"})
+    template.has_resource_properties("AWS::ApiGatewayV2::Integration", {"PayloadFormatVersion": "2.0"})
+    # Nothing validates the bodies in front of the handlers
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "create_task.handler",
+        "Environment": {"Variables": Match.object_like({"REQUEST_VALIDATED_BY_GATEWAY": Match.absent()})}
+    })
+
+
+def test_both_apis_side_by_side():
+    template = synth(api_type="both", single_function=True)
+
+    template.resource_count_is("AWS::ApiGateway::RestApi", 1)
+    template.resource_count_is("AWS::ApiGatewayV2::Api", 1)
+    # The router and the stats stream consumer
+    template.resource_count_is("AWS::Lambda::Function", 2)
+
+
+def test_http_api_rejects_stage_cache():
+    with pytest.raises(ValueError):
+        synth(api_type="http", stage_cache=StageCacheProfile(enabled=True))
+
+
+def test_rest_api_compresses_large_responses(on_demand_template):
+    on_demand_template.has_resource_properties("AWS::ApiGateway::RestApi", {
+        "MinimumCompressionSize": 1024
+    })
+    on_demand_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "get_task.handler",
+        "Environment": {"Variables": Match.object_like({
+            "RESPONSE_COMPRESSION_MIN_BYTES": "1024",
+            "RESPONSE_COMPRESSED_BY_GATEWAY": "true"
+        })}
+    })
+
+
+def test_stream_feeds_the_stats_consumer(on_demand_template):
+    on_demand_template.has_resource_properties("AWS::DynamoDB::Table", {
+        "TableName": "TasksTable",
+        "StreamSpecification": {"StreamViewType": "NEW_AND_OLD_IMAGES"}
+    })
+    on_demand_template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+        "BatchSize": 100,
+        "MaximumBatchingWindowInSeconds": 1,
+        "StartingPosition": "TRIM_HORIZON",
+        "BisectBatchOnFunctionError": True,
+        "MaximumRetryAttempts": 3,
+        "DestinationConfig": {"OnFailure": {"Destination": {
+            "Fn::GetAtt": [Match.string_like_regexp("^StreamFailureQueue"), "Arn"]
+        }}}
+    })
+    on_demand_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "task_stats_consumer.handler",
+        "Environment": {"Variables": {"STATS_TABLE_NAME": Match.any_value()}}
+    })
+    on_demand_template.has_resource_properties("AWS::ApiGateway::Resource", {"PathPart": "stats"})
+
+
+def test_finished_tasks_expire_into_the_archive(on_demand_template):
+    # Expiry is opt-in: the stack enables TTL on the table, but writers only set expiresAt when asked to,
+    # and nothing is archived (or paid for) until they do
+    on_demand_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "update_task.handler",
+        "Environment": {"Variables": Match.object_like({"COMPLETED_TASK_TTL_SECONDS": "0"})}
+    })
+    on_demand_template.resource_count_is("AWS::S3::Bucket", 0)
+    on_demand_template.resource_properties_count_is("AWS::Lambda::Function", {
+        "Handler": "task_archiver.handler"
+    }, 0)
+    on_demand_template.resource_count_is("AWS::Lambda::EventSourceMapping", 1)
+    on_demand_template.has_resource_properties("AWS::DynamoDB::Table", {
+        "TableName": "TasksTable",
+        "TimeToLiveSpecification": {"AttributeName": "expiresAt", "Enabled": True}
+    })
+
+    template = synth(completed_task_ttl_seconds=2592000)
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "update_task.handler",
+        "Environment": {"Variables": Match.object_like({
+            "COMPLETED_TASK_TTL_SECONDS": "2592000",
+            "TERMINAL_STATUSES": "completed,cancelled"
+        })}
+    })
+    template.has_resource("AWS::S3::Bucket", {"DeletionPolicy": "Retain"})
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "task_archiver.handler",
+        "Environment": {"Variables": {"ARCHIVE_BUCKET_NAME": Match.any_value()}}
+    })
+    # Only the TTL's own deletions reach the archiver
+    template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+        "BatchSize": 1000,
+        "MaximumBatchingWindowInSeconds": 60,
+        "BisectBatchOnFunctionError": True,
+        "MaximumRetryAttempts": 3,
+        "DestinationConfig": {"OnFailure": {"Destination": Match.any_value()}},
+        "FilterCriteria": {"Filters": [{"Pattern": Match.serialized_json({
+            "eventName": ["REMOVE"],
+            "userIdentity": {"type": ["Service"], "principalId": ["dynamodb.amazonaws.com"]}
+        })}]}
+    })
+
+
+def test_cursor_signing_key_stays_out_of_the_function_configuration(on_demand_template):
+    on_demand_template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "list_tasks.handler",
+        "Environment": {"Variables": Match.object_like({
+            "CURSOR_SIGNING_SECRET_ARN": {"Ref": Match.string_like_regexp("^CursorSigningSecret")},
+            "CURSOR_SIGNING_KEY": Match.absent()
+        })}
+    })
+    on_demand_template.has_resource_properties("AWS::IAM::Policy", {
+        "PolicyDocument": {"Statement": Match.array_with([Match.object_like({
+            "Action": ["secretsmanager:GetSecretValue", "secretsmanager:DescribeSecret"],
+            "Resource": {"Ref": Match.string_like_regexp("^CursorSigningSecret")}
+        })])}
+    })
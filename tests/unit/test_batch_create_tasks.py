@@ -0,0 +1,150 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {
+                    'AttributeName': 'taskId',
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'taskId',
+                    'AttributeType': 'S'
+                }
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+
+        yield
+
+
+def test_batch_create_tasks_success(dynamodb_setup):
+    from lambda_functions.batch_create_tasks import handler
+
+    # 60 tasks span three BatchWriteItem chunks
+    tasks = [
+        {'title': f'Task {i}', 'description': f'Description {i}', 'status': 'pending'}
+        for i in range(60)
+    ]
+    event = {'body': json.dumps(tasks)}
+
+    response = handler(event, {})
+
+    # Check response
+    assert response['statusCode'] == 201
+    body = json.loads(response['body'])
+    assert body['created'] == 60
+    assert body['failed'] == 0
+    assert [result['index'] for result in body['results']] == list(range(60))
+    assert all(result['result'] == 'created' for result in body['results'])
+
+    # Verify every task is stored in DynamoDB
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    assert table.scan(Select='COUNT')['Count'] == 60
+    item = table.get_item(Key={'taskId': body['results'][7]['taskId']})['Item']
+    assert item['title'] == 'Task 7'
+
+
+def test_batch_create_tasks_invalid_task(dynamodb_setup):
+    from lambda_functions.batch_create_tasks import handler
+
+    event = {
+        'body': json.dumps([
+            {'title': 'Valid', 'description': 'Valid task', 'status': 'pending'},
+            {'title': 'Invalid'},
+            {'title': 'Mistyped', 'description': 'Task', 'status': 1},
+            'not a task'
+        ])
+    }
+
+    response = handler(event, {})
+
+    # Nothing is written when any task is invalid
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['details'] == [
+        {'index': 1, 'error': 'description is required in the body'},
+        {'index': 2, 'error': 'status must be a string'},
+        {'index': 3, 'error': 'Task must be an object'}
+    ]
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    assert table.scan(Select='COUNT')['Count'] == 0
+
+
+def test_batch_create_tasks_not_an_array(dynamodb_setup):
+    from lambda_functions.batch_create_tasks import handler
+
+    event = {'body': json.dumps({'title': 'Single task'})}
+
+    response = handler(event, {})
+
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['error'] == 'Body must be a non-empty array of tasks'
+
+
+def test_batch_write_retries_unprocessed_items():
+    from lambda_functions.dynamodb_batch import batch_write
+
+    class FlakyDynamoDB:
+        """Leaves the last request unprocessed on the first call."""
+
+        def __init__(self):
+            self.calls = []
+
+        def batch_write_item(self, RequestItems):
+            requests = RequestItems['TasksTable']
+            self.calls.append(requests)
+            if len(self.calls) == 1:
+                return {'UnprocessedItems': {'TasksTable': requests[-1:]}}
+            return {'UnprocessedItems': {}}
+
+    fake = FlakyDynamoDB()
+    delays = []
+    requests = [{'PutRequest': {'Item': {'taskId': str(i)}}} for i in range(3)]
+
+    unprocessed = batch_write(fake, 'TasksTable', requests, sleep=delays.append)
+
+    assert unprocessed == []
+    assert fake.calls[1] == requests[-1:]
+    assert len(delays) == 1
+
+
+def test_batch_write_gives_up_after_max_attempts():
+    from lambda_functions.dynamodb_batch import batch_write
+
+    class ThrottledDynamoDB:
+        def batch_write_item(self, RequestItems):
+            return {'UnprocessedItems': RequestItems}
+
+    requests = [{'PutRequest': {'Item': {'taskId': '1'}}}]
+
+    unprocessed = batch_write(ThrottledDynamoDB(), 'TasksTable', requests, max_attempts=3, sleep=lambda _: None)
+
+    assert unprocessed == requests
@@ -0,0 +1,109 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        from lambda_functions import runtime
+        runtime.reset()
+
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {'AttributeName': 'taskId', 'KeyType': 'HASH'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'taskId', 'AttributeType': 'S'},
+                {'AttributeName': 'statusShard', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'StatusIndex',
+                    'KeySchema': [
+                        {'AttributeName': 'statusShard', 'KeyType': 'HASH'},
+                        {'AttributeName': 'taskId', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+        from lambda_functions.status_shards import shard_for
+        with table.batch_writer() as writer:
+            for i in range(80):
+                task_id = f'task-{i:03d}'
+                status = 'done' if i % 2 else 'pending'
+                writer.put_item(Item={
+                    'taskId': task_id,
+                    'title': f'Task {i}',
+                    'description': 'Bulk',
+                    'status': status,
+                    'statusShard': shard_for(task_id, status)
+                })
+
+        yield table
+
+        runtime.reset()
+
+
+def test_batch_delete_by_ids(dynamodb_setup):
+    from lambda_functions.batch_delete_tasks import handler
+
+    task_ids = [f'task-{i:03d}' for i in range(60)]
+    response = handler({'body': json.dumps({'taskIds': task_ids + task_ids[:5]})}, {})
+
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body['deleted'] == 60
+    assert body['failed'] == 0
+    assert dynamodb_setup.scan()['Count'] == 20
+
+
+def test_batch_delete_by_status(dynamodb_setup):
+    from lambda_functions.batch_delete_tasks import handler
+
+    response = handler({'body': json.dumps({'status': 'done'})}, {})
+
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body['deleted'] == 40
+    assert body['more'] is False
+    remaining = dynamodb_setup.scan()['Items']
+    assert len(remaining) == 40
+    assert all(item['status'] == 'pending' for item in remaining)
+
+
+def test_batch_delete_reports_unprocessed(dynamodb_setup, monkeypatch):
+    from lambda_functions import batch_delete_tasks
+
+    # Every chunk comes back entirely unprocessed
+    monkeypatch.setattr(batch_delete_tasks, 'batch_write', lambda dynamodb, table_name, requests: requests)
+    response = batch_delete_tasks.handler({'body': json.dumps({'taskIds': ['task-000', 'task-001']})}, {})
+
+    assert response['statusCode'] == 207
+    body = json.loads(response['body'])
+    assert body['deleted'] == 0
+    assert {failure['taskId'] for failure in body['failures']} == {'task-000', 'task-001'}
+
+
+def test_batch_delete_requires_ids_or_status(dynamodb_setup):
+    from lambda_functions.batch_delete_tasks import handler
+
+    response = handler({'body': json.dumps({'taskIds': ['task-000'], 'status': 'done'})}, {})
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == 'Body must contain either taskIds or status'
@@ -0,0 +1,102 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {
+                    'AttributeName': 'taskId',
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'taskId',
+                    'AttributeType': 'S'
+                }
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+        for i in range(150):
+            table.put_item(Item={'taskId': str(i), 'title': f'Task {i}', 'description': f'Description {i}', 'status': 'pending'})
+
+        yield
+
+
+def test_batch_get_tasks_success(dynamodb_setup):
+    from lambda_functions.batch_get_tasks import handler
+
+    # 140 distinct ids span two BatchGetItem chunks
+    task_ids = [str(i) for i in range(140)] + ['3', 'unknown']
+    event = {'body': json.dumps({'taskIds': task_ids})}
+
+    response = handler(event, {})
+
+    # Check response
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert [item['taskId'] for item in body['items']] == [str(i) for i in range(140)]
+    assert body['items'][3]['title'] == 'Task 3'
+    assert body['missing'] == ['unknown']
+    assert body['unprocessed'] == []
+
+
+def test_batch_get_tasks_invalid_ids(dynamodb_setup):
+    from lambda_functions.batch_get_tasks import handler
+
+    event = {'body': json.dumps({'taskIds': []})}
+
+    response = handler(event, {})
+
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['error'] == 'taskIds must be a non-empty array of strings'
+
+
+def test_batch_get_retries_unprocessed_keys():
+    from lambda_functions.dynamodb_batch import batch_get
+
+    class FlakyDynamoDB:
+        """Returns the first key and leaves the second unprocessed on the first call."""
+
+        def __init__(self):
+            self.calls = []
+
+        def batch_get_item(self, RequestItems):
+            keys = RequestItems['TasksTable']['Keys']
+            self.calls.append(keys)
+            if len(self.calls) == 1:
+                return {
+                    'Responses': {'TasksTable': [keys[0]]},
+                    'UnprocessedKeys': {'TasksTable': {'Keys': keys[1:]}}
+                }
+            return {'Responses': {'TasksTable': keys}, 'UnprocessedKeys': {}}
+
+    fake = FlakyDynamoDB()
+    keys = [{'taskId': '1'}, {'taskId': '2'}]
+
+    items, unprocessed = batch_get(fake, 'TasksTable', keys, sleep=lambda _: None)
+
+    assert items == keys
+    assert unprocessed == []
+    assert fake.calls[1] == [{'taskId': '2'}]
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+import aws_cdk as cdk
+from aws_cdk import aws_lambda as _lambda
+
+from aws_cdk_serverless_crud_api.bundling import HandlerBundles, dependencies, local_imports
+
+HANDLERS = ['batch_create_tasks', 'batch_delete_tasks', 'batch_get_tasks', 'create_task', 'delete_task',
+            'get_task', 'get_task_stats', 'list_tasks', 'patch_task', 'update_task', 'router']
+
+
+def test_local_imports_follow_both_import_forms():
+    assert {'runtime', 'metrics', 'serialization'} <= local_imports('get_task')
+    assert 'boto3' not in local_imports('get_task')
+
+
+def test_handler_bundle_holds_only_its_handler():
+    bundles = HandlerBundles(HANDLERS)
+
+    assert bundles.bundle_modules('create_task') == {'create_task'}
+    assert {'runtime', 'metrics', 'idempotency', 'task_schema'} <= bundles.shared_modules
+    assert not bundles.shared_modules & set(HANDLERS)
+    # Every module a handler needs is either in its bundle or in the layer
+    assert dependencies(['create_task']) <= bundles.bundle_modules('create_task') | bundles.shared_modules
+
+
+def test_router_bundle_holds_the_handlers_it_dispatches_to():
+    bundles = HandlerBundles(HANDLERS + ['task_stats_consumer'])
+
+    assert bundles.bundle_modules('router') == set(HANDLERS)
+    assert bundles.bundle_modules('task_stats_consumer') == {'task_stats_consumer'}
+
+
+def test_code_and_layer_are_compiled_for_a_matching_local_interpreter():
+    runtime_name = f'python{sys.version_info.major}.{sys.version_info.minor}'
+    runtime = _lambda.Runtime(runtime_name, _lambda.RuntimeFamily.PYTHON)
+    bundles = HandlerBundles(HANDLERS)
+    stack = cdk.Stack(cdk.App())
+
+    bundles.layer(stack, runtime)
+    bundles.layer(stack, runtime)
+    code = bundles.code('get_task', runtime).bind(stack)
+
+    assert len(bundles.layers) == 1
+    asset_dir = Path(cdk.Stage.of(stack).asset_outdir, 'asset.' + code.s3_location.object_key.removesuffix('.zip'))
+    modules = {path.name for path in asset_dir.iterdir()}
+    assert 'get_task.py' in modules and 'runtime.py' not in modules
+    compiled, = (asset_dir / '__pycache__').glob('get_task.*.pyc')
+    # PEP 552 flags: hash-based (bit 0) without check_source (bit 1)
+    assert int.from_bytes(compiled.read_bytes()[4:8], 'little') == 0b01
+
+
+def test_staging_dir_is_restaged_or_removed(tmp_path):
+    staging_dir = tmp_path / 'bundles'
+    (staging_dir / 'stale').mkdir(parents=True)
+
+    HandlerBundles(HANDLERS, staging_dir=staging_dir)
+    assert list(staging_dir.iterdir()) == []
+
+    bundles = HandlerBundles(HANDLERS)
+    temporary_dir = bundles.staging_dir
+    assert temporary_dir.is_dir()
+    del bundles
+    assert not temporary_dir.exists()
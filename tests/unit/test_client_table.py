@@ -0,0 +1,182 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+    os.environ['CURSOR_SIGNING_KEY'] = 'test-signing-key'
+
+
+@pytest.fixture
+def dynamodb_setup(monkeypatch):
+    from lambda_functions import runtime
+
+    # Route every handler through the low-level client
+    monkeypatch.setenv('TASKS_DATA_ACCESS', 'client')
+
+    # Setup mock DynamoDB
+    with mock_aws():
+        runtime.reset()
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {
+                    'AttributeName': 'taskId',
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'taskId',
+                    'AttributeType': 'S'
+                },
+                {
+                    'AttributeName': 'statusShard',
+                    'AttributeType': 'S'
+                }
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'StatusIndex',
+                    'KeySchema': [
+                        {'AttributeName': 'statusShard', 'KeyType': 'HASH'},
+                        {'AttributeName': 'taskId', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                    'ProvisionedThroughput': {
+                        'ReadCapacityUnits': 5,
+                        'WriteCapacityUnits': 5
+                    }
+                }
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+        yield
+
+
+def test_marshalling_round_trip():
+    from decimal import Decimal
+    from lambda_functions.client_table import marshall_item, unmarshall_item
+
+    item = {
+        'taskId': '123',
+        'title': 'Title',
+        'version': 3,
+        'estimate': Decimal('1.5'),
+        'done': False,
+        'notes': None,
+        'meta': {'owner': 'me', 'checklist': ['a', 1]},
+        'tags': {'x', 'y'}
+    }
+
+    marshalled = marshall_item(item)
+
+    assert marshalled['taskId'] == {'S': '123'}
+    assert marshalled['version'] == {'N': '3'}
+    assert marshalled['meta'] == {'M': {'owner': {'S': 'me'}, 'checklist': {'L': [{'S': 'a'}, {'N': '1'}]}}}
+    assert unmarshall_item(marshalled) == dict(item, version=Decimal(3), meta={'owner': 'me', 'checklist': ['a', Decimal(1)]})
+
+
+def test_client_table_selected_by_environment(dynamodb_setup):
+    from lambda_functions import runtime
+    from lambda_functions.client_table import ClientTable
+
+    assert isinstance(runtime.get_table(), ClientTable)
+
+
+def test_handlers_on_client_table(dynamodb_setup):
+    from lambda_functions.create_task import handler as create_handler
+    from lambda_functions.get_task import handler as get_handler
+    from lambda_functions.update_task import handler as update_handler
+    from lambda_functions.patch_task import handler as patch_handler
+    from lambda_functions.list_tasks import handler as list_handler
+    from lambda_functions.delete_task import handler as delete_handler
+
+    created = create_handler({
+        'body': json.dumps({'title': 'Client Task', 'description': 'Via the client', 'status': 'pending'})
+    }, {})
+    assert created['statusCode'] == 201
+    task_id = json.loads(created['body'])['taskId']
+    path = {'taskId': task_id}
+
+    fetched = get_handler({'pathParameters': path}, {})
+    assert json.loads(fetched['body'])['version'] == 1
+
+    updated = update_handler({
+        'pathParameters': path,
+        'headers': {'If-Match': fetched['headers']['ETag']},
+        'body': json.dumps({'title': 'Renamed', 'description': 'Via the client', 'status': 'pending'})
+    }, {})
+    assert updated['statusCode'] == 200
+    assert json.loads(updated['body'])['version'] == 2
+
+    patched = patch_handler({'pathParameters': path, 'body': json.dumps({'status': 'completed'})}, {})
+    assert json.loads(patched['body']) == {'status': 'completed', 'version': 3}
+
+    missing = patch_handler({'pathParameters': {'taskId': 'nope'}, 'body': json.dumps({'status': 'x'})}, {})
+    assert missing['statusCode'] == 404
+
+    listed = list_handler({'queryStringParameters': {'status': 'completed', 'titleContains': 'Ren'}}, {})
+    assert [item['taskId'] for item in json.loads(listed['body'])['items']] == [task_id]
+
+    scanned = list_handler({'queryStringParameters': {'titleContains': 'Ren'}}, {})
+    assert [item['title'] for item in json.loads(scanned['body'])['items']] == ['Renamed']
+
+    deleted = delete_handler({'pathParameters': path}, {})
+    assert deleted['statusCode'] == 204
+    assert get_handler({'pathParameters': path}, {})['statusCode'] == 404
+
+
+def test_batch_handlers_on_client_table(dynamodb_setup):
+    from lambda_functions.batch_create_tasks import handler as batch_create_handler
+    from lambda_functions.batch_delete_tasks import handler as batch_delete_handler
+    from lambda_functions.batch_get_tasks import handler as batch_get_handler
+    from lambda_functions.runtime import get_worker_table
+    from lambda_functions.client_table import ClientTable
+
+    assert type(get_worker_table()) is ClientTable
+
+    created = batch_create_handler({'body': json.dumps([
+        {'title': f'Task {n}', 'description': 'Batch', 'status': 'pending'} for n in range(30)
+    ])}, {})
+    assert created['statusCode'] == 201
+    task_ids = [result['taskId'] for result in json.loads(created['body'])['results']]
+
+    fetched = batch_get_handler({'body': json.dumps({'taskIds': task_ids[:3] + ['nope']})}, {})
+    body = json.loads(fetched['body'])
+    assert [item['taskId'] for item in body['items']] == task_ids[:3]
+    assert body['items'][0]['version'] == 1
+    assert body['missing'] == ['nope']
+
+    deleted = batch_delete_handler({'body': json.dumps({'status': 'pending'})}, {})
+    assert json.loads(deleted['body'])['deleted'] == 30
+
+
+def test_client_table_batch_write_unmarshalls_unprocessed_items():
+    from lambda_functions.client_table import ClientTable
+
+    class FakeClient:
+        def batch_write_item(self, RequestItems):
+            self.sent = RequestItems
+            return {'UnprocessedItems': {'TasksTable': RequestItems['TasksTable'][1:]}}
+
+    client = FakeClient()
+    requests = [
+        {'PutRequest': {'Item': {'taskId': '1', 'version': 1}}},
+        {'DeleteRequest': {'Key': {'taskId': '2'}}}
+    ]
+    response = ClientTable(client, 'TasksTable').batch_write_item(RequestItems={'TasksTable': requests})
+
+    assert client.sent['TasksTable'][0] == {'PutRequest': {'Item': {'taskId': {'S': '1'}, 'version': {'N': '1'}}}}
+    assert response['UnprocessedItems'] == {'TasksTable': [{'DeleteRequest': {'Key': {'taskId': '2'}}}]}
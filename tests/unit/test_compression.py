@@ -0,0 +1,90 @@
+import base64
+import gzip
+import json
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+DESCRIPTION = 'Collect the numbers from every team and write the summary. ' * 100
+
+
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'taskId', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.put_item(Item={'taskId': 'large', 'title': 'Large', 'description': DESCRIPTION, 'status': 'pending'})
+        table.put_item(Item={'taskId': 'small', 'title': 'Small', 'description': 'Short', 'status': 'pending'})
+        yield
+
+
+def get_event(task_id, **headers):
+    return {'pathParameters': {'taskId': task_id}, 'headers': headers}
+
+
+def test_accepts_gzip():
+    from lambda_functions.compression import accepts_gzip
+
+    assert accepts_gzip({'headers': {'Accept-Encoding': 'gzip, deflate, br'}})
+    assert accepts_gzip({'headers': {'accept-encoding': 'br;q=1.0, *;q=0.5'}})
+    assert not accepts_gzip({'headers': {'Accept-Encoding': 'gzip;q=0, deflate'}})
+    assert not accepts_gzip({'headers': {'Accept-Encoding': 'identity'}})
+    assert not accepts_gzip({'headers': None})
+
+
+def test_large_response_is_gzipped(dynamodb_setup):
+    from lambda_functions.get_task import handler
+
+    response = handler(get_event('large', **{'Accept-Encoding': 'gzip'}), {})
+
+    assert response['statusCode'] == 200
+    assert response['isBase64Encoded'] is True
+    assert response['headers']['Content-Encoding'] == 'gzip'
+    assert response['headers']['ETag']
+    body = gzip.decompress(base64.b64decode(response['body']))
+    assert json.loads(body)['description'] == DESCRIPTION
+    assert len(response['body']) < len(body) / 4
+
+
+def test_small_or_unaccepted_responses_are_not_compressed(dynamodb_setup):
+    from lambda_functions.get_task import handler
+
+    small = handler(get_event('small', **{'Accept-Encoding': 'gzip'}), {})
+    plain = handler(get_event('large'), {})
+
+    assert 'isBase64Encoded' not in small
+    assert json.loads(small['body'])['title'] == 'Small'
+    assert 'Content-Encoding' not in plain['headers']
+    assert plain['headers']['Vary'] == 'Accept-Encoding'
+    assert json.loads(plain['body'])['description'] == DESCRIPTION
+
+
+def test_rest_api_responses_are_left_to_the_gateway(dynamodb_setup, monkeypatch):
+    from lambda_functions.get_task import handler
+
+    monkeypatch.setenv('RESPONSE_COMPRESSED_BY_GATEWAY', 'true')
+
+    rest = handler(get_event('large', **{'Accept-Encoding': 'gzip'}), {})
+    http = handler({
+        'version': '2.0',
+        'routeKey': 'GET /tasks/{taskId}',
+        'rawPath': '/tasks/large',
+        'headers': {'accept-encoding': 'gzip'},
+        'pathParameters': {'taskId': 'large'},
+        'requestContext': {'http': {'method': 'GET'}}
+    }, {})
+
+    assert 'isBase64Encoded' not in rest
+    assert http['isBase64Encoded'] is True
@@ -70,6 +70,7 @@ def test_create_task_success(setup_dynamodb, mock_event):
     response = handler(mock_event, None)
 
     assert response['statusCode'] == 201
+    assert response['headers']['ETag'] == '"v1"'
     body = json.loads(response['body'])
     assert 'taskId' in body
     assert body['title'] == 'Test Task'
@@ -86,6 +87,41 @@ def test_create_task_success(setup_dynamodb, mock_event):
     assert item['title'] == 'Test Task'
     assert item['description'] == 'This is a test task'
     assert item['status'] == 'pending'
+    assert item['statusShard'].startswith('pending#')
+
+
+@mock_aws
+def test_create_task_validates_when_gateway_did_not(setup_dynamodb, monkeypatch):
+    """Tests that the handler still checks bodies the gateway model was not applied to."""
+    from lambda_functions.create_task import handler  # Import inside the test
+    monkeypatch.setenv('REQUEST_VALIDATED_BY_GATEWAY', 'true')
+    event = {
+        'headers': {'Content-Type': 'text/plain'},
+        'body': json.dumps({'title': 'Invalid Task'})
+    }
+    response = handler(event, None)
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == 'description is required in the body'
+
+
+
+def test_create_task_rejects_mistyped_fields_over_http_api(setup_dynamodb, monkeypatch):
+    """Tests that HTTP API requests, which no gateway model checks, cannot store non-string fields."""
+    from lambda_functions.create_task import handler  # Import inside the test
+    monkeypatch.setenv('REQUEST_VALIDATED_BY_GATEWAY', 'true')
+    event = {
+        'version': '2.0',
+        'routeKey': 'POST /tasks',
+        'rawPath': '/tasks',
+        'headers': {'content-type': 'application/json'},
+        'requestContext': {'http': {'method': 'POST'}},
+        'body': json.dumps({'title': 5, 'description': 'Task', 'status': 'pending'})
+    }
+    response = handler(event, None)
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == 'title must be a string'
 
 
 if __name__ == "__main__":
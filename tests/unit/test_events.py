@@ -0,0 +1,128 @@
+import base64
+import json
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'taskId', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.put_item(Item={'taskId': '123', 'title': 'Sample Task', 'description': 'Sample Description',
+                             'status': 'pending'})
+        yield
+
+
+def http_api_event(method, route, raw_path, body=None, path_parameters=None, headers=None, base64_encoded=False):
+    """An HTTP API (payload format 2.0) event."""
+    event = {
+        'version': '2.0',
+        'routeKey': f'{method} {route}',
+        'rawPath': raw_path,
+        'rawQueryString': '',
+        'headers': headers or {},
+        'requestContext': {
+            'http': {'method': method, 'path': raw_path},
+            'requestId': 'request-1',
+            'stage': '$default'
+        },
+        'isBase64Encoded': base64_encoded
+    }
+    if path_parameters:
+        event['pathParameters'] = path_parameters
+    if body is not None:
+        event['body'] = body
+    return event
+
+
+def test_normalize_v2_event():
+    from lambda_functions.events import normalize
+
+    event = http_api_event('GET', '/tasks/{taskId}', '/tasks/123', path_parameters={'taskId': '123'},
+                           headers={'if-none-match': '"v1"'})
+    event['cookies'] = ['a=1', 'b=2']
+    event['queryStringParameters'] = {'status': 'pending'}
+
+    normalized = normalize(event)
+
+    assert normalized['httpMethod'] == 'GET'
+    assert normalized['resource'] == '/tasks/{taskId}'
+    assert normalized['path'] == '/tasks/123'
+    assert normalized['pathParameters'] == {'taskId': '123'}
+    assert normalized['queryStringParameters'] == {'status': 'pending'}
+    assert normalized['headers'] == {'if-none-match': '"v1"', 'cookie': 'a=1; b=2'}
+    assert normalized['version'] == '2.0'
+    # Without a body the handlers still see a missing body
+    assert 'body' not in normalized
+    assert normalize(normalized) is normalized
+
+
+def test_normalize_decodes_base64_bodies_of_both_versions():
+    from lambda_functions.events import normalize
+
+    body = json.dumps({'title': 'Tâche'})
+    encoded = base64.b64encode(body.encode('utf-8')).decode('ascii')
+
+    v1 = normalize({'httpMethod': 'POST', 'resource': '/tasks', 'body': encoded, 'isBase64Encoded': True})
+    v2 = normalize(http_api_event('POST', '/tasks', '/tasks', body=encoded, base64_encoded=True))
+
+    for event in (v1, v2):
+        assert event['body'] == body
+        assert event['isBase64Encoded'] is False
+
+
+def test_invalid_base64_body_is_rejected():
+    from lambda_functions.create_task import handler
+
+    response = handler({'httpMethod': 'POST', 'resource': '/tasks', 'body': '%%%', 'isBase64Encoded': True}, {})
+
+    assert response['statusCode'] == 400
+
+
+def test_handlers_accept_v2_events(dynamodb_setup):
+    from lambda_functions.create_task import handler as create_handler
+    from lambda_functions.get_task import handler as get_handler
+
+    body = json.dumps({'title': 'Task', 'description': 'Description', 'status': 'pending'})
+    created = create_handler(http_api_event(
+        'POST', '/tasks', '/tasks', body=base64.b64encode(body.encode()).decode(), base64_encoded=True,
+        headers={'content-type': 'application/json'}
+    ), {})
+    assert created['statusCode'] == 201
+
+    response = get_handler(http_api_event('GET', '/tasks/{taskId}', '/tasks/123',
+                                          path_parameters={'taskId': '123'}), {})
+    assert response['statusCode'] == 200
+    assert json.loads(response['body'])['title'] == 'Sample Task'
+
+
+def test_router_dispatches_v2_events(dynamodb_setup):
+    from lambda_functions.router import handler
+
+    response = handler(http_api_event('GET', '/tasks/{taskId}', '/tasks/123', path_parameters={'taskId': '123'}), {})
+
+    assert response['statusCode'] == 200
+
+
+def test_http_api_requests_are_never_gateway_validated(monkeypatch):
+    from lambda_functions.task_schema import gateway_validated
+
+    monkeypatch.setenv('REQUEST_VALIDATED_BY_GATEWAY', 'true')
+    headers = {'content-type': 'application/json'}
+
+    assert gateway_validated({'httpMethod': 'POST', 'headers': headers})
+    assert not gateway_validated(http_api_event('POST', '/tasks', '/tasks', body='{}', headers=headers))
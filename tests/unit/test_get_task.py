@@ -93,3 +93,183 @@ def test_get_task_missing_task_id(dynamodb_setup):
     assert response['statusCode'] == 400
     body = json.loads(response['body'])
     assert body['error'] == 'taskId is required in pathParameters'
+
+
+def test_get_task_served_from_cache(dynamodb_setup):
+    from lambda_functions.get_task import handler
+    from lambda_functions.task_cache import task_cache
+
+    event = {
+        'pathParameters': {
+            'taskId': '123'
+        }
+    }
+
+    first = handler(event, {})
+    assert first['headers']['X-Cache'] == 'MISS'
+
+    # Removing the item behind the handler's back proves the second read skips DynamoDB
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    dynamodb.Table('TasksTable').delete_item(Key={'taskId': '123'})
+
+    second = handler(event, {})
+    assert second['statusCode'] == 200
+    assert second['headers']['X-Cache'] == 'HIT'
+    assert json.loads(second['body']) == json.loads(first['body'])
+    assert task_cache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_get_task_refresh_bypasses_container_cache(dynamodb_setup):
+    from lambda_functions.get_task import handler
+
+    event = {
+        'pathParameters': {
+            'taskId': '123'
+        }
+    }
+    handler(event, {})
+
+    # Another container changed the task; the stage cache refresh must not see the cached copy
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    dynamodb.Table('TasksTable').update_item(
+        Key={'taskId': '123'},
+        UpdateExpression='set title = :t',
+        ExpressionAttributeValues={':t': 'Changed Elsewhere'}
+    )
+
+    response = handler({**event, 'headers': {'cache-control': 'max-age=0'}}, {})
+    assert response['headers']['X-Cache'] == 'MISS'
+    assert json.loads(response['body'])['title'] == 'Changed Elsewhere'
+
+
+def test_get_task_cache_invalidated_by_update(dynamodb_setup):
+    from lambda_functions.get_task import handler
+    from lambda_functions.update_task import handler as update_handler
+
+    event = {
+        'pathParameters': {
+            'taskId': '123'
+        }
+    }
+    handler(event, {})
+
+    update_handler({
+        'pathParameters': {'taskId': '123'},
+        'body': json.dumps({'title': 'New Title', 'description': 'New Description', 'status': 'completed'})
+    }, {})
+
+    response = handler(event, {})
+    assert response['headers']['X-Cache'] == 'MISS'
+    body = json.loads(response['body'])
+    assert body['title'] == 'New Title'
+    assert body['version'] == 1
+
+
+def test_task_cache_expires_and_evicts():
+    from lambda_functions.task_cache import TaskCache
+
+    now = [0.0]
+    cache = TaskCache(max_entries=2, ttl_seconds=5, clock=lambda: now[0])
+    cache.put('a', {'taskId': 'a', 'version': 1})
+    cache.put('b', {'taskId': 'b', 'version': 1})
+    cache.get('a')
+    cache.put('c', {'taskId': 'c', 'version': 1})
+
+    # 'b' was the least recently used entry
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+
+    now[0] = 6
+    assert cache.get('a') is None
+
+
+def test_task_cache_keeps_newer_versions():
+    from lambda_functions.task_cache import TaskCache
+
+    cache = TaskCache(max_entries=10, ttl_seconds=60)
+    cache.put('a', {'taskId': 'a', 'version': 3})
+    cache.put('a', {'taskId': 'a', 'version': 2})
+    cache.invalidate('a', 3)
+    assert cache.get('a')['version'] == 3
+
+    cache.invalidate('a', 4)
+    assert cache.get('a') is None
+
+
+def test_get_task_not_modified(dynamodb_setup):
+    from lambda_functions.get_task import handler
+
+    event = {
+        'pathParameters': {
+            'taskId': '123'
+        }
+    }
+    first = handler(event, {})
+    etag = first['headers']['ETag']
+
+    event['headers'] = {'if-none-match': etag}
+    response = handler(event, {})
+
+    assert response['statusCode'] == 304
+    assert response['body'] == ''
+    assert response['headers']['ETag'] == etag
+
+
+def test_get_task_cached_by_gateway_is_never_not_modified(dynamodb_setup, monkeypatch):
+    from lambda_functions.get_task import handler
+
+    monkeypatch.setenv('RESPONSE_CACHED_BY_GATEWAY', 'true')
+    event = {
+        'pathParameters': {
+            'taskId': '123'
+        },
+        'headers': {'If-None-Match': '"v0"'}
+    }
+    response = handler(event, {})
+
+    # The stage cache would serve this response to readers without If-None-Match too
+    assert response['statusCode'] == 200
+    assert json.loads(response['body'])['title'] == 'Sample Task'
+
+    # HTTP API requests are not cached
+    response = handler({**event, 'version': '2.0'}, {})
+    assert response['statusCode'] == 304
+
+
+def test_get_task_modified_since_etag(dynamodb_setup):
+    from lambda_functions.get_task import handler
+
+    event = {
+        'pathParameters': {
+            'taskId': '123'
+        },
+        'headers': {'If-None-Match': '"v7"'}
+    }
+    response = handler(event, {})
+
+    assert response['statusCode'] == 200
+    assert response['headers']['ETag'] == '"v0"'
+    assert json.loads(response['body'])['title'] == 'Sample Task'
+
+
+def test_get_task_numeric_attributes(dynamodb_setup):
+    from decimal import Decimal
+    from lambda_functions.get_task import handler
+
+    # Numbers come back from DynamoDB as Decimal
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    dynamodb.Table('TasksTable').put_item(Item={
+        'taskId': '456',
+        'title': 'Estimated Task',
+        'description': 'Has numbers',
+        'status': 'pending',
+        'version': 2,
+        'estimate': Decimal('2.5')
+    })
+
+    response = handler({'pathParameters': {'taskId': '456'}}, {})
+
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body['version'] == 2
+    assert body['estimate'] == 2.5
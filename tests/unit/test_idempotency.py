@@ -0,0 +1,99 @@
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table names
+@pytest.fixture(autouse=True)
+def set_env_variable(monkeypatch):
+    monkeypatch.setenv('TASKS_TABLE_NAME', 'TasksTable')
+    monkeypatch.setenv('IDEMPOTENCY_TABLE_NAME', 'IdempotencyTable')
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        from lambda_functions import runtime
+        runtime.reset()
+
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        tasks_table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'taskId', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        dynamodb.create_table(
+            TableName='IdempotencyTable',
+            KeySchema=[{'AttributeName': 'idempotencyKey', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'idempotencyKey', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        yield tasks_table
+
+        runtime.reset()
+
+
+def create_event(key, title='Retried task'):
+    return {
+        'headers': {'Idempotency-Key': key},
+        'body': json.dumps({'title': title, 'description': 'Created once', 'status': 'pending'})
+    }
+
+
+def test_retry_replays_first_response(dynamodb_setup):
+    from lambda_functions.create_task import handler
+
+    first = handler(create_event('key-1'), {})
+    retry = handler(create_event('key-1'), {})
+
+    assert first['statusCode'] == 201
+    assert retry['statusCode'] == 201
+    assert retry['body'] == first['body']
+    # The same shape as the other routes return, version included
+    assert json.loads(retry['body'])['version'] == 1
+    assert 'statusShard' not in json.loads(retry['body'])
+    assert retry['headers']['Idempotent-Replayed'] == 'true'
+    assert retry['headers']['ETag'] == first['headers']['ETag']
+    assert dynamodb_setup.scan()['Count'] == 1
+
+
+def test_key_reused_with_different_body(dynamodb_setup):
+    from lambda_functions.create_task import handler
+
+    handler(create_event('key-2'), {})
+    response = handler(create_event('key-2', title='Something else'), {})
+
+    assert response['statusCode'] == 422
+    assert dynamodb_setup.scan()['Count'] == 1
+
+
+def test_concurrent_duplicates_create_one_task(dynamodb_setup):
+    from lambda_functions.create_task import handler
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda _: handler(create_event('key-3'), {}), range(8)))
+
+    created = {json.loads(response['body'])['taskId'] for response in responses if response['statusCode'] == 201}
+    assert len(created) == 1
+    assert all(response['statusCode'] in (201, 409) for response in responses)
+    assert dynamodb_setup.scan()['Count'] == 1
+
+
+def test_expired_record_is_replaced(dynamodb_setup):
+    from lambda_functions.idempotency import IDEMPOTENCY_TTL_SECONDS, put_once
+
+    def item(task_id):
+        return {'taskId': task_id, 'title': 'Task', 'description': 'Task', 'status': 'pending', 'version': 1}
+
+    assert put_once('IdempotencyTable', 'key-4', 'hash', item('a'), {'statusCode': 201}, now=1000) is None
+    stored = put_once('IdempotencyTable', 'key-4', 'hash', item('b'), {'statusCode': 201}, now=1001)
+    assert stored['response'] == {'statusCode': 201}
+
+    later = 1000 + IDEMPOTENCY_TTL_SECONDS + 1
+    assert put_once('IdempotencyTable', 'key-4', 'hash', item('c'), {'statusCode': 201}, now=later) is None
+    assert dynamodb_setup.scan()['Count'] == 2
@@ -0,0 +1,189 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+    os.environ['CURSOR_SIGNING_KEY'] = 'test-signing-key'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {
+                    'AttributeName': 'taskId',
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'taskId',
+                    'AttributeType': 'S'
+                },
+                {
+                    'AttributeName': 'statusShard',
+                    'AttributeType': 'S'
+                }
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'StatusIndex',
+                    'KeySchema': [
+                        {'AttributeName': 'statusShard', 'KeyType': 'HASH'},
+                        {'AttributeName': 'taskId', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                    'ProvisionedThroughput': {
+                        'ReadCapacityUnits': 5,
+                        'WriteCapacityUnits': 5
+                    }
+                }
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+        from lambda_functions.status_shards import shard_for
+        for i in range(60):
+            status = 'completed' if i % 3 == 0 else 'pending'
+            table.put_item(Item={
+                'taskId': str(i),
+                'title': f'Task {i}',
+                'description': f'Description {i}',
+                'status': status,
+                'statusShard': shard_for(str(i), status)
+            })
+
+        yield
+
+
+def list_all(handler, params):
+    """Follows cursors until the listing is exhausted, returning every page."""
+    pages = []
+    while True:
+        response = handler({'queryStringParameters': params}, {})
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        pages.append(body['items'])
+        if not body['cursor']:
+            return pages
+        params = dict(params, cursor=body['cursor'])
+
+
+def test_list_tasks_paginates(dynamodb_setup):
+    from lambda_functions.list_tasks import handler
+
+    pages = list_all(handler, {'limit': '25'})
+
+    # Check every page is bounded and every task is listed exactly once
+    assert all(len(page) <= 25 for page in pages)
+    task_ids = [item['taskId'] for page in pages for item in page]
+    assert sorted(task_ids, key=int) == [str(i) for i in range(60)]
+
+
+def test_list_tasks_status_filter(dynamodb_setup):
+    from lambda_functions.list_tasks import handler
+
+    pages = list_all(handler, {'limit': '7', 'status': 'completed'})
+
+    # Check every page is bounded and the shards are merged without gaps or repeats
+    assert all(len(page) <= 7 for page in pages)
+    items = [item for page in pages for item in page]
+    assert sorted(item['taskId'] for item in items) == sorted(str(i) for i in range(0, 60, 3))
+    assert all(item['status'] == 'completed' for item in items)
+    assert all('statusShard' not in item for item in items)
+
+
+def test_list_tasks_status_filter_uses_index(dynamodb_setup):
+    from lambda_functions.list_tasks import handler
+
+    # A task without a shard attribute is not in StatusIndex, so it proves no Scan happened
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    table.put_item(Item={'taskId': 'unindexed', 'title': 'Old', 'description': 'Old', 'status': 'completed'})
+
+    pages = list_all(handler, {'limit': '100', 'status': 'completed', 'titleContains': 'Task 1'})
+
+    items = [item for page in pages for item in page]
+    assert sorted(item['taskId'] for item in items) == ['12', '15', '18']
+
+
+def test_list_tasks_default_limit(dynamodb_setup):
+    from lambda_functions.list_tasks import handler
+
+    response = handler({'queryStringParameters': None}, {})
+
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert len(body['items']) == 25
+    assert body['cursor']
+
+
+def test_list_tasks_invalid_limit(dynamodb_setup):
+    from lambda_functions.list_tasks import handler
+
+    response = handler({'queryStringParameters': {'limit': '1000'}}, {})
+
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['error'] == 'limit must be an integer between 1 and 100'
+
+
+def test_list_tasks_tampered_cursor(dynamodb_setup):
+    from lambda_functions.list_tasks import handler
+    from lambda_functions.pagination import encode_cursor
+
+    cursor = encode_cursor({'key': {'taskId': '10'}, 'filters': {}})
+    signature = cursor.split('.')[1]
+    forged = encode_cursor({'key': {'taskId': '50'}, 'filters': {}}).split('.')[0] + '.' + signature
+
+    response = handler({'queryStringParameters': {'cursor': forged}}, {})
+
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['error'] == 'Invalid cursor'
+
+
+def test_list_tasks_cursor_bound_to_filters(dynamodb_setup):
+    from lambda_functions.list_tasks import handler
+
+    response = handler({'queryStringParameters': {'limit': '5', 'status': 'pending'}}, {})
+    cursor = json.loads(response['body'])['cursor']
+
+    response = handler({'queryStringParameters': {'limit': '5', 'status': 'completed', 'cursor': cursor}}, {})
+
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['error'] == 'Cursor does not match the requested filters'
+
+
+def test_list_tasks_reads_signing_key_from_secret_once(dynamodb_setup, monkeypatch):
+    from lambda_functions import pagination
+    from lambda_functions.list_tasks import handler
+
+    secrets = boto3.client('secretsmanager', region_name='us-east-1')
+    secret_arn = secrets.create_secret(Name='CursorSigningSecret', SecretString='secret-key')['ARN']
+    monkeypatch.setenv('CURSOR_SIGNING_SECRET_ARN', secret_arn)
+    monkeypatch.setattr(pagination, '_signing_keys', {})
+
+    first = handler({'queryStringParameters': {'limit': '5'}}, {})
+    cursor = json.loads(first['body'])['cursor']
+    # The key is kept for the life of the container, not fetched per request
+    secrets.put_secret_value(SecretId=secret_arn, SecretString='rotated-key')
+    second = handler({'queryStringParameters': {'limit': '5', 'cursor': cursor}}, {})
+
+    assert second['statusCode'] == 200
+    assert pagination._signing_keys == {secret_arn: b'secret-key'}
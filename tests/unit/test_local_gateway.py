@@ -0,0 +1,54 @@
+import json
+
+
+def test_build_event_matches_static_resource_before_path_parameter():
+    from tools.local_gateway import build_event
+
+    event = build_event('POST', '/tasks/batch-get', {'Content-Type': 'application/json'}, b'{"taskIds": []}')
+
+    assert event['resource'] == '/tasks/batch-get'
+    assert event['pathParameters'] is None
+    assert json.loads(event['body']) == {'taskIds': []}
+
+
+def test_build_event_path_and_query_parameters():
+    from tools.local_gateway import build_event
+
+    event = build_event('GET', '/tasks/123?limit=5', {}, b'')
+
+    assert event['resource'] == '/tasks/{taskId}'
+    assert event['pathParameters'] == {'taskId': '123'}
+    assert event['queryStringParameters'] == {'limit': '5'}
+    assert event['body'] is None
+    assert build_event('GET', '/unknown', {}, b'') is None
+
+
+def test_container_pool_reuses_warm_container():
+    from tools.local_gateway import ContainerPool
+
+    pool = ContainerPool(2)
+    handler = lambda event, context: {'statusCode': 200, 'body': '{}'}
+    event = {'requestContext': {'requestId': '1'}}
+
+    _, first, first_cold = pool.invoke(handler, event)
+    _, second, second_cold = pool.invoke(handler, event)
+
+    assert first_cold and not second_cold
+    assert first is second
+    assert pool.stats()['invocations'] == [2, 0]
+
+
+def test_mock_tables_serve_every_route(monkeypatch):
+    from moto import mock_aws
+    from lambda_functions import router
+    from tools.local_gateway import build_event, create_mock_tables
+
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('TASKS_TABLE_NAME', 'TasksTable')
+    monkeypatch.setenv('STATS_TABLE_NAME', 'TaskStatsTable')
+    with mock_aws():
+        create_mock_tables()
+        response = router.handler(build_event('GET', '/tasks/stats', {}, b''), {})
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == {'counts': {}, 'total': 0}
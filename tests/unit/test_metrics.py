@@ -0,0 +1,126 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        from lambda_functions import runtime
+        runtime.reset()
+
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {
+                    'AttributeName': 'taskId',
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'taskId',
+                    'AttributeType': 'S'
+                }
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+
+        yield table
+
+        runtime.reset()
+
+
+def test_create_task_emits_emf_record(dynamodb_setup):
+    from lambda_functions import metrics
+    from lambda_functions.create_task import handler
+
+    body = json.dumps({'title': 'Metered', 'description': 'Metered task', 'status': 'pending'})
+    with metrics.capture() as records:
+        response = handler({'httpMethod': 'POST', 'resource': '/tasks', 'body': body}, {})
+
+    assert response['statusCode'] == 201
+    record, = records
+    directive, = record['_aws']['CloudWatchMetrics']
+    assert directive['Dimensions'] == [['Function']]
+    assert {'Duration', 'ColdStart', 'ParseTime', 'ValidateTime', 'DynamoDBTime'} <= {
+        metric['Name'] for metric in directive['Metrics']
+    }
+    assert record['Function'] == 'create_task'
+    assert record['StatusCode'] == 201
+    assert record['RequestBytes'] == len(body)
+    assert record['ResponseBytes'] == len(response['body'])
+    assert record['DynamoDBCalls'] == 1
+    assert record['ConsumedWriteCapacity'] > 0
+    assert record['ColdStart'] in (0, 1)
+
+
+def test_get_task_records_read_capacity_and_warm_start(dynamodb_setup):
+    from lambda_functions import metrics
+    from lambda_functions.get_task import handler
+
+    dynamodb_setup.put_item(Item={'taskId': '123', 'title': 'Sample Task', 'description': 'Sample', 'status': 'pending'})
+
+    with metrics.capture() as records:
+        handler({'pathParameters': {'taskId': '123'}}, {})
+        handler({'pathParameters': {'taskId': 'missing'}}, {})
+
+    first, second = records
+    assert first['ConsumedReadCapacity'] > 0
+    assert 'SerializeTime' in first
+    assert second['StatusCode'] == 404
+    assert second['ColdStart'] == 0
+
+
+def test_get_task_counts_task_cache_hits_and_misses(dynamodb_setup):
+    from lambda_functions import metrics
+    from lambda_functions.get_task import handler
+
+    dynamodb_setup.put_item(Item={'taskId': '123', 'title': 'Sample Task', 'description': 'Sample', 'status': 'pending'})
+
+    with metrics.capture() as records:
+        handler({'pathParameters': {'taskId': '123'}}, {})
+        handler({'pathParameters': {'taskId': '123'}}, {})
+        # A stage cache refresh bypasses the task cache and is not counted
+        handler({'pathParameters': {'taskId': '123'}, 'headers': {'Cache-Control': 'max-age=0'}}, {})
+
+    miss, hit, refresh = records
+    assert (miss['CacheHits'], miss['CacheMisses']) == (0, 1)
+    assert (hit['CacheHits'], hit['CacheMisses']) == (1, 0)
+    assert 'CacheHits' not in refresh
+    directive, = hit['_aws']['CloudWatchMetrics']
+    assert {'Name': 'CacheHits', 'Unit': 'Count'} in directive['Metrics']
+
+
+def test_count_is_a_no_op_outside_an_invocation():
+    from lambda_functions import metrics
+
+    with metrics.capture() as records:
+        metrics.count('CacheHits')
+
+    assert records == []
+
+
+def test_phase_is_a_no_op_outside_an_invocation():
+    from lambda_functions import metrics
+
+    with metrics.capture() as records:
+        with metrics.phase('Parse'):
+            pass
+
+    assert records == []
@@ -0,0 +1,157 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {
+                    'AttributeName': 'taskId',
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'taskId',
+                    'AttributeType': 'S'
+                }
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+        table.put_item(Item={'taskId': '123', 'title': 'Old Title', 'description': 'Old Description', 'status': 'pending'})
+
+        yield
+
+
+def patch_event(body, headers=None, task_id='123'):
+    return {
+        'pathParameters': {
+            'taskId': task_id
+        },
+        'headers': headers or {},
+        'body': json.dumps(body)
+    }
+
+
+def test_patch_task_status_only(dynamodb_setup):
+    from lambda_functions.patch_task import handler
+
+    response = handler(patch_event({'status': 'completed'}), {})
+
+    # Only the supplied field (plus bookkeeping) comes back
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body == {'status': 'completed', 'version': 1}
+    assert response['headers']['ETag'] == '"v1"'
+
+    # Verify the other fields are untouched
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    item = table.get_item(Key={'taskId': '123'})['Item']
+    assert item['title'] == 'Old Title'
+    assert item['status'] == 'completed'
+    assert item['statusShard'].startswith('completed#')
+
+
+def test_patch_task_return_minimal(dynamodb_setup):
+    from lambda_functions.patch_task import handler
+
+    response = handler(patch_event({'title': 'New Title'}, {'Prefer': 'return=minimal'}), {})
+
+    assert response['statusCode'] == 204
+    assert response['body'] == ''
+    assert response['headers']['Preference-Applied'] == 'return=minimal'
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    assert table.get_item(Key={'taskId': '123'})['Item']['title'] == 'New Title'
+
+
+def test_patch_task_not_found(dynamodb_setup):
+    from lambda_functions.patch_task import handler
+
+    response = handler(patch_event({'status': 'completed'}, task_id='999'), {})
+
+    # Check response, and that PATCH never creates the task
+    assert response['statusCode'] == 404
+    body = json.loads(response['body'])
+    assert body['message'] == 'Task not found'
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    assert 'Item' not in table.get_item(Key={'taskId': '999'})
+
+
+def test_patch_task_stale_if_match(dynamodb_setup):
+    from lambda_functions.patch_task import handler
+
+    response = handler(patch_event({'status': 'completed'}, {'If-Match': '"v3"'}), {})
+
+    assert response['statusCode'] == 412
+    body = json.loads(response['body'])
+    assert body['error'] == 'Task has been modified'
+
+
+def test_patch_task_unknown_field(dynamodb_setup):
+    from lambda_functions.patch_task import handler
+
+    response = handler(patch_event({'taskId': 'other'}), {})
+
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['error'] == 'taskId cannot be updated'
+
+
+def test_patch_task_empty_body(dynamodb_setup):
+    from lambda_functions.patch_task import handler
+
+    response = handler(patch_event({}), {})
+
+    assert response['statusCode'] == 400
+    body = json.loads(response['body'])
+    assert body['error'] == 'Body must contain at least one of title, description, status'
+
+
+def test_patch_task_expires_finished_tasks(dynamodb_setup, monkeypatch):
+    from lambda_functions import task_expiry
+    from lambda_functions.patch_task import handler
+
+    monkeypatch.setattr(task_expiry, 'COMPLETED_TASK_TTL_SECONDS', 3600)
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+
+    # A title change leaves expiry alone, a terminal status sets it, any other status clears it
+    assert handler(patch_event({'title': 'Renamed'}), {})['statusCode'] == 200
+    assert 'expiresAt' not in table.get_item(Key={'taskId': '123'})['Item']
+    assert handler(patch_event({'status': 'cancelled'}), {})['statusCode'] == 200
+    assert 'expiresAt' in table.get_item(Key={'taskId': '123'})['Item']
+    assert handler(patch_event({'status': 'in-progress'}), {})['statusCode'] == 200
+    assert 'expiresAt' not in table.get_item(Key={'taskId': '123'})['Item']
+
+
+def test_patch_task_mistyped_field(dynamodb_setup):
+    from lambda_functions.patch_task import handler
+
+    response = handler(patch_event({'status': ['completed']}), {})
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == 'status must be a string'
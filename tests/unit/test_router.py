@@ -0,0 +1,92 @@
+import json
+import os
+import pytest
+from moto import mock_aws
+import boto3
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def dynamodb_setup():
+    # Setup mock DynamoDB
+    with mock_aws():
+        # Create DynamoDB table
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[
+                {
+                    'AttributeName': 'taskId',
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'taskId',
+                    'AttributeType': 'S'
+                }
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+        table.meta.client.get_waiter('table_exists').wait(TableName='TasksTable')
+        table.put_item(Item={'taskId': '123', 'title': 'Sample Task', 'description': 'Sample Description', 'status': 'pending'})
+
+        yield
+
+
+def test_router_dispatches_on_method_and_resource(dynamodb_setup):
+    from lambda_functions.router import handler
+
+    event = {
+        'httpMethod': 'GET',
+        'resource': '/tasks/{taskId}',
+        'pathParameters': {
+            'taskId': '123'
+        }
+    }
+    response = handler(event, {})
+
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body['title'] == 'Sample Task'
+
+
+def test_router_create_then_delete(dynamodb_setup):
+    from lambda_functions.router import handler
+
+    response = handler({
+        'httpMethod': 'POST',
+        'resource': '/tasks',
+        'body': json.dumps({'title': 'Routed', 'description': 'Routed task', 'status': 'pending'})
+    }, {})
+    assert response['statusCode'] == 201
+    task_id = json.loads(response['body'])['taskId']
+
+    response = handler({
+        'httpMethod': 'DELETE',
+        'resource': '/tasks/{taskId}',
+        'pathParameters': {'taskId': task_id}
+    }, {})
+    assert response['statusCode'] == 204
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    assert 'Item' not in table.get_item(Key={'taskId': task_id})
+
+
+def test_router_unknown_route(dynamodb_setup):
+    from lambda_functions.router import handler
+
+    response = handler({'httpMethod': 'PATCH', 'resource': '/tasks'}, {})
+
+    assert response['statusCode'] == 404
+    body = json.loads(response['body'])
+    assert body['error'] == 'No route for PATCH /tasks'
@@ -0,0 +1,62 @@
+import os
+import pytest
+from moto import mock_aws
+
+
+# Set environment variable for the table name
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def fresh_runtime():
+    from lambda_functions import runtime
+
+    # Clients must be created under the mock to pick up its fake credentials
+    with mock_aws():
+        runtime.reset()
+        yield runtime
+        runtime.reset()
+
+
+def test_table_is_created_once_per_container(fresh_runtime):
+    table = fresh_runtime.get_table()
+
+    assert fresh_runtime.get_table() is table
+    assert fresh_runtime.get_dynamodb() is fresh_runtime.get_dynamodb()
+    assert table.name == 'TasksTable'
+
+
+def test_client_uses_tuned_config(fresh_runtime):
+    config = fresh_runtime.get_dynamodb().meta.client.meta.config
+
+    assert config.tcp_keepalive is True
+    assert config.max_pool_connections == fresh_runtime.BOTO_CONFIG.max_pool_connections
+    assert config.retries['mode'] == 'adaptive'
+    assert config.connect_timeout == fresh_runtime.BOTO_CONFIG.connect_timeout
+
+
+def test_worker_table_shares_the_resource_client(fresh_runtime, monkeypatch):
+    import boto3
+    from concurrent.futures import ThreadPoolExecutor
+    from lambda_functions.client_table import ClientTable, ResourceClientTable
+
+    boto3.resource('dynamodb', region_name='us-east-1').create_table(
+        TableName='TasksTable',
+        KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'taskId', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    fresh_runtime.get_table().put_item(Item={'taskId': '1', 'version': 2})
+
+    table = fresh_runtime.get_worker_table()
+    assert isinstance(table, ResourceClientTable)
+    assert table.client is fresh_runtime.get_dynamodb().meta.client
+    # Same values as the Table resource, from any thread
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        items = list(executor.map(lambda _: table.get_item(Key={'taskId': '1'})['Item'], range(8)))
+    assert items == [{'taskId': '1', 'version': 2}] * 8
+
+    monkeypatch.setenv('TASKS_DATA_ACCESS', 'client')
+    assert type(fresh_runtime.get_worker_table()) is ClientTable
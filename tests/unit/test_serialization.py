@@ -0,0 +1,32 @@
+import json
+import pytest
+from decimal import Decimal
+
+
+def test_dumps_dynamodb_types():
+    from lambda_functions.serialization import dumps
+
+    item = {
+        'taskId': '123',
+        'version': Decimal('3'),
+        'estimate': Decimal('1.5'),
+        'tags': {'b', 'a'}
+    }
+
+    assert json.loads(dumps(item)) == {'taskId': '123', 'version': 3, 'estimate': 1.5, 'tags': ['a', 'b']}
+
+
+def test_dumps_matches_stdlib_backend():
+    from lambda_functions import serialization
+
+    item = {'taskId': '123', 'title': 'Ünïcode', 'counts': [Decimal('1'), Decimal('2.25')]}
+
+    expected = json.dumps(item, default=serialization._default, separators=(',', ':'), ensure_ascii=False)
+    assert json.loads(serialization.dumps(item)) == json.loads(expected)
+
+
+def test_dumps_rejects_unknown_types():
+    from lambda_functions.serialization import dumps
+
+    with pytest.raises(TypeError):
+        dumps({'value': object()})
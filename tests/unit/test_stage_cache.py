@@ -0,0 +1,192 @@
+import io
+import json
+import os
+from urllib.error import HTTPError, URLError
+
+import boto3
+import pytest
+from moto import mock_aws
+
+CACHE_URL = 'https://abc123.execute-api.us-east-1.amazonaws.com/prod'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+
+
+@pytest.fixture
+def cache_url(monkeypatch):
+    monkeypatch.setenv('TASKS_API_CACHE_URL', CACHE_URL)
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setattr('lambda_functions.stage_cache._credentials', None)
+
+
+@pytest.fixture
+def flushes(monkeypatch):
+    """Records the FlushStageCache calls instead of making them."""
+    calls = []
+
+    class APIGateway:
+        def flush_stage_cache(self, **kwargs):
+            calls.append(kwargs)
+
+    monkeypatch.setattr('lambda_functions.stage_cache._apigateway', APIGateway())
+    return calls
+
+
+@pytest.fixture
+def requests_sent(monkeypatch):
+    """Records the requests invalidate_task sends instead of sending them."""
+    sent = []
+
+    def urlopen(request, timeout):
+        sent.append(request)
+        return io.BytesIO(b'{}')
+
+    monkeypatch.setattr('lambda_functions.stage_cache.urlopen', urlopen)
+    return sent
+
+
+def test_invalidate_task_without_stage_cache_sends_nothing(monkeypatch, requests_sent):
+    from lambda_functions.stage_cache import invalidate_task
+
+    monkeypatch.delenv('TASKS_API_CACHE_URL', raising=False)
+
+    assert invalidate_task('123') is True
+    assert requests_sent == []
+
+
+def test_invalidate_task_sends_signed_refresh(cache_url, requests_sent):
+    from lambda_functions.stage_cache import invalidate_task
+
+    assert invalidate_task('a/b 1') is True
+
+    request, = requests_sent
+    assert request.full_url == f'{CACHE_URL}/tasks/a%2Fb%201'
+    assert request.get_method() == 'GET'
+    assert request.get_header('Cache-control') == 'max-age=0'
+    authorization = request.get_header('Authorization')
+    assert authorization.startswith('AWS4-HMAC-SHA256 Credential=testing/')
+    assert '/us-east-1/execute-api/aws4_request' in authorization
+
+
+def test_invalidate_task_failure_does_not_raise(cache_url, monkeypatch):
+    from lambda_functions.stage_cache import invalidate_task
+
+    def unreachable(request, timeout):
+        raise URLError('timed out')
+
+    monkeypatch.setattr('lambda_functions.stage_cache.urlopen', unreachable)
+    assert invalidate_task('123') is False
+
+    # A deleted task refreshes to get_task's 404
+    def not_found(request, timeout):
+        raise HTTPError(request.full_url, 404, 'Not Found', {}, io.BytesIO(b''))
+
+    monkeypatch.setattr('lambda_functions.stage_cache.urlopen', not_found)
+    assert invalidate_task('123') is True
+
+
+def test_refresh_requested():
+    from lambda_functions.stage_cache import refresh_requested
+
+    assert refresh_requested({'headers': {'Cache-Control': 'max-age=0'}})
+    assert refresh_requested({'headers': {'cache-control': 'no-cache, max-age = 0'}})
+    assert not refresh_requested({'headers': {'Cache-Control': 'max-age=60'}})
+    assert not refresh_requested({'headers': None})
+
+
+def stream_record(event_name, task_id):
+    return {'eventName': event_name, 'dynamodb': {'Keys': {'taskId': {'S': task_id}}}}
+
+
+def test_writers_do_not_wait_on_the_stage_cache(cache_url, requests_sent):
+    from lambda_functions.batch_delete_tasks import handler as batch_delete_handler
+    from lambda_functions.delete_task import handler as delete_handler
+    from lambda_functions.update_task import handler as update_handler
+
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        dynamodb.create_table(
+            TableName='TasksTable',
+            KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'taskId', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        update = update_handler({
+            'pathParameters': {'taskId': '123'},
+            'body': json.dumps({'title': 'Title', 'description': 'Description', 'status': 'pending'})
+        }, {})
+        delete = delete_handler({'pathParameters': {'taskId': '123'}}, {})
+        batch_delete = batch_delete_handler({'body': json.dumps({'taskIds': ['1', '2']})}, {})
+
+    assert update['statusCode'] == 200
+    assert delete['statusCode'] == 204
+    assert batch_delete['statusCode'] == 200
+    # The stage cache consumer refreshes the entries from the table stream instead
+    assert requests_sent == []
+
+
+def test_consumer_refreshes_every_changed_task_once(cache_url, requests_sent):
+    from lambda_functions.stage_cache_consumer import handler
+
+    response = handler({'Records': [
+        stream_record('INSERT', '1'),
+        stream_record('MODIFY', '1'),
+        stream_record('REMOVE', '2'),
+        stream_record('MODIFY', '3')
+    ]}, {})
+
+    assert response == {'records': 4, 'tasks': 3, 'failed': 0}
+    assert sorted(request.full_url for request in requests_sent) == [f'{CACHE_URL}/tasks/{n}' for n in '123']
+
+
+def test_invalidate_tasks_reports_failures(cache_url, monkeypatch):
+    from lambda_functions.stage_cache import invalidate_tasks
+
+    def urlopen(request, timeout):
+        if request.full_url.endswith('/2'):
+            raise URLError('timed out')
+        return io.BytesIO(b'{}')
+
+    monkeypatch.setattr('lambda_functions.stage_cache.urlopen', urlopen)
+    assert invalidate_tasks(['1', '2', '3'], max_workers=2) == ['2']
+
+
+def test_consumer_flushes_the_stage_above_the_refresh_bound(cache_url, requests_sent, flushes):
+    from lambda_functions import stage_cache
+    from lambda_functions.stage_cache_consumer import handler
+
+    # A batch delete of more tasks than the refresh pool runs at once
+    records = [stream_record('REMOVE', str(n)) for n in range(stage_cache.MAX_INVALIDATE_WORKERS * 2 + 1)]
+    response = handler({'Records': records}, {})
+
+    assert response == {'records': len(records), 'tasks': len(records), 'failed': 0}
+    # One flush instead of a refresh per deleted task
+    assert requests_sent == []
+    assert flushes == [{'restApiId': 'abc123', 'stageName': 'prod'}]
+
+
+def test_invalidate_tasks_refreshes_up_to_the_bound(cache_url, requests_sent, flushes):
+    from lambda_functions.stage_cache import invalidate_tasks
+
+    assert invalidate_tasks(['1', '2', '3'], max_tasks=3) == []
+    assert len(requests_sent) == 3
+    assert flushes == []
+
+    assert invalidate_tasks(['1', '2', '3', '4'], max_tasks=3) == []
+    assert len(requests_sent) == 3
+    assert len(flushes) == 1
+
+
+def test_invalidate_tasks_reports_a_failed_flush(cache_url, monkeypatch):
+    from lambda_functions.stage_cache import invalidate_tasks
+
+    class APIGateway:
+        def flush_stage_cache(self, **kwargs):
+            raise ConnectionError('timed out')
+
+    monkeypatch.setattr('lambda_functions.stage_cache._apigateway', APIGateway())
+    assert invalidate_tasks(['1', '2'], max_tasks=1) == ['1', '2']
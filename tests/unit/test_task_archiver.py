@@ -0,0 +1,80 @@
+import gzip
+import json
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['ARCHIVE_BUCKET_NAME'] = 'task-archive'
+
+
+@pytest.fixture
+def archive_bucket():
+    with mock_aws():
+        from lambda_functions import task_archiver
+
+        # The client is cached per container; each test gets one bound to its own mock
+        task_archiver._s3 = None
+        s3 = boto3.client('s3', region_name='us-east-1')
+        s3.create_bucket(Bucket='task-archive')
+        yield s3
+        task_archiver._s3 = None
+
+
+TTL_IDENTITY = {'type': 'Service', 'principalId': 'dynamodb.amazonaws.com'}
+
+
+def record(task_id, sequence_number, identity=TTL_IDENTITY):
+    removed = {
+        'eventName': 'REMOVE',
+        'dynamodb': {
+            'ApproximateCreationDateTime': 1767225600,
+            'Keys': {'taskId': {'S': task_id}},
+            'OldImage': {
+                'taskId': {'S': task_id},
+                'title': {'S': f'Task {task_id}'},
+                'status': {'S': 'completed'},
+                'statusShard': {'S': 'completed#1'},
+                'version': {'N': '3'},
+                'expiresAt': {'N': '1767225000'}
+            },
+            'SequenceNumber': sequence_number
+        }
+    }
+    if identity:
+        removed['userIdentity'] = identity
+    return removed
+
+
+def test_archiver_writes_one_ndjson_object_per_batch(archive_bucket):
+    from lambda_functions.task_archiver import handler
+
+    result = handler({'Records': [
+        record('1', '100'),
+        record('2', '101'),
+        # Deleted through the API, not expired
+        record('3', '102', identity=None)
+    ]}, {})
+
+    assert result == {'archived': 2, 'key': 'expired-tasks/2026/01/01/100-2.ndjson.gz'}
+    stored = archive_bucket.get_object(Bucket='task-archive', Key=result['key'])
+    assert stored['ContentType'] == 'application/x-ndjson'
+    assert stored['ContentEncoding'] == 'gzip'
+    lines = gzip.decompress(stored['Body'].read()).decode('utf-8').splitlines()
+    tasks = [json.loads(line) for line in lines]
+    assert [task['taskId'] for task in tasks] == ['1', '2']
+    # Archived in the shape clients know, without internal attributes
+    assert tasks[0] == {
+        'taskId': '1', 'title': 'Task 1', 'status': 'completed', 'version': 3, 'expiresAt': 1767225000
+    }
+
+
+def test_archiver_ignores_batches_without_expired_tasks(archive_bucket):
+    from lambda_functions.task_archiver import handler
+
+    assert handler({'Records': [record('3', '102', identity=None)]}, {}) == {'archived': 0}
+    assert 'Contents' not in archive_bucket.list_objects_v2(Bucket='task-archive')
@@ -0,0 +1,44 @@
+def test_missing_field():
+    from lambda_functions.task_schema import missing_field
+
+    assert missing_field({'title': 'Task', 'description': 'Task', 'status': 'pending'}) is None
+    assert missing_field({'title': 'Task'}) == 'description'
+
+
+def test_task_error_checks_field_types():
+    from lambda_functions.task_schema import task_error
+
+    assert task_error({'title': 'Task', 'description': 'Task', 'status': 'pending'}) is None
+    assert task_error({'title': 5, 'description': 'Task', 'status': 'pending'}) == 'title must be a string'
+    assert task_error({'title': 'Task', 'description': None, 'status': 'pending'}) == 'description must be a string'
+    assert task_error({'title': 'Task'}) == 'description is required in the body'
+    assert task_error(['Task']) == 'Task must be an object'
+
+
+def test_has_type_follows_json_schema():
+    from lambda_functions.task_schema import has_type
+
+    assert has_type(3, 'integer') and has_type(3.5, 'number')
+    assert not has_type(True, 'integer')
+    assert not has_type('3', 'number')
+
+
+def test_gateway_validated_requires_flag_and_json_body(monkeypatch):
+    from lambda_functions.task_schema import gateway_validated
+
+    event = {'headers': {'content-type': 'application/json'}}
+    monkeypatch.delenv('REQUEST_VALIDATED_BY_GATEWAY', raising=False)
+    assert not gateway_validated(event)
+
+    monkeypatch.setenv('REQUEST_VALIDATED_BY_GATEWAY', 'true')
+    assert gateway_validated(event)
+    assert not gateway_validated({'headers': {'Content-Type': 'text/plain'}})
+    assert not gateway_validated({})
+
+
+def test_schemas_share_task_fields():
+    from lambda_functions import task_schema
+
+    assert task_schema.TASK_SCHEMA['required'] == task_schema.REQUIRED_FIELDS
+    assert task_schema.TASK_BATCH_SCHEMA['items']['properties'] == task_schema.TASK_SCHEMA['properties']
+    assert set(task_schema.TASK_PATCH_SCHEMA['properties']) == set(task_schema.PATCHABLE_FIELDS)
@@ -0,0 +1,121 @@
+import json
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+
+@pytest.fixture(scope='module', autouse=True)
+def set_env_variable():
+    os.environ['TASKS_TABLE_NAME'] = 'TasksTable'
+    os.environ['STATS_TABLE_NAME'] = 'TaskStatsTable'
+
+
+@pytest.fixture
+def stats_table():
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='TaskStatsTable',
+            KeySchema=[{'AttributeName': 'statsKey', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'statsKey', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield table
+
+
+def image(task_id, status):
+    return {'taskId': {'S': task_id}, 'title': {'S': 'Task'}, 'status': {'S': status}}
+
+
+def record(event_name, old=None, new=None):
+    change = {'Keys': {'taskId': {'S': (old or new)['taskId']['S']}}}
+    if old:
+        change['OldImage'] = old
+    if new:
+        change['NewImage'] = new
+    return {'eventName': event_name, 'dynamodb': change}
+
+
+def test_status_deltas_coalesce_a_batch():
+    from lambda_functions.task_stats import status_deltas
+
+    deltas = status_deltas([
+        record('INSERT', new=image('1', 'pending')),
+        record('INSERT', new=image('2', 'pending')),
+        record('MODIFY', old=image('1', 'pending'), new=image('1', 'done')),
+        # A title change does not move the task between statuses
+        record('MODIFY', old=image('2', 'pending'), new=image('2', 'pending')),
+        record('INSERT', new=image('3', 'blocked')),
+        record('REMOVE', old=image('3', 'blocked'))
+    ])
+
+    assert deltas == {'pending': 1, 'done': 1}
+
+
+def test_consumer_writes_once_per_batch(stats_table):
+    from lambda_functions import metrics
+    from lambda_functions.task_stats_consumer import handler
+
+    first = [record('INSERT', new=image(str(n), 'pending')) for n in range(10)]
+    second = [record('MODIFY', old=image(str(n), 'pending'), new=image(str(n), 'done')) for n in range(4)]
+    second.append(record('REMOVE', old=image('9', 'pending')))
+
+    with metrics.capture() as records:
+        handler({'Records': first}, {})
+        result = handler({'Records': second}, {})
+
+    assert result == {'records': 5, 'statuses': 2}
+    assert [emitted['DynamoDBCalls'] for emitted in records] == [1, 1]
+    item = stats_table.get_item(Key={'statsKey': 'taskCounts'})['Item']
+    assert item['status#pending'] == 5
+    assert item['status#done'] == 4
+
+
+def test_get_task_stats(stats_table):
+    from lambda_functions.get_task_stats import handler
+
+    empty = handler({'httpMethod': 'GET', 'resource': '/tasks/stats'}, {})
+    assert empty['statusCode'] == 200
+    assert json.loads(empty['body']) == {'counts': {}, 'total': 0}
+
+    # A negative counter is left from tasks changed before the counters existed
+    stats_table.put_item(Item={'statsKey': 'taskCounts', 'status#pending': 3, 'status#done': 2, 'status#old': 0,
+                               'status#blocked': -2})
+    response = handler({'httpMethod': 'GET', 'resource': '/tasks/stats'}, {})
+
+    assert json.loads(response['body']) == {'counts': {'pending': 3, 'done': 2}, 'total': 5}
+
+
+def test_router_serves_stats(stats_table):
+    from lambda_functions.router import handler
+
+    response = handler({'httpMethod': 'GET', 'resource': '/tasks/stats'}, {})
+
+    assert response['statusCode'] == 200
+
+
+def test_backfill_seeds_counters_from_the_table(stats_table):
+    from lambda_functions.runtime import get_client
+    from lambda_functions.task_stats import count_statuses, seed_counts
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    tasks = dynamodb.create_table(
+        TableName='TasksTable',
+        KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'taskId', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    for n in range(5):
+        tasks.put_item(Item={'taskId': str(n), 'title': 'Task', 'status': 'done' if n < 3 else 'pending'})
+    stats_table.put_item(Item={'statsKey': 'taskCounts', 'status#done': -1, 'status#gone': 4})
+
+    client = get_client()
+    counts = count_statuses(client, 'TasksTable')
+    seed_counts(client, 'TaskStatsTable', counts)
+
+    assert counts == {'done': 3, 'pending': 2}
+    assert stats_table.get_item(Key={'statsKey': 'taskCounts'})['Item'] == {
+        'statsKey': 'taskCounts', 'status#done': 3, 'status#pending': 2
+    }
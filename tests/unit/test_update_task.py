@@ -1,5 +1,6 @@
 import json
 import os
+import time
 import pytest
 from moto import mock_aws
 import boto3
@@ -65,6 +66,7 @@ def test_update_task_success(dynamodb_setup):
     assert body['title'] == 'New Title'
     assert body['description'] == 'New Description'
     assert body['status'] == 'completed'
+    assert 'statusShard' not in body
 
     # Verify item has been updated
     dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
@@ -74,6 +76,7 @@ def test_update_task_success(dynamodb_setup):
     assert item['title'] == 'New Title'
     assert item['description'] == 'New Description'
     assert item['status'] == 'completed'
+    assert item['statusShard'].startswith('completed#')
 
 
 def test_update_task_missing_task_id(dynamodb_setup):
@@ -155,3 +158,88 @@ def test_update_task_missing_field(dynamodb_setup):
     assert response['statusCode'] == 400
     body = json.loads(response['body'])
     assert body['error'] == 'status is required in the body'
+
+
+def test_update_task_if_match(dynamodb_setup):
+    from lambda_functions.update_task import handler
+
+    def update(title, etag):
+        return handler({
+            'pathParameters': {'taskId': '123'},
+            'headers': {'If-Match': etag},
+            'body': json.dumps({'title': title, 'description': 'New Description', 'status': 'completed'})
+        }, {})
+
+    # The seeded task predates versioning, so its ETag is "v0"
+    first = update('First', '"v0"')
+    assert first['statusCode'] == 200
+    assert first['headers']['ETag'] == '"v1"'
+
+    # A client still holding "v0" lost the race
+    stale = update('Stale', '"v0"')
+    assert stale['statusCode'] == 412
+
+    second = update('Second', first['headers']['ETag'])
+    assert second['statusCode'] == 200
+    assert json.loads(second['body'])['version'] == 2
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    assert table.get_item(Key={'taskId': '123'})['Item']['title'] == 'Second'
+
+
+def test_update_task_if_match_missing_task(dynamodb_setup):
+    from lambda_functions.update_task import handler
+
+    response = handler({
+        'pathParameters': {'taskId': 'unknown'},
+        'headers': {'If-Match': '*'},
+        'body': json.dumps({'title': 'New Title', 'description': 'New Description', 'status': 'completed'})
+    }, {})
+
+    # If-Match never creates a task
+    assert response['statusCode'] == 412
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+    assert 'Item' not in table.get_item(Key={'taskId': 'unknown'})
+
+
+def test_update_task_expires_finished_tasks(dynamodb_setup, monkeypatch):
+    from lambda_functions import task_expiry
+    from lambda_functions.update_task import handler
+
+    monkeypatch.setattr(task_expiry, 'COMPLETED_TASK_TTL_SECONDS', 3600)
+
+    def update(status):
+        return handler({
+            'pathParameters': {'taskId': '123'},
+            'body': json.dumps({'title': 'Title', 'description': 'Description', 'status': status})
+        }, {})
+
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table('TasksTable')
+
+    assert update('completed')['statusCode'] == 200
+    expires_at = table.get_item(Key={'taskId': '123'})['Item']['expiresAt']
+    assert 0 < expires_at - int(time.time()) <= 3600
+
+    # Reopening the task keeps it in the table again
+    assert update('pending')['statusCode'] == 200
+    assert 'expiresAt' not in table.get_item(Key={'taskId': '123'})['Item']
+
+
+def test_update_task_if_match_skips_foreign_etags(dynamodb_setup):
+    from lambda_functions.update_task import handler
+
+    def update(if_match):
+        return handler({
+            'pathParameters': {'taskId': '123'},
+            'headers': {'If-Match': if_match},
+            'body': json.dumps({'title': 'Title', 'description': 'Description', 'status': 'pending'})
+        }, {})
+
+    # An ETag another cache or proxy issued does not spoil the one that matches
+    assert update('"x", "v0"')['statusCode'] == 200
+    assert update('"x", W/"y"')['statusCode'] == 412
+    assert update('"v0", "x"')['statusCode'] == 412
+    assert update('"x", "v1"')['statusCode'] == 200
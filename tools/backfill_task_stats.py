@@ -0,0 +1,34 @@
+"""One-off backfill of the per-status task counters from TasksTable.
+
+The counters are maintained from the table stream, which only carries changes,
+so a table that held tasks before the counters existed starts them at zero.
+This counts every task's status with a scan and replaces the counters item:
+
+    python -m tools.backfill_task_stats --stats-table <TaskStatsTable name>
+
+Writes made while the scan runs may be counted twice or missed; run it when the
+table is quiet, or run it again afterwards.
+"""
+import argparse
+import json
+
+from lambda_functions.runtime import get_client
+from lambda_functions.task_stats import count_statuses, seed_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks-table', default='TasksTable')
+    parser.add_argument('--stats-table', required=True, help='physical name of the stack\'s TaskStatsTable')
+    parser.add_argument('--dry-run', action='store_true', help='print the counts without writing them')
+    args = parser.parse_args()
+
+    client = get_client()
+    counts = count_statuses(client, args.tasks_table)
+    if not args.dry_run:
+        seed_counts(client, args.stats_table, counts)
+    print(json.dumps({'counts': counts, 'total': sum(counts.values()), 'written': not args.dry_run}))
+
+
+if __name__ == '__main__':
+    main()
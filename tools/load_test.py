@@ -0,0 +1,187 @@
+"""Load generator for the task API, local emulator or deployed stage.
+
+Sends a weighted mix of create/get/update/list/delete requests from a number of
+concurrent workers, for a fixed number of requests or a duration, and reports
+throughput, p50/p95/p99 latency per operation, status codes and how many
+responses paid a cold start (``X-Local-Cold-Start`` from tools.local_gateway):
+
+    python -m tools.load_test --url http://127.0.0.1:3000 --concurrency 16 --duration 30
+    python -m tools.load_test --url https://abc.execute-api.us-east-1.amazonaws.com/prod \\
+        --mix create=1,get=8,update=1 --requests 5000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+OPERATIONS = ['create', 'get', 'update', 'list', 'delete']
+
+DEFAULT_MIX = 'create=2,get=6,update=1,list=1'
+
+
+def parse_mix(mix):
+    """Parses ``create=2,get=6`` into {'create': 2.0, 'get': 6.0}."""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f'Unknown operation {name!r}; expected one of {", ".join(OPERATIONS)}')
+        weights[name] = float(weight or 1)
+    return weights
+
+
+class LoadTest:
+    def __init__(self, url, weights, item_size=256, timeout=10.0):
+        self.url = url.rstrip('/')
+        self.operations = list(weights)
+        self.weights = list(weights.values())
+        self.item_size = item_size
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.task_ids = []
+        self.latencies = defaultdict(list)
+        self.statuses = Counter()
+        self.cold_starts = 0
+
+    def _request(self, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = Request(self.url + path, data=data, method=method, headers={'Content-Type': 'application/json'})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as error:
+            return error.code, error.headers, error.read()
+        except URLError:
+            return 'error', {}, b''
+
+    def _task_body(self):
+        return {'title': 'Load test task', 'description': 'x' * self.item_size, 'status': 'pending'}
+
+    def _pick_task_id(self, remove=False):
+        with self.lock:
+            if not self.task_ids:
+                return None
+            index = random.randrange(len(self.task_ids))
+            if remove:
+                return self.task_ids.pop(index)
+            return self.task_ids[index]
+
+    def step(self):
+        operation = random.choices(self.operations, self.weights)[0]
+        task_id = None
+        if operation in ('get', 'update', 'delete'):
+            task_id = self._pick_task_id(remove=operation == 'delete')
+            if task_id is None:
+                # Nothing to read yet; create something instead
+                operation = 'create'
+
+        start = time.perf_counter()
+        if operation == 'create':
+            status, headers, body = self._request('POST', '/tasks', self._task_body())
+        elif operation == 'get':
+            status, headers, body = self._request('GET', f'/tasks/{task_id}')
+        elif operation == 'update':
+            status, headers, body = self._request('PUT', f'/tasks/{task_id}', self._task_body())
+        elif operation == 'list':
+            status, headers, body = self._request('GET', '/tasks?limit=25')
+        else:
+            status, headers, body = self._request('DELETE', f'/tasks/{task_id}')
+        latency = time.perf_counter() - start
+
+        with self.lock:
+            self.latencies[operation].append(latency)
+            self.statuses[status] += 1
+            if headers.get('X-Local-Cold-Start') == 'true':
+                self.cold_starts += 1
+            if operation == 'create' and status == 201:
+                self.task_ids.append(json.loads(body)['taskId'])
+
+    def run(self, concurrency, requests=None, duration=None):
+        deadline = time.monotonic() + duration if duration else None
+        remaining = [requests]
+
+        def worker():
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return
+                if remaining[0] is not None:
+                    with self.lock:
+                        if remaining[0] <= 0:
+                            return
+                        remaining[0] -= 1
+                self.step()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                future.result()
+        return time.perf_counter() - started
+
+    def report(self, elapsed):
+        operations = {}
+        for operation, latencies in self.latencies.items():
+            cuts = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+            operations[operation] = {
+                'count': len(latencies),
+                'p50_ms': round(cuts[49] * 1000, 3),
+                'p95_ms': round(cuts[94] * 1000, 3),
+                'p99_ms': round(cuts[98] * 1000, 3)
+            }
+        total = sum(self.statuses.values())
+        return {
+            'requests': total,
+            'elapsed_s': round(elapsed, 3),
+            'requests_per_sec': round(total / elapsed, 1) if elapsed else 0.0,
+            'cold_starts': self.cold_starts,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            'operations': operations
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:3000', help='API base URL (stage URL when deployed)')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent workers')
+    parser.add_argument('--requests', type=int, help='total requests to send')
+    parser.add_argument('--duration', type=float, help='seconds to run for (default: 10 unless --requests is given)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='weighted operations, e.g. create=1,get=8,update=1')
+    parser.add_argument('--item-size', type=int, default=256, help='bytes of description per task')
+    parser.add_argument('--output', help='write the report as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        weights = parse_mix(args.mix)
+    except ValueError as error:
+        parser.error(str(error))
+    duration = args.duration if args.duration or args.requests else 10.0
+
+    load_test = LoadTest(args.url, weights, args.item_size)
+    elapsed = load_test.run(args.concurrency, args.requests, duration)
+    report = load_test.report(elapsed)
+
+    print(f'{report["requests"]} requests in {report["elapsed_s"]} s '
+          f'({report["requests_per_sec"]} req/s), {report["cold_starts"]} cold starts')
+    print(f'statuses: {report["statuses"]}')
+    print(f'{"operation":<10} {"count":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    for operation, result in report['operations'].items():
+        print(f'{operation:<10} {result["count"]:>6} {result["p50_ms"]:>8.2f} '
+              f'{result["p95_ms"]:>8.2f} {result["p99_ms"]:>8.2f}')
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    if report['statuses'].get('error'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+"""Local API Gateway emulator for the task handlers.
+
+Serves the stack's routes over HTTP, turns every request into an API Gateway
+(REST, payload v1) proxy event and dispatches it through ``router.handler``. A
+fixed pool of simulated Lambda containers bounds concurrency: each container
+pays a configurable cold start on its first invocation (and again after being
+idle too long), and requests wait for a free container, or get a 429 like a
+throttled function with ``--throttle``.
+
+    python -m tools.local_gateway --moto --containers 4 --cold-start-ms 250
+
+All containers share this process, so module-level state such as the task
+cache is shared too; the cold start is simulated with a delay. Responses carry
+``X-Local-Container`` and ``X-Local-Cold-Start`` headers for the load generator.
+"""
+import argparse
+import base64
+import json
+import os
+import queue
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+from lambda_functions import router
+
+
+def compile_routes(routes):
+    """Returns (pattern, resource) pairs, static resources first so /tasks/batch wins over /tasks/{taskId}."""
+    resources = sorted({resource for _, resource in routes}, key=lambda resource: (resource.count('{'), resource))
+    compiled = []
+    for resource in resources:
+        pattern = re.sub(r'\\{(\w+)\\}', r'(?P<\1>[^/]+)', re.escape(resource))
+        compiled.append((re.compile(f'^{pattern}$'), resource))
+    return compiled
+
+
+ROUTE_PATTERNS = compile_routes(router.ROUTES)
+
+
+def build_event(method, raw_path, headers, body):
+    """Builds an API Gateway REST proxy event, or returns None when no resource matches the path."""
+    url = urlsplit(raw_path)
+    for pattern, resource in ROUTE_PATTERNS:
+        match = pattern.match(url.path)
+        if match:
+            break
+    else:
+        return None
+
+    query = parse_qs(url.query, keep_blank_values=True)
+    event = {
+        'resource': resource,
+        'path': url.path,
+        'httpMethod': method,
+        'headers': dict(headers),
+        'multiValueHeaders': {name: [value] for name, value in headers.items()},
+        'queryStringParameters': {name: values[-1] for name, values in query.items()} or None,
+        'multiValueQueryStringParameters': query or None,
+        'pathParameters': match.groupdict() or None,
+        'stageVariables': None,
+        'requestContext': {
+            'resourcePath': resource,
+            'httpMethod': method,
+            'path': url.path,
+            'stage': 'local',
+            'requestId': str(uuid.uuid4()),
+            'requestTimeEpoch': int(time.time() * 1000)
+        },
+        # API Gateway sends a null body for bodiless requests
+        'body': body.decode('utf-8') if body else None,
+        'isBase64Encoded': False
+    }
+    return event
+
+
+class Container:
+    """One simulated Lambda execution environment."""
+
+    def __init__(self, container_id):
+        self.container_id = container_id
+        self.warm = False
+        self.last_used = 0.0
+        self.invocations = 0
+
+    def invoke(self, handler, event, cold_start_seconds, idle_timeout_seconds):
+        now = time.monotonic()
+        cold = not self.warm or (idle_timeout_seconds and now - self.last_used > idle_timeout_seconds)
+        if cold:
+            time.sleep(cold_start_seconds)
+            self.warm = True
+        context = SimpleNamespace(
+            aws_request_id=event['requestContext']['requestId'],
+            function_name='LocalRouterFunction',
+            get_remaining_time_in_millis=lambda: 30000
+        )
+        try:
+            return handler(event, context), cold
+        finally:
+            self.invocations += 1
+            self.last_used = time.monotonic()
+
+
+class ContainerPool:
+    """Bounded pool of containers; the most recently used warm container is reused first, as Lambda does."""
+
+    def __init__(self, size, cold_start_seconds=0.0, idle_timeout_seconds=0.0, throttle=False):
+        self.cold_start_seconds = cold_start_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.throttle = throttle
+        self.containers = [Container(container_id) for container_id in range(size)]
+        self._idle = queue.LifoQueue()
+        for container in reversed(self.containers):
+            self._idle.put(container)
+
+    def invoke(self, handler, event):
+        """Returns (response, container, cold), or None when throttled."""
+        try:
+            container = self._idle.get(block=not self.throttle)
+        except queue.Empty:
+            return None
+        try:
+            response, cold = container.invoke(handler, event, self.cold_start_seconds, self.idle_timeout_seconds)
+            return response, container, cold
+        finally:
+            self._idle.put(container)
+
+    def stats(self):
+        return {
+            'containers': len(self.containers),
+            'warm': sum(container.warm for container in self.containers),
+            'invocations': [container.invocations for container in self.containers]
+        }
+
+
+def make_request_handler(pool, handler=router.handler):
+    class GatewayRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, headers, body):
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, str(value))
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _dispatch(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+
+            event = build_event(self.command, self.path, dict(self.headers.items()), body)
+            if event is None:
+                self._send(404, {'Content-Type': 'application/json'}, b'{"message":"Not Found"}')
+                return
+
+            result = pool.invoke(handler, event)
+            if result is None:
+                self._send(429, {'Content-Type': 'application/json'}, b'{"message":"Too Many Requests"}')
+                return
+
+            response, container, cold = result
+            payload = response.get('body') or ''
+            payload = base64.b64decode(payload) if response.get('isBase64Encoded') else payload.encode('utf-8')
+            headers = {'Content-Type': 'application/json', **(response.get('headers') or {})}
+            headers['X-Local-Container'] = container.container_id
+            headers['X-Local-Cold-Start'] = 'true' if cold else 'false'
+            self._send(response.get('statusCode', 200), headers, payload)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            if os.environ.get('LOCAL_GATEWAY_VERBOSE'):
+                super().log_message(format, *args)
+
+    return GatewayRequestHandler
+
+
+def serve(host, port, pool):
+    server = ThreadingHTTPServer((host, port), make_request_handler(pool))
+    server.daemon_threads = True
+    return server
+
+
+def create_mock_tables():
+    """Creates TasksTable (with StatusIndex) and TaskStatsTable in moto, for running without AWS.
+
+    moto has no stream consumers, so GET /tasks/stats serves whatever the stats table holds.
+    """
+    import boto3
+
+    dynamodb = boto3.resource('dynamodb', region_name=os.environ['AWS_DEFAULT_REGION'])
+    dynamodb.create_table(
+        TableName=os.environ['TASKS_TABLE_NAME'],
+        KeySchema=[{'AttributeName': 'taskId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'taskId', 'AttributeType': 'S'},
+            {'AttributeName': 'statusShard', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'StatusIndex',
+            'KeySchema': [
+                {'AttributeName': 'statusShard', 'KeyType': 'HASH'},
+                {'AttributeName': 'taskId', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    dynamodb.create_table(
+        TableName=os.environ['STATS_TABLE_NAME'],
+        KeySchema=[{'AttributeName': 'statsKey', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'statsKey', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--containers', type=int, default=4, help='simulated concurrent Lambda containers')
+    parser.add_argument('--cold-start-ms', type=float, default=250, help='delay of a container\'s first invocation')
+    parser.add_argument('--idle-timeout-s', type=float, default=0,
+                        help='seconds after which an idle container is cold again (0: never)')
+    parser.add_argument('--throttle', action='store_true', help='answer 429 instead of queueing when all containers are busy')
+    parser.add_argument('--moto', action='store_true', help='serve from an in-memory moto table instead of AWS')
+    args = parser.parse_args()
+
+    os.environ.setdefault('TASKS_TABLE_NAME', 'TasksTable')
+    os.environ.setdefault('STATS_TABLE_NAME', 'TaskStatsTable')
+    os.environ.setdefault('CURSOR_SIGNING_KEY', 'local-signing-key')
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    pool = ContainerPool(args.containers, args.cold_start_ms / 1000, args.idle_timeout_s, args.throttle)
+    server = serve(args.host, args.port, pool)
+
+    mock = None
+    if args.moto:
+        from moto import mock_aws
+        mock = mock_aws()
+        mock.start()
+        create_mock_tables()
+
+    print(f'Local API Gateway on http://{args.host}:{args.port} with {args.containers} containers')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if mock:
+            mock.stop()
+        print(json.dumps(pool.stats()))
+
+
+if __name__ == '__main__':
+    main()